@@ -0,0 +1,133 @@
+import hashlib
+import importlib
+import os
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple
+
+from agents import Agent
+
+from common.metrics import register_metrics
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AgentSpec:
+    def __init__(
+        self,
+        factory: Callable[..., Agent],
+        prompt_module: ModuleType,
+        prompt_getter_name: str,
+        dependency_list: List[str],
+    ):
+        """
+        factory: factory(model, prompt=..., **dependency_agents) 형태의 에이전트 생성 함수
+        prompt_module: 프롬프트 함수가 정의된 모듈 (변경 시 다시 로드)
+        prompt_getter_name: 프롬프트 함수 이름
+        dependency_list: 도구로 사용하는 하위 에이전트 이름 목록
+        """
+        self.factory = factory
+        self.prompt_module = prompt_module
+        self.prompt_getter_name = prompt_getter_name
+        self.dependency_list = dependency_list
+
+    def get_prompt(self) -> str:
+        return getattr(self.prompt_module, self.prompt_getter_name)()
+
+
+class AgentRegistry:
+    def __init__(self, reload_check_seconds: float = 5.0):
+        """
+        (에이전트 이름, 모델, 프롬프트 버전) 별로 에이전트를 한 번만 생성하여 재사용합니다.
+        reload_check_seconds: 프롬프트 파일 변경 확인 주기(초)
+        """
+        self.spec_dict: Dict[str, AgentSpec] = {}
+        self.agent_dict: Dict[Tuple[str, str, str], Agent] = {}
+        self.prompt_mtime_dict: Dict[str, float] = {}
+        self.reload_check_seconds = reload_check_seconds
+        self.last_reload_check = time.monotonic()
+        self.build_count = 0
+        self.hit_count = 0
+        register_metrics("agent_registry", self.get_stats)
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[..., Agent],
+        prompt_module: ModuleType,
+        prompt_getter_name: str,
+        dependency_list: List[str] | None = None,
+    ) -> None:
+        self.spec_dict[name] = AgentSpec(
+            factory, prompt_module, prompt_getter_name, dependency_list or []
+        )
+        prompt_file = prompt_module.__file__
+        self.prompt_mtime_dict[prompt_file] = os.path.getmtime(prompt_file)
+
+    def get_prompt_version(self, name: str) -> str:
+        """에이전트와 하위 에이전트 프롬프트를 합친 해시"""
+        spec = self.spec_dict[name]
+        version_source = spec.get_prompt()
+        for dependency in spec.dependency_list:
+            version_source += self.get_prompt_version(dependency)
+        return hashlib.sha1(version_source.encode("utf-8")).hexdigest()[:12]
+
+    def get_agent(self, name: str, model: str) -> Agent:
+        """
+        캐시된 에이전트를 반환합니다. 프롬프트가 바뀌었으면 새로 생성합니다.
+        """
+        self.reload_changed_prompts()
+        spec = self.spec_dict[name]
+        key = (name, model, self.get_prompt_version(name))
+        agent = self.agent_dict.get(key)
+        if agent is not None:
+            self.hit_count += 1
+            return agent
+
+        dependency_agents = {
+            dependency: self.get_agent(dependency, model)
+            for dependency in spec.dependency_list
+        }
+        agent = spec.factory(model, prompt=spec.get_prompt(), **dependency_agents)
+        # 같은 (이름, 모델)의 이전 버전은 제거
+        for old_key in [k for k in self.agent_dict if k[:2] == key[:2]]:
+            del self.agent_dict[old_key]
+        self.agent_dict[key] = agent
+        self.build_count += 1
+        logger.info(f"에이전트 생성: {name} model={model} prompt_version={key[2]}")
+        return agent
+
+    def reload_changed_prompts(self, force: bool = False) -> None:
+        """
+        프롬프트 파일이 변경된 모듈을 다시 로드합니다. (hot reload)
+        """
+        now = time.monotonic()
+        if not force and now - self.last_reload_check < self.reload_check_seconds:
+            return
+        self.last_reload_check = now
+
+        reloaded_module_set = set()
+        for spec in self.spec_dict.values():
+            module = spec.prompt_module
+            prompt_file = module.__file__
+            mtime = os.path.getmtime(prompt_file)
+            if mtime != self.prompt_mtime_dict.get(prompt_file) or force:
+                if module.__name__ not in reloaded_module_set:
+                    importlib.reload(module)
+                    reloaded_module_set.add(module.__name__)
+                    logger.info(f"프롬프트 모듈 다시 로드: {module.__name__}")
+                self.prompt_mtime_dict[prompt_file] = mtime
+
+    def clear(self) -> None:
+        self.agent_dict.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "cached_agent": len(self.agent_dict),
+            "build": self.build_count,
+            "hit": self.hit_count,
+        }
+
+
+agent_registry = AgentRegistry()
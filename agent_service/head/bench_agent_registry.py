@@ -0,0 +1,33 @@
+import time
+
+from agent_service.agent_registry import agent_registry
+from agent_service.head.head_agent import get_head_agent
+
+# head_agent_runner 요청당 에이전트 구성 비용 비교
+# before: 요청마다 하위 에이전트 + LitellmModel + as_tool 을 새로 생성
+# after: agent_registry 에서 캐시된 에이전트 그래프 조회
+
+
+def run_benchmark(model: str = "openai/gpt-4.1-nano", repeat: int = 200) -> dict:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        get_head_agent(model)
+    before_ms = (time.perf_counter() - start_time) * 1000 / repeat
+
+    agent_registry.get_agent("head_agent", model)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        agent_registry.get_agent("head_agent", model)
+    after_ms = (time.perf_counter() - start_time) * 1000 / repeat
+
+    return {
+        "before_avg_ms": round(before_ms, 3),
+        "after_avg_ms": round(after_ms, 3),
+        "speedup": round(before_ms / after_ms, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(run_benchmark())
+
+# PYTHONPATH=. python agent_service/head/bench_agent_registry.py
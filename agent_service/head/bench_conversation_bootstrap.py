@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import Message, User
+from mongo_db.service import (
+    create_or_update_user,
+    get_conversation,
+    get_conversation_list,
+    get_recent_message_list,
+    get_or_create_active_conversation,
+    append_message_list,
+)
+
+# head_agent_service.MEMORY_SIZE 와 동일 (에이전트 모듈 로드를 피하기 위해 복사)
+MEMORY_SIZE = 5
+
+# chat_with_head_agent 의 턴당 DB 지연 비교 (로컬 mongod 필요)
+# before: 대화 목록 조회 -> 대화 조회 -> 최근 메시지 조회 (3회 왕복)
+# after: get_or_create_active_conversation (1회 왕복)
+
+
+async def run_before(mongo_client, platform_id: str) -> None:
+    conversation = await get_conversation_list(mongo_client, platform_id)
+    conversation_id = conversation[0].conversation_id
+    await get_conversation(mongo_client, conversation_id)
+    await get_recent_message_list(mongo_client, conversation_id, MEMORY_SIZE * 2)
+
+
+async def run_after(mongo_client, platform_id: str) -> None:
+    await get_or_create_active_conversation(mongo_client, platform_id, MEMORY_SIZE * 2)
+
+
+async def run_benchmark(repeat: int = 200) -> dict:
+    mongo_client = get_mongo_client()
+    platform_id = "bench-conversation-bootstrap"
+    await create_or_update_user(mongo_client, User(platform_id=platform_id))
+    conversation = await get_or_create_active_conversation(
+        mongo_client, platform_id, MEMORY_SIZE * 2
+    )
+    await append_message_list(
+        mongo_client,
+        conversation.conversation_id,
+        [Message(role="user", content=f"message {i}") for i in range(50)],
+    )
+
+    output_dict = {}
+    for name, runner in (("before", run_before), ("after", run_after)):
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            await runner(mongo_client, platform_id)
+        output_dict[f"{name}_avg_ms"] = round(
+            (time.perf_counter() - start_time) * 1000 / repeat, 3
+        )
+    return output_dict
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+
+# PYTHONPATH=. python agent_service/head/bench_conversation_bootstrap.py
@@ -1,7 +1,8 @@
 import asyncio
-from typing import List
+from typing import AsyncIterator, Dict, List
 from agents import Agent, Runner, set_trace_processors, function_tool
 from litellm import acompletion
+from openai.types.responses import ResponseTextDeltaEvent
 import weave
 from weave.integrations.openai_agents.openai_agents import WeaveTracingProcessor
 
@@ -11,6 +12,8 @@ from common.utils import (
     create_or_update_prompt,
     get_litellm_model,
 )
+from agent_service.agent_registry import agent_registry
+from agent_service.head import prompts as head_prompts
 from agent_service.head.prompts import get_head_agent_prompt, get_bot_guide
 from agent_service.weather.weather_agent import get_weater_agent
 from agent_service.news.news_agent import get_news_agent
@@ -26,11 +29,7 @@ instructions = get_head_agent_prompt()
 logger = get_logger(__name__)
 
 
-@function_tool(
-    name_override="google_web_search", description_override="Google 웹 검색 도구"
-)
-@weave.op()
-async def google_web_search(query: str) -> str:
+async def request_google_search(query: str) -> str:
     tools = [{"googleSearch": {}}]
 
     response = await acompletion(
@@ -42,6 +41,14 @@ async def google_web_search(query: str) -> str:
     return response.choices[0].message.content
 
 
+@function_tool(
+    name_override="google_web_search", description_override="Google 웹 검색 도구"
+)
+@weave.op()
+async def google_web_search(query: str) -> str:
+    return await request_google_search(query)
+
+
 @function_tool(
     description_override="봇에 대한 가이드를 조회하는 도구, 봇의 기능, 사용법을 알려줍니다.",
 )
@@ -51,17 +58,21 @@ async def get_aline_bot_guide(query: str) -> str:
     return guide
 
 
-@weave.op()
-async def head_agent_runner(
-    input: List[dict], user_info: UserInfo, model: str = "openai/gpt-4.1-nano"
-) -> str:
-    weather_agent = get_weater_agent(model)
-    news_agent = get_news_agent(model)
-    subway_agent = get_subway_agent(model)
-    user_agent = get_user_agent(model)
-    head_agent = Agent(
+def get_head_agent(
+    model: str = "openai/gpt-4.1-nano",
+    prompt: str | None = None,
+    weather_agent: Agent | None = None,
+    news_agent: Agent | None = None,
+    subway_agent: Agent | None = None,
+    user_agent: Agent | None = None,
+) -> Agent:
+    weather_agent = weather_agent or get_weater_agent(model)
+    news_agent = news_agent or get_news_agent(model)
+    subway_agent = subway_agent or get_subway_agent(model)
+    user_agent = user_agent or get_user_agent(model)
+    return Agent(
         name="head_agent",
-        instructions=instructions,
+        instructions=prompt or instructions,
         tools=[
             weather_agent.as_tool(
                 tool_name=weather_agent.name,
@@ -88,6 +99,22 @@ async def head_agent_runner(
         ],
         model=get_litellm_model("openai/gpt-4o-mini"),
     )
+
+
+agent_registry.register(
+    "head_agent",
+    get_head_agent,
+    head_prompts,
+    "get_head_agent_prompt",
+    dependency_list=["weather_agent", "news_agent", "subway_agent", "user_agent"],
+)
+
+
+@weave.op()
+async def head_agent_runner(
+    input: List[dict], user_info: UserInfo, model: str = "openai/gpt-4.1-nano"
+) -> str:
+    head_agent = agent_registry.get_agent("head_agent", model)
     result = await Runner.run(head_agent, input, context=user_info, max_turns=10)
 
     if result.last_agent.name == "get_aline_bot_guide":
@@ -96,6 +123,41 @@ async def head_agent_runner(
         return result.final_output
 
 
+async def head_agent_stream_runner(
+    input: List[dict], user_info: UserInfo, model: str = "openai/gpt-4.1-nano"
+) -> AsyncIterator[dict]:
+    """
+    헤드 에이전트를 스트리밍 모드로 실행하며 진행 이벤트를 순서대로 반환합니다.
+    - {"type": "tool_call", "name": 도구 이름}: 하위 에이전트/도구 호출 시작
+    - {"type": "tool_output", "name": 도구 이름}: 하위 에이전트/도구 호출 완료
+    - {"type": "delta", "text": 답변 조각}: 최종 답변 텍스트 조각
+    - {"type": "final", "text": 최종 답변}: 실행 완료 (마지막 이벤트)
+    """
+    head_agent = agent_registry.get_agent("head_agent", model)
+    result = Runner.run_streamed(head_agent, input, context=user_info, max_turns=10)
+    # 도구 호출 결과 이벤트에는 이름이 없어 call_id 로 찾음
+    tool_name_dict: Dict[str, str] = {}
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            if isinstance(event.data, ResponseTextDeltaEvent) and event.data.delta:
+                yield {"type": "delta", "text": event.data.delta}
+        elif event.type == "run_item_stream_event":
+            if event.item.type == "tool_call_item":
+                raw_item = event.item.raw_item
+                tool_name = getattr(raw_item, "name", raw_item.type)
+                tool_name_dict[getattr(raw_item, "call_id", "")] = tool_name
+                yield {"type": "tool_call", "name": tool_name}
+            elif event.item.type == "tool_call_output_item":
+                raw_item = event.item.raw_item
+                call_id = (
+                    raw_item.get("call_id", "")
+                    if isinstance(raw_item, dict)
+                    else getattr(raw_item, "call_id", "")
+                )
+                yield {"type": "tool_output", "name": tool_name_dict.get(call_id, "")}
+    yield {"type": "final", "text": str(result.final_output)}
+
+
 @weave.op()
 async def main():
     create_or_update_prompt(
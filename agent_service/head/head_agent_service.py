@@ -1,45 +1,149 @@
+import time
+from typing import AsyncIterator
 from motor.motor_asyncio import AsyncIOMotorClient
 from mongo_db.connection import get_mongo_client
+from common.utils import get_now_kst
+from common.metrics import LatencyStats
 from mongo_db.service import (
-    get_conversation,
-    get_conversation_list,
+    get_or_create_active_conversation,
+    append_message_list,
     delete_conversation,
     create_conversation,
 )
-from mongo_db.schema import Conversation, User
-from agent_service.head.head_agent import head_agent_runner
+from mongo_db.schema import Conversation, Message, User
+from agent_service.head.head_agent import head_agent_runner, head_agent_stream_runner
+from agent_service.head.intent_router import (
+    route_intent,
+    head_agent_turn_latency,
+    fast_path_turn_latency,
+)
+from agent_service.news.news_agent import news_agent_runner
+from agent_service.subway.subway_agent import subway_agent_runner
+from agent_service.weather.weather_agent import weather_agent_runner
+from configs import settings
 from agent_service.user.schemas import UserInfo
 
+# 대화 기억 크기 (user/assistant 메시지 쌍 개수)
+MEMORY_SIZE = 5
+conversation_bootstrap_latency = LatencyStats("conversation_bootstrap")
+# 스트리밍 요청의 첫 진행 이벤트(start 제외)/첫 답변 조각까지 걸린 시간
+stream_first_event_latency = LatencyStats("chat_stream_first_event")
+stream_first_delta_latency = LatencyStats("chat_stream_first_delta")
+
+# intent_router 가 선택한 하위 에이전트 실행 함수
+fast_path_runner_dict = {
+    "subway_agent": subway_agent_runner,
+    "weather_agent": weather_agent_runner,
+    "news_agent": news_agent_runner,
+}
+
 
 async def chat_with_head_agent(user: User, message: str) -> str:
     mongo_client = get_mongo_client()
 
-    # 대화 조회
-    conversation = await get_conversation_list(mongo_client, user.platform_id)
-    if not conversation:
-        await create_conversation(mongo_client, user.platform_id)
-        conversation = await get_conversation_list(mongo_client, user.platform_id)
-    messages = await get_conversation(mongo_client, conversation[0].conversation_id)
+    # 대화 조회 (없으면 생성) + 최근 메시지 조회를 한 번에 처리
+    with conversation_bootstrap_latency.measure():
+        conversation = await get_or_create_active_conversation(
+            mongo_client, user.platform_id, MEMORY_SIZE * 2
+        )
+    conversation_id = conversation.conversation_id
 
     # 대화 초기화
-    if await initialize_conversation(mongo_client,
-                                     conversation[0].conversation_id,
-                                     user.platform_id):
+    if message.strip() == "초기화":
+        await initialize_conversation(mongo_client, conversation_id, user.platform_id)
         return "대화가 초기화되었습니다."
-    
-    # 메시지 큐 생성
-    message_history = convert_message_history(messages)
-    message_history.append({"role": "user", "content": message})
-    message_history = get_message_queue(message_history)
 
-    # 대화 실행
-    result = await head_agent_runner(message_history, UserInfo(platform_id=user.platform_id))
+    user_message = Message(role="user", content=message, created=get_now_kst())
+
+    message_history = get_head_agent_input(conversation.recent_messages, message)
+    # 단순 질문은 헤드 에이전트를 거치지 않고 하위 에이전트로 바로 실행 (최근 대화 포함)
+    decision = route_intent(message) if settings.intent_router_enabled else None
+    if decision is not None:
+        with fast_path_turn_latency.measure():
+            agent_output = await fast_path_runner_dict[decision.agent_name](message_history)
+        result = agent_output.answer
+    else:
+        # 대화 실행
+        with head_agent_turn_latency.measure():
+            result = await head_agent_runner(
+                message_history, UserInfo(platform_id=user.platform_id)
+            )
+    await append_message_list(
+        mongo_client,
+        conversation_id,
+        [user_message, Message(role="assistant", content=str(result))],
+    )
     return result
 
 
+async def stream_chat_with_head_agent(user: User, message: str) -> AsyncIterator[dict]:
+    """
+    chat_with_head_agent 의 스트리밍 버전입니다.
+    대화 조회 직후 {"type": "start"} 를 먼저 보내 첫 응답 시간이 에이전트 실행 시간과 무관하도록 하고,
+    head_agent_stream_runner 의 이벤트(tool_call, tool_output, delta)를 그대로 전달하고,
+    마지막에 최종 답변을 {"type": "final", "text": ...} 로 반환한 뒤 대화를 저장합니다.
+    """
+    start_time = time.perf_counter()
+    mongo_client = get_mongo_client()
+    with conversation_bootstrap_latency.measure():
+        conversation = await get_or_create_active_conversation(
+            mongo_client, user.platform_id, MEMORY_SIZE * 2
+        )
+    conversation_id = conversation.conversation_id
+    yield {"type": "start", "conversation_id": conversation_id}
+
+    if message.strip() == "초기화":
+        await initialize_conversation(mongo_client, conversation_id, user.platform_id)
+        yield {"type": "final", "text": "대화가 초기화되었습니다."}
+        return
+
+    user_message = Message(role="user", content=message, created=get_now_kst())
+    message_history = get_head_agent_input(conversation.recent_messages, message)
+    decision = route_intent(message) if settings.intent_router_enabled else None
+    if decision is not None:
+        # 하위 에이전트 직접 실행은 스트리밍하지 않고 진행 상황만 알림
+        yield {"type": "tool_call", "name": decision.agent_name}
+        stream_first_event_latency.record((time.perf_counter() - start_time) * 1000)
+        with fast_path_turn_latency.measure():
+            agent_output = await fast_path_runner_dict[decision.agent_name](message_history)
+        yield {"type": "tool_output", "name": decision.agent_name}
+        result = agent_output.answer
+    else:
+        result = ""
+        is_first_event, is_first_delta = True, True
+        with head_agent_turn_latency.measure():
+            async for event in head_agent_stream_runner(
+                message_history, UserInfo(platform_id=user.platform_id)
+            ):
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                if is_first_event:
+                    stream_first_event_latency.record(elapsed_ms)
+                    is_first_event = False
+                if event["type"] == "final":
+                    result = event["text"]
+                    continue
+                if event["type"] == "delta" and is_first_delta:
+                    stream_first_delta_latency.record(elapsed_ms)
+                    is_first_delta = False
+                yield event
+    await append_message_list(
+        mongo_client,
+        conversation_id,
+        [user_message, Message(role="assistant", content=str(result))],
+    )
+    yield {"type": "final", "text": str(result)}
+
+
+def get_head_agent_input(recent_messages: list[Message], message: str) -> list[dict]:
+    """최근 대화와 새 메시지로 헤드 에이전트 입력(최대 MEMORY_SIZE 쌍)을 만듭니다."""
+    message_history = convert_message_history(recent_messages)
+    message_history.append({"role": "user", "content": message})
+    return get_message_queue(message_history, MEMORY_SIZE)
+
+
 def get_message_queue(
     message_history: list[dict],
-    memory_size: int = 5,
+    memory_size: int = MEMORY_SIZE,
 ) -> list[dict]:
     limit_size = int(memory_size * 2)
     if len(message_history) >= limit_size:
@@ -47,9 +151,9 @@ def get_message_queue(
     return message_history
 
 
-def convert_message_history(conversation: Conversation) -> list[dict]:
+def convert_message_history(messages: list[Message]) -> list[dict]:
     message_history = []
-    for message in conversation.messages:
+    for message in messages:
         message_history.append(
             {"role": message.role, "content": message.content}
         )
@@ -58,9 +162,9 @@ def convert_message_history(conversation: Conversation) -> list[dict]:
 
 async def initialize_conversation(mongo_client: AsyncIOMotorClient, 
                                   conversation_id: str,
-                                  platform_id: str) -> bool:
+                                  platform_id: str) -> Conversation:
     await delete_conversation(mongo_client, conversation_id)
-    await create_conversation(mongo_client, platform_id)
+    return await create_conversation(mongo_client, platform_id)
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,171 @@
+import re
+from typing import Dict, List, Optional
+
+from common.metrics import LatencyStats, register_metrics
+from custom_logger import get_logger
+from agent_service.head.schemas import RouteDecision
+from agent_service.news.news_agent import ynx_rss
+from agent_service.subway.subway_agent import get_station_index
+
+logger = get_logger(__name__)
+
+# 헤드 에이전트를 거치지 않고 하위 에이전트로 바로 보낼 수 있는 짧은 질문만 처리
+MAX_MESSAGE_LENGTH = 30
+
+# 스케줄/알림 요청은 user_agent 가 처리해야 하므로 라우팅하지 않음
+SCHEDULE_KEYWORD_LIST = ["매일", "마다", "알림", "알람", "예약", "스케줄", "설정", "주중", "주말", "평일"]
+
+FILLER_WORD_SET = {"좀", "알려줘", "알려줄래", "알려주세요", "보여줘", "어때", "어때요", "정보", "지금", "현재", "오늘"}
+
+SUBWAY_KEYWORD_SET = {"도착", "도착정보", "지하철", "열차", "전철", "언제", "와", "와요", "몇분", "남았어", "상행", "하행"}
+WEATHER_KEYWORD_SET = {"날씨", "날씨는", "기온", "내일", "모레"}
+NEWS_KEYWORD_SET = {"뉴스", "소식", "기사", "주요", "최신"}
+
+REGION_GAZETTEER_SET = {
+    # 광역시/도
+    "서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원",
+    "충북", "충남", "전북", "전남", "경북", "경남", "제주",
+    # 주요 도시
+    "수원", "성남", "고양", "용인", "부천", "안산", "안양", "남양주", "화성", "평택",
+    "의정부", "파주", "김포", "광명", "하남", "청주", "천안", "전주", "포항", "창원",
+    "김해", "구미", "진주", "춘천", "원주", "강릉", "속초", "목포", "여수", "순천",
+    "경주", "안동", "군산", "익산", "서귀포", "제천", "충주", "통영", "거제",
+    # 서울 자치구
+    "종로", "중구", "용산", "성동", "광진", "동대문", "중랑", "성북", "강북", "도봉",
+    "노원", "은평", "서대문", "마포", "양천", "강서", "구로", "금천", "영등포", "동작",
+    "관악", "서초", "강남", "송파", "강동",
+}
+REGION_SUFFIX_PATTERN = re.compile(r"(특별시|광역시|시|구|군|도)$")
+LINE_PATTERN = re.compile(r"^\d+호선$")
+STATION_PARTICLE_PATTERN = re.compile(r"(에서|에|은|는|이|가)$")
+
+route_stats: Dict[str, int] = {"subway": 0, "weather": 0, "news": 0, "fallback": 0}
+head_agent_turn_latency = LatencyStats("head_agent_turn")
+fast_path_turn_latency = LatencyStats("fast_path_turn")
+
+
+def get_route_stats() -> dict:
+    head_stats = head_agent_turn_latency.get_stats()
+    fast_stats = fast_path_turn_latency.get_stats()
+    routed_count = route_stats["subway"] + route_stats["weather"] + route_stats["news"]
+    saved_ms = 0.0
+    if head_stats["count"] and fast_stats["count"]:
+        saved_ms = max(0.0, head_stats["avg_ms"] - fast_stats["avg_ms"]) * routed_count
+    return {**route_stats, "estimated_saved_ms": round(saved_ms, 1)}
+
+
+register_metrics("intent_router", get_route_stats)
+
+
+def tokenize(message: str) -> List[str]:
+    return [token.strip("?!.,~ ") for token in message.split() if token.strip("?!.,~ ")]
+
+
+def is_region(token: str) -> bool:
+    if token in REGION_GAZETTEER_SET:
+        return True
+    return REGION_SUFFIX_PATTERN.sub("", token) in REGION_GAZETTEER_SET
+
+
+def match_subway(token_list: List[str]) -> Optional[RouteDecision]:
+    """'<역이름>역 도착' 형태: 정확히 일치하는 역 1개 + 지하철 키워드만 있는 경우"""
+    if not SUBWAY_KEYWORD_SET & set(token_list):
+        return None
+    station_index = get_station_index()
+    station_list = []
+    for token in token_list:
+        if token in SUBWAY_KEYWORD_SET or token in FILLER_WORD_SET or LINE_PATTERN.match(token):
+            continue
+        stripped_token = STATION_PARTICLE_PATTERN.sub("", token)
+        if stripped_token.endswith("역"):
+            token = stripped_token
+        result = station_index.search(token, top_k=1)
+        if len(result) == 0 or result[0].confidence < 1.0:
+            return None
+        station_list.append(result[0].station_name)
+    if len(station_list) != 1:
+        return None
+    return RouteDecision(intent="subway", agent_name="subway_agent", reason=station_list[0])
+
+
+def match_weather(token_list: List[str]) -> Optional[RouteDecision]:
+    """
+    '강북구 날씨 알려줘' 형태: 날씨 키워드 + 지역 1개 + 시간/채움말만 있는 경우
+    지역이 없으면 ('내일 날씨') 이전 대화에 따라 달라지므로 라우팅하지 않음
+    """
+    if "날씨" not in "".join(token_list):
+        return None
+    region_list = []
+    for token in token_list:
+        if token in WEATHER_KEYWORD_SET or token in FILLER_WORD_SET:
+            continue
+        if token.endswith("날씨") and (token == "날씨" or is_region(token[: -len("날씨")])):
+            region = token[: -len("날씨")]
+            if region:
+                region_list.append(region)
+            continue
+        if not is_region(token):
+            return None
+        region_list.append(token)
+    if len(region_list) != 1:
+        return None
+    return RouteDecision(intent="weather", agent_name="weather_agent", reason=region_list[0])
+
+
+def match_news(token_list: List[str]) -> Optional[RouteDecision]:
+    """
+    '경제 뉴스' 형태: 뉴스 섹션 이름 + 뉴스 키워드만 있는 경우
+    섹션이 없으면 ('뉴스 더 알려줘') 이전 대화에 따라 달라지므로 '최신 뉴스' 만 라우팅
+    """
+    section_set = set(ynx_rss.rss_url_dict.keys())
+    if not NEWS_KEYWORD_SET & set(token_list) and not any(
+        token.endswith("뉴스") for token in token_list
+    ):
+        return None
+    section_list = []
+    for token in token_list:
+        if token in NEWS_KEYWORD_SET or token in FILLER_WORD_SET:
+            continue
+        if token.endswith("뉴스"):
+            token = token[: -len("뉴스")]
+            if not token:
+                continue
+        if token not in section_set:
+            return None
+        section_list.append(token)
+    if not section_list and "최신" in token_list:
+        section_list.append("최신기사")
+    if len(section_list) != 1:
+        return None
+    return RouteDecision(intent="news", agent_name="news_agent", reason=section_list[0])
+
+
+def route_intent(message: str) -> Optional[RouteDecision]:
+    """
+    규칙/사전 기반으로 확실한 의도만 하위 에이전트로 라우팅합니다.
+    의도가 없거나 여러 개로 해석되면 None (헤드 에이전트로 처리)
+    """
+    text = message.strip()
+    decision = None
+    if len(text) <= MAX_MESSAGE_LENGTH and not any(
+        keyword in text for keyword in SCHEDULE_KEYWORD_LIST
+    ):
+        token_list = tokenize(text)
+        decision_list = [
+            decision
+            for decision in (
+                match_subway(token_list),
+                match_weather(token_list),
+                match_news(token_list),
+            )
+            if decision is not None
+        ]
+        if len(decision_list) == 1:
+            decision = decision_list[0]
+
+    if decision is None:
+        route_stats["fallback"] += 1
+    else:
+        route_stats[decision.intent] += 1
+        logger.info(f"fast-path 라우팅: {decision.intent} ({decision.reason}) message={text}")
+    return decision
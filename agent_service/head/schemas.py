@@ -11,4 +11,9 @@ class Message(BaseModel):
 
 class GlobalContext(BaseModel):
     user_info: Optional[Dict] = Field(default=None, description="사용자 정보")
-    message_history: List[Message] = Field(default=[], description="메시지 히스토리")
\ No newline at end of file
+    message_history: List[Message] = Field(default=[], description="메시지 히스토리")
+
+class RouteDecision(BaseModel):
+    intent: str = Field(description="라우팅된 의도 (subway, weather, news)")
+    agent_name: str = Field(description="바로 호출할 하위 에이전트 이름")
+    reason: str = Field(description="라우팅 근거 (메시지에 있는 역/지역/섹션)")
@@ -22,6 +22,8 @@ from weave.integrations.openai_agents.openai_agents import WeaveTracingProcessor
 from configs import settings
 from custom_logger import get_logger
 from common.utils import create_or_update_prompt, get_litellm_model
+from agent_service.agent_registry import agent_registry
+from agent_service.news import prompts as news_prompts
 from common.schemas import AgentCommonStatus
 from agent_service.news.prompts import (
     get_news_prompt,
@@ -50,11 +52,11 @@ ynx_rss = YnxRss(update_interval_hours=4)
 
 @function_tool
 @weave.op()
-def get_news_with_section(section: str) -> str:
+async def get_news_with_section(section: str) -> str:
     """
     RSS 내용을 반환합니다.
     """
-    return ynx_rss.get_rss_contents(section)
+    return await ynx_rss.async_get_rss_contents(section)
 
 
 @input_guardrail
@@ -93,11 +95,13 @@ async def output_guardrail_news_agent(
     )
 
 
-def get_news_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
+def get_news_agent(
+    model: str = "openai/gpt-4.1-nano", prompt: str | None = None
+) -> Agent:
     return Agent(
         name="news_agent",
         handoff_description="뉴스 정보를 제공하는 에이전트",
-        instructions=instructions,
+        instructions=prompt or instructions,
         tools=[get_news_with_section],
         input_guardrails=[input_guardrail_news_agent],
         output_guardrails=[output_guardrail_news_agent],
@@ -105,11 +109,14 @@ def get_news_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
     )
 
 
+agent_registry.register("news_agent", get_news_agent, news_prompts, "get_news_prompt")
+
+
 @weave.op()
 async def news_agent_runner(
-    input: str, model: str = "openai/gpt-4.1-nano"
+    input: str | list[dict], model: str = "openai/gpt-4.1-nano"
 ) -> NewsAgentFinalOutput:
-    news_agent = get_news_agent(model)
+    news_agent = agent_registry.get_agent("news_agent", model)
     try:
         result = await Runner.run(news_agent, input, max_turns=3)
         return NewsAgentFinalOutput(
@@ -1,11 +1,17 @@
+import asyncio
 import time
 from typing import Dict
 from datetime import datetime
 import feedparser
 
 from common.utils import is_time_difference_over_n_hours
+from common.http_client import get_http_session, get_http_timeout
+from common.metrics import register_metrics
+from custom_logger import get_logger
 from agent_service.news.schemas import RssUrl, RssContents, RssFeed
 
+logger = get_logger(__name__)
+
 
 class YnxRss:
     def __init__(self, update_interval_hours: int = 4):
@@ -14,7 +20,22 @@ class YnxRss:
         """
         self.rss_url_dict = self.get_rss_url()
         self.rss_contents_dict = {}
+        # 조건부 GET(ETag / If-Modified-Since)용 응답 헤더
+        self.rss_cache_header_dict: Dict[str, Dict[str, str]] = {}
         self.update_interval_hours = update_interval_hours
+        self.refresh_task_dict: Dict[str, asyncio.Task] = {}
+        self.background_task: asyncio.Task | None = None
+        self.rss_status_dict = {
+            section: {
+                "success_count": 0,
+                "failure_count": 0,
+                "last_success_at": None,
+                "last_failure_at": None,
+                "last_error": None,
+            }
+            for section in self.rss_url_dict.keys()
+        }
+        register_metrics("news_rss", self.get_refresh_stats)
 
     def get_rss_url(self) -> Dict[str, RssUrl]:
         """
@@ -57,12 +78,154 @@ class YnxRss:
 
         return self.rss_contents_dict[section]
 
+    async def async_get_rss_contents(self, section: str) -> RssContents:
+        """
+        RSS 내용을 반환합니다. (get_rss_contents 의 비동기 버전)
+        저장된 내용이 오래되었으면 그대로 반환하고 백그라운드에서 갱신합니다. (stale-while-revalidate)
+        """
+        if section not in self.rss_url_dict.keys():
+            return f"존재하지 않는 섹션입니다. {section}"
+
+        section_contents = self.rss_contents_dict.get(section)
+        if section_contents is None:
+            section_contents = await self.refresh_section(section)
+            if section_contents is None:
+                return f"뉴스를 불러오지 못했습니다. {section}"
+        elif is_time_difference_over_n_hours(
+            section_contents.updated_at_iso, self.update_interval_hours
+        ):
+            self.get_refresh_task(section)
+
+        return section_contents
+
+    def get_refresh_task(self, section: str) -> asyncio.Task:
+        """
+        섹션 갱신 작업을 반환합니다. 진행 중인 갱신이 있으면 재사용합니다.
+        """
+        task = self.refresh_task_dict.get(section)
+        if task is None or task.done():
+            task = asyncio.create_task(self.run_refresh_section(section))
+            self.refresh_task_dict[section] = task
+        return task
+
+    async def refresh_section(self, section: str) -> RssContents | None:
+        """
+        섹션을 갱신하고 최신 내용을 반환합니다. 실패 시 마지막 정상 내용을 반환합니다.
+        """
+        return await asyncio.shield(self.get_refresh_task(section))
+
+    async def run_refresh_section(self, section: str) -> RssContents | None:
+        status = self.rss_status_dict[section]
+        try:
+            section_contents = await self.async_get_rss_feed(section)
+        except Exception as e:
+            status["failure_count"] += 1
+            status["last_failure_at"] = time.time()
+            status["last_error"] = repr(e)
+            logger.error(f"RSS feed 갱신 실패: {section} {e!r}")
+            return self.rss_contents_dict.get(section)
+
+        self.rss_contents_dict[section] = section_contents
+        status["success_count"] += 1
+        status["last_success_at"] = time.time()
+        status["last_error"] = None
+        return section_contents
+
+    async def refresh_all(self) -> None:
+        """
+        모든 섹션을 동시에 갱신합니다.
+        """
+        await asyncio.gather(
+            *[self.refresh_section(section) for section in self.rss_url_dict.keys()]
+        )
+
+    async def run_background_refresh(self, interval_seconds: int) -> None:
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(interval_seconds)
+
+    def start_background_refresh(self, interval_seconds: int) -> None:
+        """
+        주기적으로 모든 섹션을 갱신하는 백그라운드 작업을 시작합니다.
+        """
+        if self.background_task is None or self.background_task.done():
+            self.background_task = asyncio.create_task(
+                self.run_background_refresh(interval_seconds)
+            )
+            logger.info(f"RSS 백그라운드 갱신 시작: {interval_seconds}초 간격")
+
+    async def stop_background_refresh(self) -> None:
+        if self.background_task is not None:
+            self.background_task.cancel()
+            try:
+                await self.background_task
+            except asyncio.CancelledError:
+                pass
+            self.background_task = None
+            logger.info("RSS 백그라운드 갱신 종료")
+
+    def get_refresh_stats(self) -> dict:
+        now = time.time()
+        output_dict = {}
+        for section, status in self.rss_status_dict.items():
+            last_success_at = status["last_success_at"]
+            output_dict[section] = {
+                **status,
+                "age_seconds": round(now - last_success_at, 1)
+                if last_success_at
+                else None,
+                "has_snapshot": section in self.rss_contents_dict,
+            }
+        return output_dict
+
     def get_rss_feed(self, section: str) -> RssContents:
         """
         RSS feed를 업데이트 합니다.
         """
         url = self.rss_url_dict[section].url
         feed = feedparser.parse(url)
+        return self.parse_rss_feed(section, feed)
+
+    async def async_get_rss_feed(self, section: str) -> RssContents:
+        """
+        공유 HTTP 세션으로 RSS feed를 내려받고, 파싱은 워커 스레드에서 수행합니다.
+        변경이 없으면(304) 기존 내용을 그대로 반환합니다.
+        """
+        url = self.rss_url_dict[section].url
+        request_headers = {}
+        cache_header = self.rss_cache_header_dict.get(section, {})
+        section_contents = self.rss_contents_dict.get(section)
+        if section_contents is not None:
+            if "etag" in cache_header:
+                request_headers["If-None-Match"] = cache_header["etag"]
+            if "last_modified" in cache_header:
+                request_headers["If-Modified-Since"] = cache_header["last_modified"]
+
+        session = get_http_session()
+        async with session.get(
+            url, headers=request_headers, timeout=get_http_timeout("news")
+        ) as response:
+            if response.status == 304 and section_contents is not None:
+                logger.info(f"RSS feed 변경 없음: {section}")
+                return section_contents.model_copy(
+                    update={"updated_at_iso": self.struct_time_to_iso(time.gmtime())}
+                )
+            response.raise_for_status()
+            body = await response.read()
+            cache_header = {}
+            if response.headers.get("ETag"):
+                cache_header["etag"] = response.headers["ETag"]
+            if response.headers.get("Last-Modified"):
+                cache_header["last_modified"] = response.headers["Last-Modified"]
+            self.rss_cache_header_dict[section] = cache_header
+
+        feed = await asyncio.to_thread(feedparser.parse, body)
+        return self.parse_rss_feed(section, feed)
+
+    def parse_rss_feed(self, section: str, feed: feedparser.FeedParserDict) -> RssContents:
+        """
+        파싱된 feed를 RssContents로 변환합니다.
+        """
         updated_at_iso = self.struct_time_to_iso(feed.updated_parsed)
         output_list = []
         for entry in feed.entries:
@@ -17,3 +17,16 @@ class UserAgentFinalOutput(BaseModel):
     answer: str = Field(description="답변")
     status: AgentCommonStatus = Field(description="상태")
 
+
+
+class DigestSection(BaseModel):
+    agent_name: str = Field(description="에이전트 이름")
+    answer: Optional[str] = Field(default=None, description="에이전트 답변")
+    status: str = Field(description="실행 상태 (success, timeout, error, unknown_agent 등)")
+    elapsed_ms: float = Field(default=0.0, description="실행 시간(ms)")
+
+
+class SharedSectionRequest(BaseModel):
+    agent_name: str = Field(description="에이전트 이름")
+    content_key: str = Field(description="결과를 공유할 내용 키 (예: news:경제, weather:오늘:강남)")
+    query: str = Field(description="에이전트에 전달할 쿼리")
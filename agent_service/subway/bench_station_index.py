@@ -0,0 +1,78 @@
+import json
+import time
+from difflib import SequenceMatcher
+
+from agent_service.subway.station_index import StationIndex
+
+# 역 검색 마이크로벤치마크 (기존 선형 SequenceMatcher 탐색 vs StationIndex)
+query_list = [
+    "서울역",
+    "몽촌토성역",
+    "강남역 2호선",
+    "몽촌토성",
+    "평화의문",
+    "서울대입구역",
+    "우장산",
+    "신촌 경의중앙선",
+    "잠실역",
+    "홍대입구",
+    "여의도역 9호선",
+    "고속터미널",
+    "김포공항 공항철도",
+    "몽촌토썽",
+]
+
+
+def linear_scan(station_info: dict, station_name: str) -> tuple[str, float]:
+    """기존 get_subway_station_info 방식의 전체 탐색"""
+    best_score = 0
+    best_name = None
+    for key in station_info.keys():
+        confidence = SequenceMatcher(None, key, station_name).ratio()
+        if confidence > best_score:
+            best_score = confidence
+            best_name = key
+    return best_name, best_score
+
+
+def run_benchmark(repeat: int = 20) -> dict:
+    with open("agent_service/subway/subway_station_info.json", "r") as f:
+        station_info = json.load(f)
+
+    start_time = time.perf_counter()
+    station_index = StationIndex(station_info)
+    build_ms = (time.perf_counter() - start_time) * 1000
+
+    for query in query_list:
+        linear_name, linear_score = linear_scan(station_info, query)
+        result = station_index.search(query, top_k=1)[0]
+        print(
+            f"{query:>12} | linear: {linear_name}({linear_score:.2f}) "
+            f"| index: {result.station_name}({result.confidence:.2f})"
+        )
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for query in query_list:
+            linear_scan(station_info, query)
+    linear_ms = (time.perf_counter() - start_time) * 1000 / (repeat * len(query_list))
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for query in query_list:
+            station_index.search(query, top_k=1)
+    index_ms = (time.perf_counter() - start_time) * 1000 / (repeat * len(query_list))
+
+    return {
+        "station_count": len(station_info),
+        "index_build_ms": round(build_ms, 2),
+        "linear_avg_ms": round(linear_ms, 3),
+        "index_avg_ms": round(index_ms, 3),
+        "speedup": round(linear_ms / index_ms, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(run_benchmark())
+
+# PYTHONPATH=. python agent_service/subway/bench_station_index.py
@@ -0,0 +1,173 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+from agent_service.subway.schemas import StationSearchResult
+
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSUNG_LIST = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG_LIST = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG_LIST = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+PAREN_PATTERN = re.compile(r"\((.*?)\)")
+LINE_NUMBER_PATTERN = re.compile(r"\d+호선")
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해합니다. 한글이 아닌 문자는 그대로 둡니다."""
+    output = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_START <= code <= HANGUL_END:
+            offset = code - HANGUL_START
+            output.append(CHOSUNG_LIST[offset // 588])
+            output.append(JUNGSUNG_LIST[(offset % 588) // 28])
+            if offset % 28:
+                output.append(JONGSUNG_LIST[offset % 28])
+        else:
+            output.append(char)
+    return "".join(output)
+
+
+def get_ngram_set(text: str, n: int = 2) -> Set[str]:
+    """양 끝을 패딩한 자모 n-gram 집합을 반환합니다."""
+    padded = f"^{decompose_jamo(text)}$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class StationIndex:
+    def __init__(self, station_info: Dict[str, dict], candidate_limit: int = 20):
+        """
+        station_info: subway_station_info.json 내용 (역 이름 -> 역 정보)
+        candidate_limit: n-gram 후보 축소 후 재채점할 최대 별칭 수
+        """
+        self.station_info = station_info
+        self.candidate_limit = candidate_limit
+        self.line_names = self.get_line_names(station_info)
+        self.alias_dict: Dict[str, Set[str]] = defaultdict(set)
+        self.ngram_dict: Dict[str, Set[str]] = defaultdict(set)
+        self.alias_ngram_count: Dict[str, int] = {}
+
+        for station_name in station_info.keys():
+            for alias in self.get_station_alias_list(station_name):
+                self.alias_dict[alias].add(station_name)
+
+        for alias in self.alias_dict.keys():
+            ngram_set = get_ngram_set(alias)
+            self.alias_ngram_count[alias] = len(ngram_set)
+            for ngram in ngram_set:
+                self.ngram_dict[ngram].add(alias)
+        self.sorted_alias_list = sorted(self.alias_dict.keys())
+
+    def get_line_names(self, station_info: Dict[str, dict]) -> List[str]:
+        """데이터에 존재하는 노선명 목록을 긴 이름부터 반환합니다."""
+        line_names = {value["line_name"] for value in station_info.values()}
+        return sorted(line_names, key=len, reverse=True)
+
+    def get_station_alias_list(self, station_name: str) -> List[str]:
+        """
+        역 이름의 검색용 별칭을 반환합니다.
+        예: "몽촌토성(평화의문)" -> ["몽촌토성(평화의문)", "몽촌토성", "평화의문"]
+        """
+        alias_list = [station_name.replace(" ", "")]
+        base_name = PAREN_PATTERN.sub("", station_name).strip()
+        if base_name:
+            alias_list.append(base_name.replace(" ", ""))
+        for paren in PAREN_PATTERN.findall(station_name):
+            for sub_name in paren.split(","):
+                sub_name = sub_name.strip().replace(" ", "")
+                if sub_name and sub_name not in self.line_names:
+                    alias_list.append(sub_name)
+        return list(dict.fromkeys(alias_list))
+
+    def normalize_query(self, query: str) -> Tuple[str, Optional[str]]:
+        """
+        사용자 입력에서 노선명과 '역' 접미사를 제거합니다.
+        예: "강남역 2호선" -> ("강남", "2호선")
+        """
+        query = query.replace(" ", "").upper()
+        line_hint = None
+        for line_name in self.line_names:
+            if line_name in query:
+                line_hint = line_name
+                query = query.replace(line_name, "")
+                break
+        if line_hint is None:
+            match = LINE_NUMBER_PATTERN.search(query)
+            if match:
+                line_hint = match.group()
+                query = query.replace(line_hint, "")
+        if query not in self.alias_dict:
+            query = PAREN_PATTERN.sub("", query)
+        if len(query) > 1 and query.endswith("역"):
+            query = query[:-1]
+        return query, line_hint
+
+    def get_prefix_alias_list(self, query: str) -> List[str]:
+        """정렬된 별칭 목록에서 query로 시작하는 별칭을 반환합니다."""
+        output_list = []
+        index = bisect_left(self.sorted_alias_list, query)
+        while index < len(self.sorted_alias_list):
+            alias = self.sorted_alias_list[index]
+            if not alias.startswith(query):
+                break
+            output_list.append(alias)
+            index += 1
+        return output_list
+
+    def get_ngram_alias_list(self, query: str) -> List[str]:
+        """자모 n-gram 겹침(Dice 계수) 기준 상위 별칭을 반환합니다."""
+        query_ngram_set = get_ngram_set(query)
+        overlap_dict: Dict[str, int] = defaultdict(int)
+        for ngram in query_ngram_set:
+            for alias in self.ngram_dict.get(ngram, ()):
+                overlap_dict[alias] += 1
+        ranked = sorted(
+            overlap_dict.items(),
+            key=lambda item: 2 * item[1]
+            / (len(query_ngram_set) + self.alias_ngram_count[item[0]]),
+            reverse=True,
+        )
+        return [alias for alias, _ in ranked[: self.candidate_limit]]
+
+    def search(self, query: str, top_k: int = 5) -> List[StationSearchResult]:
+        """
+        역 이름을 검색하여 점수가 높은 순으로 top_k개의 결과를 반환합니다.
+        점수는 정규화된 입력과 별칭 사이의 SequenceMatcher 비율입니다.
+        """
+        normalized_query, line_hint = self.normalize_query(query)
+        if not normalized_query:
+            return []
+
+        score_dict: Dict[str, float] = {}
+        # 정확히 일치하는 별칭은 바로 반환
+        for station_name in self.alias_dict.get(normalized_query, ()):
+            score_dict[station_name] = 1.0
+
+        if len(score_dict) < top_k:
+            candidate_list = self.get_prefix_alias_list(normalized_query)
+            candidate_list += self.get_ngram_alias_list(normalized_query)
+            for alias in dict.fromkeys(candidate_list):
+                confidence = SequenceMatcher(None, alias, normalized_query).ratio()
+                for station_name in self.alias_dict[alias]:
+                    if confidence > score_dict.get(station_name, 0.0):
+                        score_dict[station_name] = confidence
+
+        ranked = sorted(
+            score_dict.items(),
+            key=lambda item: (
+                item[1],
+                self.station_info[item[0]]["line_name"] == line_hint,
+                item[0] == normalized_query,
+            ),
+            reverse=True,
+        )
+        return [
+            StationSearchResult(station_name=station_name, confidence=confidence)
+            for station_name, confidence in ranked[:top_k]
+        ]
@@ -1,9 +1,7 @@
 import asyncio
-import aiohttp
 import json
 from functools import lru_cache
 from datetime import datetime
-from difflib import SequenceMatcher
 from agents import (
     Agent,
     Runner,
@@ -22,7 +20,12 @@ from weave.integrations.openai_agents.openai_agents import WeaveTracingProcessor
 from configs import settings
 from custom_logger import get_logger
 from common.schemas import AgentCommonStatus
+from common.cache import AsyncTTLCache
+from common.concurrency import upstream_limiter
+from common.http_client import get_http_session, get_http_timeout
 from common.utils import create_or_update_prompt, get_litellm_model
+from agent_service.agent_registry import agent_registry
+from agent_service.subway import prompts as subway_prompts
 from agent_service.subway.schemas import (
     SubwayArrivalInfo,
     SubwayAgentFinalOutput,
@@ -31,12 +34,16 @@ from agent_service.subway.schemas import (
     StationSearchResult,
 )
 from agent_service.subway.prompts import get_subway_agent_prompt, get_subway_agent_output_guardrail_prompt
+from agent_service.subway.station_index import StationIndex
 weave.init(project_name="subway_agent", settings={"disabled": False})
 set_trace_processors([WeaveTracingProcessor()])
 
 logger = get_logger(__name__)
 instructions = get_subway_agent_prompt()
 output_guardrail_prompt = get_subway_agent_output_guardrail_prompt()
+subway_arrival_cache = AsyncTTLCache(
+    "subway_arrival", ttl_seconds=settings.subway_arrival_cache_ttl_seconds
+)
 
 @lru_cache(maxsize=1)
 def load_subway_station_info() -> dict:
@@ -48,7 +55,15 @@ def load_subway_station_info() -> dict:
     return station_info
 
 
-async def get_subway_station_info(station_name: str) -> StationSearchResult:
+@lru_cache(maxsize=1)
+def get_station_index() -> StationIndex:
+    """지하철 역 검색 인덱스를 생성하는 함수 (앱 시작 시 1회 생성)"""
+    station_index = StationIndex(load_subway_station_info())
+    logger.info(f"지하철 역 검색 인덱스 생성 완료: {len(station_index.alias_dict)}개의 별칭")
+    return station_index
+
+
+async def get_subway_station_info(station_name: str) -> StationSearchResult | None:
     """지하철 역 정보를 조회하는 함수
     Args:
         station_name (str): 지하철 역 이름
@@ -56,18 +71,10 @@ async def get_subway_station_info(station_name: str) -> StationSearchResult:
     Returns:
         StationSearchResult: 지하철 역 정보
     """
-    station_info = load_subway_station_info()
-    best_score = 0
-    match_info = None
-    for key, value in station_info.items():
-        confidence = SequenceMatcher(None, key, station_name).ratio()
-        if confidence > best_score:
-            best_score = confidence
-            match_info = StationSearchResult(
-                station_name=key,
-                confidence=confidence,
-            )
-    return match_info
+    result = get_station_index().search(station_name, top_k=1)
+    if len(result) == 0:
+        return None
+    return result[0]
 
 
 @function_tool()
@@ -76,12 +83,24 @@ async def get_subway_arrival_info(station_name: str) -> list[SubwayArrivalInfo]:
     """지하철 도착 정보를 조회하는 함수"""
 
     station_info = await get_subway_station_info(station_name)
-    if station_info.confidence < 0.3:
+    if station_info is None or station_info.confidence < 0.3:
         logger.warning(f"지하철 역 정보를 찾을 수 없습니다. station_name: {station_name}")
         return "지하철 역 정보를 찾을 수 없습니다."
     else:
         station_name = station_info.station_name
     
+    info_dict = await subway_arrival_cache.get_or_fetch(
+        station_name, lambda: fetch_subway_arrival_info(station_name)
+    )
+    if info_dict is None:
+        return "서울시 지하철 도착 정보를 조회할 수 없습니다."
+    return info_dict
+
+
+async def fetch_subway_arrival_info(
+    station_name: str,
+) -> dict[str, list[SubwayArrivalInfo]] | None:
+    """서울시 실시간 도착 정보 API를 호출하는 함수, 실패 시 None 반환"""
     base_url = "http://swopenapi.seoul.go.kr/api/subway"
     key = settings.seoul_openapi_key
     start_page = 0
@@ -89,42 +108,45 @@ async def get_subway_arrival_info(station_name: str) -> list[SubwayArrivalInfo]:
 
     url = f"{base_url}/{key}/json/realtimeStationArrival/{start_page}/{end_page}/{station_name}"
     info_dict = {}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status == 200:
-                result = await response.json()
-                upper_count = 0
-                lower_count = 0
-                for item in result["realtimeArrivalList"]:
-                    subway_line_name = subway_line_dict[item["subwayId"]]
-                    if subway_line_name not in info_dict:
-                        info_dict[subway_line_name] = []
-                    
-                    if item["updnLine"] == "상행":
-                        upper_count += 1
-                        now_count = upper_count
-                    else:
-                        lower_count += 1
-                        now_count = lower_count
-                    if len(info_dict[subway_line_name]) >= 4:
-                        continue
-                    
-                    info_dict[subway_line_name].append(
-                        SubwayArrivalInfo(
-                            up_down_line=item["updnLine"],
-                            subline_name=subway_line_name,
-                            way_to_go=item["trainLineNm"],
-                            destination_station_name=item["statnNm"],
-                            order_index=now_count,
-                            arrival_time=item["recptnDt"],
-                            now_train_status=item["arvlMsg2"],
-                            now_train_location=item["arvlMsg3"],
-                            train_number=item["btrainNo"],
-                        )
+    session = get_http_session()
+    async with upstream_limiter.limit("seoul_api"), session.get(
+        url, timeout=get_http_timeout("subway")
+    ) as response:
+        if response.status == 200:
+            result = await response.json()
+            upper_count = 0
+            lower_count = 0
+            for item in result["realtimeArrivalList"]:
+                subway_line_name = subway_line_dict[item["subwayId"]]
+                if subway_line_name not in info_dict:
+                    info_dict[subway_line_name] = []
+                
+                if item["updnLine"] == "상행":
+                    upper_count += 1
+                    now_count = upper_count
+                else:
+                    lower_count += 1
+                    now_count = lower_count
+                if len(info_dict[subway_line_name]) >= 4:
+                    continue
+                
+                info_dict[subway_line_name].append(
+                    SubwayArrivalInfo(
+                        up_down_line=item["updnLine"],
+                        subline_name=subway_line_name,
+                        way_to_go=item["trainLineNm"],
+                        destination_station_name=item["statnNm"],
+                        order_index=now_count,
+                        arrival_time=item["recptnDt"],
+                        now_train_status=item["arvlMsg2"],
+                        now_train_location=item["arvlMsg3"],
+                        train_number=item["btrainNo"],
                     )
-                return info_dict
-            else:
-                return "서울시 지하철 도착 정보를 조회할 수 없습니다."
+                )
+            return info_dict
+        else:
+            logger.error(f"서울시 지하철 도착 정보 조회 실패: {response.status}")
+            return None
 
 
 @output_guardrail
@@ -143,19 +165,24 @@ async def subway_agent_output_guardrail(
         tripwire_triggered=result.final_output.is_hallucination,
     )
 
-def get_subway_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
+def get_subway_agent(
+    model: str = "openai/gpt-4.1-nano", prompt: str | None = None
+) -> Agent:
     return Agent(
         name="subway_agent",
         handoff_description="지하철 도착 정보를 제공하는 에이전트",
-        instructions=instructions,
+        instructions=prompt or instructions,
         tools=[get_subway_arrival_info],
         #output_guardrails=[subway_agent_output_guardrail],
         model=get_litellm_model(model),
     )
 
+
+agent_registry.register("subway_agent", get_subway_agent, subway_prompts, "get_subway_agent_prompt")
+
 @weave.op()
-async def subway_agent_runner(input: str, model: str = "openai/gpt-4.1-nano"):
-    subway_agent = get_subway_agent(model)
+async def subway_agent_runner(input: str | list[dict], model: str = "openai/gpt-4.1-nano"):
+    subway_agent = agent_registry.get_agent("subway_agent", model)
 
     try:
         result = await Runner.run(subway_agent, input, max_turns=3)
@@ -16,6 +16,8 @@ from configs import settings
 from custom_logger import get_logger
 from common.schemas import AgentCommonStatus
 from common.utils import create_or_update_prompt, get_litellm_model
+from agent_service.agent_registry import agent_registry
+from agent_service.user import prompts as user_prompts
 from mongo_db.connection import get_mongo_client
 from mongo_db.service import (
     get_user,
@@ -78,11 +80,13 @@ async def get_user_memory_info(wrapper: RunContextWrapper[UserInfo]) -> str:
         return "유저 정보 조회에 실패했습니다."
     return str(user_info.user_memory)
 
-def get_user_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
+def get_user_agent(
+    model: str = "openai/gpt-4.1-nano", prompt: str | None = None
+) -> Agent:
     return Agent(
         name="schedule_agent",
         handoff_description="유저의 정보를 업데이트하고 조회합니다.",
-        instructions=get_user_agent_prompt(),
+        instructions=prompt or get_user_agent_prompt(),
         tools=[
             update_user_memory_info,
             get_user_memory_info,
@@ -91,13 +95,16 @@ def get_user_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
     )
 
 
+agent_registry.register("user_agent", get_user_agent, user_prompts, "get_user_agent_prompt")
+
+
 @weave.op()
 async def user_agent_runner(
     input: str, user_info: UserInfo = None, model: str = "openai/gpt-4o-mini"
 ):
     if user_info is None:
         user_info = UserInfo(platform_id="test")
-    user_agent = get_user_agent(model)
+    user_agent = agent_registry.get_agent("user_agent", model)
     try:
         result = await Runner.run(user_agent, input, max_turns=5, context=user_info)
         return UserAgentFinalOutput(
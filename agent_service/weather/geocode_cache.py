@@ -0,0 +1,108 @@
+import re
+import unicodedata
+from datetime import timedelta
+
+from configs import settings
+from custom_logger import get_logger
+from common.cache import AsyncTTLCache
+from common.http_client import get_http_session, get_http_timeout
+from common.metrics import register_metrics
+from common.utils import get_now_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import GeocodeCache
+from mongo_db.service import get_geocode_cache, upsert_geocode_cache
+
+logger = get_logger(__name__)
+
+# 1차: 프로세스 내 LRU, 2차: MongoDB geocode_cache 컬렉션 (TTL 인덱스)
+geocode_memory_cache = AsyncTTLCache("geocode", ttl_seconds=3600, max_size=2048)
+geocode_stats = {"db_hit": 0, "api_call": 0, "api_not_found": 0, "api_error": 0}
+register_metrics("geocode_store", lambda: dict(geocode_stats))
+
+
+def normalize_address(address: str) -> str:
+    """
+    캐시 키로 사용할 주소를 정규화합니다.
+    예: "  서울   강북구 " -> "서울 강북구"
+    """
+    address = unicodedata.normalize("NFC", address)
+    address = re.sub(r"\s+", " ", address).strip()
+    return address.lower()
+
+
+async def request_naver_geocode(address_key: str) -> GeocodeCache | None:
+    """
+    네이버 geocoding API를 호출합니다.
+    검색 결과가 없으면 is_found=False, 호출 자체가 실패하면 None을 반환합니다.
+    """
+    url = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
+    headers = {
+        "x-ncp-apigw-api-key-id": settings.naver_map_client_id,
+        "x-ncp-apigw-api-key": settings.naver_map_client_secret,
+        "Accept": "application/json",
+    }
+    params = {"query": address_key}
+
+    session = get_http_session()
+    async with session.get(
+        url, headers=headers, params=params, timeout=get_http_timeout("geocode")
+    ) as response:
+        if response.status != 200:
+            logger.error(
+                f"Something went wrong! {response.status} {await response.text()}"
+            )
+            return None
+
+        data = await response.json()
+
+    if data["meta"]["totalCount"] == 0:
+        logger.error(f"No results found for address: {address_key}")
+        return GeocodeCache(address_key=address_key, is_found=False)
+
+    item = data["addresses"][0]
+    return GeocodeCache(
+        address_key=address_key,
+        is_found=True,
+        lon=item.get("x"),  # 경도
+        lat=item.get("y"),  # 위도
+    )
+
+
+async def get_geocode_from_db_or_api(address_key: str) -> GeocodeCache | None:
+    mongo_client = get_mongo_client()
+    try:
+        geocode_cache = await get_geocode_cache(mongo_client, address_key)
+        if geocode_cache is not None:
+            geocode_stats["db_hit"] += 1
+            return geocode_cache
+    except Exception as e:
+        logger.error(f"geocode 캐시 조회 실패: {address_key} {e!r}")
+
+    geocode_stats["api_call"] += 1
+    geocode_cache = await request_naver_geocode(address_key)
+    if geocode_cache is None:
+        geocode_stats["api_error"] += 1
+        return None
+
+    if geocode_cache.is_found:
+        ttl_seconds = settings.geocode_cache_ttl_seconds
+    else:
+        geocode_stats["api_not_found"] += 1
+        ttl_seconds = settings.geocode_negative_cache_ttl_seconds
+    geocode_cache.created = get_now_kst()
+    geocode_cache.expire_at = geocode_cache.created + timedelta(seconds=ttl_seconds)
+    try:
+        await upsert_geocode_cache(mongo_client, geocode_cache)
+    except Exception as e:
+        logger.error(f"geocode 캐시 저장 실패: {address_key} {e!r}")
+    return geocode_cache
+
+
+async def get_geocode(address: str) -> GeocodeCache | None:
+    """
+    주소의 좌표를 조회합니다. 메모리 -> MongoDB -> 네이버 API 순으로 조회합니다.
+    """
+    address_key = normalize_address(address)
+    return await geocode_memory_cache.get_or_fetch(
+        address_key, lambda: get_geocode_from_db_or_api(address_key)
+    )
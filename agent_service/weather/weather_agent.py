@@ -1,5 +1,4 @@
 import asyncio
-import aiohttp
 import requests
 import time
 from datetime import datetime
@@ -21,12 +20,18 @@ from weave.integrations.openai_agents.openai_agents import WeaveTracingProcessor
 from configs import settings
 from custom_logger import get_logger
 from common.schemas import AgentCommonStatus
+from common.cache import AsyncTTLCache
+from common.concurrency import upstream_limiter
+from common.http_client import get_http_session, get_http_timeout
 from common.utils import create_or_update_prompt, get_litellm_model
+from agent_service.agent_registry import agent_registry
+from agent_service.weather import prompts as weather_prompts
 from agent_service.weather.schemas import (
     NonKoreanOutput,
     Coordinates,
     WeatherAgentFinalOutput,
 )
+from agent_service.weather.geocode_cache import get_geocode
 from agent_service.weather.prompts import (
     get_weather_prompt,
     weather_agent_input_guardrail_prompt,
@@ -40,6 +45,9 @@ logger = get_logger(__name__)
 
 instructions = get_weather_prompt()
 guardrail_prompt = weather_agent_input_guardrail_prompt()
+weather_cache = AsyncTTLCache(
+    "weather", ttl_seconds=settings.weather_cache_present_ttl_seconds, max_size=4096
+)
 
 
 def datetime_to_unix(dt: datetime) -> int:
@@ -47,6 +55,28 @@ def datetime_to_unix(dt: datetime) -> int:
     return int(time.mktime(dt.timetuple()))
 
 
+def get_weather_cache_key(lat: float, lon: float, timestamp: int) -> tuple:
+    """위경도는 격자 단위로, 시간은 1시간 단위로 묶은 캐시 키"""
+    grid = settings.weather_cache_grid_degree
+    return (
+        round(round(lat / grid) * grid, 6),
+        round(round(lon / grid) * grid, 6),
+        timestamp // 3600,
+    )
+
+
+def get_weather_cache_ttl(timestamp: int) -> int:
+    """과거(변하지 않음) / 현재 / 예보 구간별 캐시 유지 시간"""
+    now_hour = int(time.time()) // 3600
+    target_hour = timestamp // 3600
+    if target_hour < now_hour:
+        return settings.weather_cache_past_ttl_seconds
+    elif target_hour == now_hour:
+        return settings.weather_cache_present_ttl_seconds
+    else:
+        return settings.weather_cache_forecast_ttl_seconds
+
+
 @function_tool
 @weave.op()
 async def get_weather_with_time(lat: float, lon: float, target_datetime: str):
@@ -54,6 +84,22 @@ async def get_weather_with_time(lat: float, lon: float, target_datetime: str):
         timestamp = datetime_to_unix(datetime.now())
     else:
         timestamp = datetime_to_unix(datetime.fromisoformat(target_datetime))
+
+    # 같은 키를 공유하는 요청이 모두 같은 결과를 받도록 격자 중심/시간 시작으로 조회
+    cache_key = get_weather_cache_key(lat, lon, timestamp)
+    grid_lat, grid_lon, hour = cache_key
+    result = await weather_cache.get_or_fetch(
+        cache_key,
+        lambda: fetch_weather_with_time(grid_lat, grid_lon, hour * 3600),
+        ttl_seconds=get_weather_cache_ttl(timestamp),
+    )
+    if result is None:
+        return "날씨 정보를 조회할 수 없습니다."
+    return result
+
+
+async def fetch_weather_with_time(lat: float, lon: float, timestamp: int) -> dict | None:
+    """OpenWeather timemachine API를 호출하는 함수, 실패 시 None 반환"""
     params = {
         "lat": lat,
         "lon": lon,
@@ -63,46 +109,26 @@ async def get_weather_with_time(lat: float, lon: float, target_datetime: str):
     }
     url = "https://api.openweathermap.org/data/3.0/onecall/timemachine"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            return await response.json()
+    session = get_http_session()
+    async with upstream_limiter.limit("openweather"), session.get(
+        url, params=params, timeout=get_http_timeout("weather")
+    ) as response:
+        if response.status != 200:
+            logger.error(
+                f"OpenWeather API 오류: {response.status} {await response.text()}"
+            )
+            return None
+        return await response.json()
 
 
 @function_tool
 @weave.op()
 async def search_address_to_coordinate(address: str) -> Coordinates | str:
-    url = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
-    headers = {
-        "x-ncp-apigw-api-key-id": settings.naver_map_client_id,
-        "x-ncp-apigw-api-key": settings.naver_map_client_secret,
-        "Accept": "application/json",
-    }
-    params = {"query": address}
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            if response.status != 200:
-                logger.error(
-                    f"Something went wrong! {response.status} {await response.text()}"
-                )
-                return f"{address} 주소를 찾을 수 없습니다."
-
-            data = await response.json()
+    geocode = await get_geocode(address)
+    if geocode is None or not geocode.is_found:
+        return f"{address} 주소를 찾을 수 없습니다."
 
-            if data["meta"]["totalCount"] == 0:
-                logger.error(f"No results found for address: {address}")
-                return f"{address} 주소를 찾을 수 없습니다."
-
-            item = data["addresses"][0]
-            result = {
-                "roadAddress": item.get("roadAddress"),
-                "jibunAddress": item.get("jibunAddress"),
-                "englishAddress": item.get("englishAddress"),
-                "x": item.get("x"),  # 경도
-                "y": item.get("y"),  # 위도
-            }
-
-            return Coordinates(lon=result["x"], lat=result["y"])
+    return Coordinates(lon=geocode.lon, lat=geocode.lat)
 
 
 @input_guardrail
@@ -122,20 +148,25 @@ async def non_korean_guardrail(
     )
 
 
-def get_weater_agent(model: str = "openai/gpt-4.1-nano") -> Agent:
+def get_weater_agent(
+    model: str = "openai/gpt-4.1-nano", prompt: str | None = None
+) -> Agent:
     return Agent(
         name="weather_agent",
         handoff_description="날씨 정보를 제공하는 에이전트",
-        instructions=instructions,
+        instructions=prompt or instructions,
         tools=[get_weather_with_time, search_address_to_coordinate],
         input_guardrails=[non_korean_guardrail],
         model=get_litellm_model(model),
     )
 
 
+agent_registry.register("weather_agent", get_weater_agent, weather_prompts, "get_weather_prompt")
+
+
 @weave.op()
-async def weather_agent_runner(input: str, model: str = "openai/gpt-4.1-nano"):
-    weather_agent = get_weater_agent(model)
+async def weather_agent_runner(input: str | list[dict], model: str = "openai/gpt-4.1-nano"):
+    weather_agent = agent_registry.get_agent("weather_agent", model)
 
     try:
         result = await Runner.run(weather_agent, input, max_turns=3)
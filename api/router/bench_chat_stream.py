@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+# 실행 중인 API 서버에서 /chat/chat 과 /chat/chat/stream 의 첫 응답 시간(TTFB) 비교
+# before: /chat/chat (모든 턴이 끝난 뒤 한 번에 응답)
+# after: /chat/chat/stream (SSE, 도구 호출/답변 조각을 생성되는 대로 전송)
+MESSAGE_LIST = [
+    "강남역 지하철 언제 와?",
+    "내일 부산 날씨랑 오늘 경제 뉴스 같이 알려줘",
+    "요즘 서울에서 열리는 전시회 찾아줘",
+]
+
+
+async def measure_chat(session: aiohttp.ClientSession, base_url: str, message: str) -> dict:
+    start_time = time.perf_counter()
+    async with session.post(f"{base_url}/chat/chat", params={"message": message}) as response:
+        await response.read()
+    total_ms = (time.perf_counter() - start_time) * 1000
+    return {"first_byte_ms": round(total_ms, 1), "total_ms": round(total_ms, 1)}
+
+
+async def measure_chat_stream(session: aiohttp.ClientSession, base_url: str, message: str) -> dict:
+    start_time = time.perf_counter()
+    first_byte_ms, first_delta_ms = None, None
+    event_type_list = []
+    async with session.post(
+        f"{base_url}/chat/chat/stream", params={"message": message}
+    ) as response:
+        async for line in response.content:
+            elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+            if first_byte_ms is None:
+                first_byte_ms = elapsed_ms
+            line = line.decode("utf-8").strip()
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            event_type_list.append(event["type"])
+            if event["type"] == "delta" and first_delta_ms is None:
+                first_delta_ms = elapsed_ms
+    return {
+        "first_byte_ms": first_byte_ms,
+        "first_delta_ms": first_delta_ms,
+        "total_ms": round((time.perf_counter() - start_time) * 1000, 1),
+        "tool_call": event_type_list.count("tool_call"),
+        "delta": event_type_list.count("delta"),
+    }
+
+
+async def run_benchmark(base_url: str) -> list:
+    output_list = []
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120)) as session:
+        for message in MESSAGE_LIST:
+            output_list.append(
+                {
+                    "message": message,
+                    "before": await measure_chat(session, base_url, message),
+                    "after": await measure_chat_stream(session, base_url, message),
+                }
+            )
+    return output_list
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/chat/chat 스트리밍 TTFB 비교")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    args = parser.parse_args()
+    for output in asyncio.run(run_benchmark(args.base_url)):
+        print(output)
+
+# PYTHONPATH=. python api/router/bench_chat_stream.py --base-url http://localhost:8000
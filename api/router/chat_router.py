@@ -1,24 +1,71 @@
+import json
+from typing import AsyncIterator
 from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
 from linebot.exceptions import InvalidSignatureError
+from mongo_db.connection import get_mongo_client
 from mongo_db.schema import User
-from agent_service.head.head_agent_service import chat_with_head_agent
+from agent_service.head.head_agent_service import (
+    chat_with_head_agent,
+    stream_chat_with_head_agent,
+)
 from mongo_db.service import get_user
-from api.service.line_service import line_handler
+from api.service.line_service import handle_line_webhook
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
 
 chat_router = APIRouter(prefix="/chat", tags=["chat"])
 
+
+async def get_chat_user(user_id: str | None) -> User:
+    if not user_id:
+        return User(platform_id="test-1234")
+    user = await get_user(get_mongo_client(), user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+    return user
+
+
 @chat_router.post("/chat")
 async def chat(
     message: str,
     user_id: str = None,
 ):
-    if user_id:
-        user = await get_user(user_id)
-    else:
-        user = User(platform_id="test-1234")
+    user = await get_chat_user(user_id)
     return await chat_with_head_agent(user, message)
 
 
+async def get_sse_stream(user: User, message: str) -> AsyncIterator[str]:
+    try:
+        async for event in stream_chat_with_head_agent(user, message):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        # 응답이 이미 시작되어 상태 코드를 바꿀 수 없으므로 error 이벤트로 알림
+        logger.error(f"스트리밍 대화 실패: {user.platform_id} {e}")
+        error_event = {"type": "error", "text": "답변 생성 중 오류가 발생했습니다."}
+        yield f"event: error\ndata: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+
+
+@chat_router.post("/chat/stream")
+async def chat_stream(
+    message: str,
+    user_id: str = None,
+):
+    """
+    /chat/chat 의 Server-Sent Events 버전입니다.
+    대화 조회 후 바로 start 를 보내고, 하위 에이전트 호출(tool_call, tool_output)과
+    답변 조각(delta)을 생성되는 대로 보내고,
+    마지막에 전체 답변(final)을 보냅니다.
+    """
+    user = await get_chat_user(user_id)
+    return StreamingResponse(
+        get_sse_stream(user, message),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @chat_router.post("/line-callback")
 async def callback(
     request: Request,
@@ -26,7 +73,7 @@ async def callback(
 ):
     body = await request.body()
     try:
-        line_handler.handle(body.decode("utf-8"), x_line_signature)
+        await handle_line_webhook(body.decode("utf-8"), x_line_signature)
     except InvalidSignatureError:
         raise HTTPException(status_code=400, detail="chatbot handle body error.")
     return "OK"
@@ -1,26 +1,48 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
 from motor.motor_asyncio import AsyncIOMotorClient
 from mongo_db.connection import get_mongo_client
-from mongo_db.service import get_conversation, get_conversation_list, delete_conversation
-from mongo_db.schema import Conversation
+from mongo_db.service import (
+    get_conversation,
+    get_conversation_list,
+    get_message_page,
+    delete_conversation,
+)
+from mongo_db.schema import Conversation, MessagePage
 
 conversation_router = APIRouter(prefix="/conversation", tags=["conversation"])
 
 
 @conversation_router.get("/{conversation_id}", response_model=Conversation)
 async def get_conversation_endpoint(
-    conversation_id: str, mongo_client: AsyncIOMotorClient = Depends(get_mongo_client)
+    conversation_id: str,
+    limit: int = Query(default=50, ge=1, le=200),
+    mongo_client: AsyncIOMotorClient = Depends(get_mongo_client),
 ):
-    """특정 대화 ID로 해당 대화의 모든 메시지를 조회합니다."""
+    """특정 대화 ID로 해당 대화와 최근 메시지(limit 개)를 조회합니다."""
     # 대화가 존재하는지 확인
     conversation = await get_conversation(mongo_client, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다")
 
+    conversation.messages = (await get_message_page(mongo_client, conversation_id, limit)).messages
     return conversation
 
 
+@conversation_router.get("/{conversation_id}/messages", response_model=MessagePage)
+async def get_conversation_messages(
+    conversation_id: str,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: Optional[str] = None,
+    mongo_client: AsyncIOMotorClient = Depends(get_mongo_client),
+):
+    """대화 메시지를 페이지 단위로 조회합니다. 이전 페이지는 응답의 next_cursor 를 before 로 전달합니다."""
+    try:
+        return await get_message_page(mongo_client, conversation_id, limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @conversation_router.get("/user/{user_id}", response_model=List[Conversation])
 async def get_user_conversations(
     user_id: str, mongo_client: AsyncIOMotorClient = Depends(get_mongo_client)
@@ -0,0 +1,63 @@
+import asyncio
+import random
+import time
+
+from common.debounce import KeyedDebouncer
+
+# 사용자가 생각을 여러 메시지로 나눠 보낼 때 에이전트 실행 횟수 비교
+# before: 메시지마다 실행 (window_seconds=0)
+# after: KeyedDebouncer 로 window_seconds 안에 연달아 온 메시지를 합쳐 한 번 실행
+BURST_LIST = [
+    ["강남역", "2호선", "언제 와?"],
+    ["내일", "서울 날씨"],
+    ["경제 뉴스", "요약해줘", "짧게", "세 줄로"],
+    ["안녕"],
+]
+
+
+async def send_burst(
+    debouncer: KeyedDebouncer, user_id: str, message_list: list, last_message_at: dict
+) -> None:
+    for message in message_list:
+        last_message_at[user_id] = time.monotonic()
+        debouncer.add(user_id, message)
+        # 메시지 사이 입력 간격
+        await asyncio.sleep(random.uniform(0.2, 0.8))
+
+
+async def run_case(user_count: int, window_seconds: float) -> dict:
+    flush_list = []
+    last_message_at = {}
+
+    def on_flush(user_id: str, message_list: list) -> None:
+        flush_list.append((time.monotonic() - last_message_at[user_id], message_list))
+
+    debouncer = KeyedDebouncer("bench_line_debounce", on_flush, window_seconds=window_seconds)
+    await asyncio.gather(
+        *[
+            send_burst(debouncer, f"U-{i}", BURST_LIST[i % len(BURST_LIST)], last_message_at)
+            for i in range(user_count)
+        ]
+    )
+    await asyncio.sleep(window_seconds + 0.1)
+    delay_list = sorted(delay for delay, _ in flush_list)
+    return {
+        "message": debouncer.stats["item"],
+        "agent_run": len(flush_list),
+        "p95_delay_after_last_message_ms": round(delay_list[int(len(delay_list) * 0.95)] * 1000, 1),
+        "merged_example": flush_list[-1][1],
+    }
+
+
+async def run_benchmark(user_count: int = 200, window_seconds: float = 1.5) -> dict:
+    random.seed(0)
+    return {
+        "before": await run_case(user_count, 0),
+        "after": await run_case(user_count, window_seconds),
+    }
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+
+# PYTHONPATH=. python api/service/bench_line_debounce.py
@@ -0,0 +1,144 @@
+import asyncio
+import random
+from collections import defaultdict
+
+from common.work_queue import KeyedWorkQueue
+
+# 웹훅 폭주 시 메시지 처리 방식 비교 (메시지당 에이전트 실행 시간을 sleep 으로 가정)
+# before: 메시지마다 create_task (동시 실행 수 제한 없음, 같은 사용자 메시지 동시 실행)
+# after: KeyedWorkQueue (worker 수 제한, 사용자별 순서 보장, 최대 대기 수 초과 시 차단)
+# overload: 처리량보다 빠르게 계속 들어올 때 대기 수(max_depth)만으로 차단 vs 예상 대기 시간(max_wait_seconds)으로 차단
+#   reply token 유효 시간(60초)을 token_ttl_seconds 로 축소해 만료 후 처리된 메시지 수 비교
+
+
+class MessageRecorder:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.running_by_user = defaultdict(int)
+        self.user_overlap = 0
+        self.order_dict = defaultdict(list)
+
+    async def handle(self, item: tuple) -> None:
+        user_id, sequence = item
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.running_by_user[user_id] += 1
+        if self.running_by_user[user_id] > 1:
+            self.user_overlap += 1
+        await asyncio.sleep(random.uniform(0.02, 0.08))
+        self.order_dict[user_id].append(sequence)
+        self.running_by_user[user_id] -= 1
+        self.running -= 1
+
+    def get_out_of_order_user(self) -> int:
+        return sum(1 for order in self.order_dict.values() if order != sorted(order))
+
+
+def create_message_list(message_count: int, user_count: int) -> list:
+    return [(f"U-{i % user_count}", i) for i in range(message_count)]
+
+
+async def run_benchmark(
+    message_count: int = 1000, user_count: int = 100, worker_count: int = 8, max_depth: int = 200
+) -> dict:
+    random.seed(0)
+    message_list = create_message_list(message_count, user_count)
+
+    recorder = MessageRecorder()
+    await asyncio.gather(*[recorder.handle(item) for item in message_list])
+    before = {
+        "max_running": recorder.max_running,
+        "user_overlap": recorder.user_overlap,
+        "out_of_order_user": recorder.get_out_of_order_user(),
+    }
+
+    recorder = MessageRecorder()
+    queue = KeyedWorkQueue("bench_line_queue", recorder.handle, worker_count, max_depth)
+    queue.start()
+    for item in message_list:
+        queue.submit(item[0], item)
+    await queue.join()
+    await queue.stop()
+    after = {
+        "max_running": recorder.max_running,
+        "user_overlap": recorder.user_overlap,
+        "out_of_order_user": recorder.get_out_of_order_user(),
+        "queue": queue.get_stats(),
+        "wait_latency": queue.wait_latency.get_stats(),
+    }
+    return {"message_count": message_count, "before": before, "after": after}
+
+
+async def run_overload_case(
+    message_list: list,
+    arrival_interval_seconds: float,
+    token_ttl_seconds: float,
+    max_depth: int,
+    max_wait_seconds=None,
+) -> dict:
+    recorder = MessageRecorder()
+    expired_list = []
+
+    async def handle_expired(item: tuple) -> None:
+        expired_list.append(item)
+
+    queue = KeyedWorkQueue(
+        "bench_line_queue_overload",
+        recorder.handle,
+        worker_count=8,
+        max_depth=max_depth,
+        max_wait_seconds=max_wait_seconds,
+        expired_handler=handle_expired,
+    )
+    # 큐 대기 시간 기록 (token_ttl_seconds 초과 = 만료된 reply token 으로 응답)
+    wait_list = []
+    handle = queue.handler
+
+    async def handle_with_wait(item: tuple) -> None:
+        wait_list.append(asyncio.get_running_loop().time() - submitted_at_dict[item])
+        await handle(item)
+
+    queue.handler = handle_with_wait
+    submitted_at_dict = {}
+    queue.start()
+    for item in message_list:
+        submitted_at_dict[item] = asyncio.get_running_loop().time()
+        queue.submit(item[0], item)
+        await asyncio.sleep(arrival_interval_seconds)
+    await queue.join()
+    await queue.stop()
+    stats = queue.get_stats()
+    return {
+        "processed": len(wait_list),
+        "shed": stats["shed"],
+        "expired": stats["expired"],
+        "max_wait_ms": round(max(wait_list) * 1000, 1),
+        "token_expired_reply": sum(1 for wait in wait_list if wait > token_ttl_seconds),
+    }
+
+
+async def run_overload_benchmark(
+    message_count: int = 800, arrival_interval_seconds: float = 0.0025, token_ttl_seconds: float = 0.3
+) -> dict:
+    # 처리량 약 160건/초 (worker 8, 평균 0.05초) 에 400건/초 유입
+    random.seed(0)
+    message_list = create_message_list(message_count, user_count=400)
+    depth_only = await run_overload_case(
+        message_list, arrival_interval_seconds, token_ttl_seconds, max_depth=200
+    )
+    wait_based = await run_overload_case(
+        message_list,
+        arrival_interval_seconds,
+        token_ttl_seconds,
+        max_depth=200,
+        max_wait_seconds=token_ttl_seconds / 2,
+    )
+    return {"message_count": message_count, "depth_only": depth_only, "wait_based": wait_based}
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+    print(asyncio.run(run_overload_benchmark()))
+
+# PYTHONPATH=. python api/service/bench_line_queue.py
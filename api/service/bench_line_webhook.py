@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+
+from aiohttp import web
+from linebot import LineBotApi
+from linebot.models import TextSendMessage
+
+from configs import settings
+from common.http_client import open_http_client, close_http_client
+from common.metrics import EventLoopLagMonitor
+from api.service.line_service import handle_line_webhook, reply_message_with_aiohttp
+
+# LINE reply API 를 대신하는 로컬 HTTP 서버로 응답 전송 중 이벤트 루프 지연 비교
+# before: 코루틴 안에서 동기 LineBotApi.reply_message 호출 (기존 process_message)
+# after: 공유 세션의 reply_message_with_aiohttp
+
+
+async def handle_reply(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.2)
+    return web.json_response({})
+
+
+def start_stand_in(port: int) -> threading.Event:
+    """
+    reply API 대역 서버를 별도 스레드의 이벤트 루프에서 실행합니다.
+    (같은 루프에서 실행하면 동기 호출이 서버까지 멈춰 교착 상태가 됨)
+    """
+    ready_event, stop_event = threading.Event(), threading.Event()
+
+    async def serve() -> None:
+        app = web.Application()
+        app.router.add_post("/v2/bot/message/reply", handle_reply)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready_event.set()
+        while not stop_event.is_set():
+            await asyncio.sleep(0.05)
+        await runner.cleanup()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready_event.wait()
+    return stop_event
+
+
+def get_signed_body(event_count: int) -> tuple:
+    # 스티커 메시지는 파싱만 되고 처리 task 는 만들지 않음 (서명 검증/파싱 비용만 측정)
+    event_list = [
+        {
+            "type": "message",
+            "mode": "active",
+            "timestamp": int(time.time() * 1000),
+            "source": {"type": "user", "userId": f"U-bench-{i}"},
+            "webhookEventId": f"bench-{i}",
+            "deliveryContext": {"isRedelivery": False},
+            "replyToken": f"reply-{i}",
+            "message": {"type": "sticker", "id": str(i), "packageId": "1", "stickerId": "1"},
+        }
+        for i in range(event_count)
+    ]
+    body = json.dumps({"destination": "bench", "events": event_list})
+    signature = base64.b64encode(
+        hmac.new(settings.line_channel_secret.encode(), body.encode(), hashlib.sha256).digest()
+    ).decode()
+    return body, signature
+
+
+async def measure_loop_lag(reply_count: int, reply_func) -> dict:
+    monitor = EventLoopLagMonitor("bench_line_loop_lag", interval_seconds=0.01)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    start_time = time.perf_counter()
+    await asyncio.gather(*[reply_func(f"reply-{i}") for i in range(reply_count)])
+    elapsed_seconds = time.perf_counter() - start_time
+    # 막혀 있던 동안의 지연이 기록되도록 한 주기 더 대기
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    return {
+        "seconds": round(elapsed_seconds, 2),
+        "loop_lag_p95_ms": monitor.lag_stats.get_percentile(0.95),
+        "loop_lag_max_ms": round(monitor.lag_stats.max_ms, 2),
+    }
+
+
+async def run_benchmark(reply_count: int = 20, port: int = 18081) -> dict:
+    settings.line_api_base_url = f"http://127.0.0.1:{port}"
+    stop_event = start_stand_in(port)
+    await open_http_client()
+
+    line_bot_api = LineBotApi(settings.line_channel_access_token, endpoint=settings.line_api_base_url)
+
+    async def sync_reply(reply_token: str) -> None:
+        line_bot_api.reply_message(reply_token, TextSendMessage(text="벤치마크"))
+
+    async def async_reply(reply_token: str) -> None:
+        await reply_message_with_aiohttp(reply_token, [{"type": "text", "text": "벤치마크"}])
+
+    before = await measure_loop_lag(reply_count, sync_reply)
+    after = await measure_loop_lag(reply_count, async_reply)
+
+    body, signature = get_signed_body(reply_count)
+    start_time = time.perf_counter()
+    await handle_line_webhook(body, signature)
+    ack_ms = (time.perf_counter() - start_time) * 1000
+
+    await close_http_client()
+    stop_event.set()
+    return {
+        "reply_count": reply_count,
+        "before": before,
+        "after": after,
+        "webhook_ack_ms": round(ack_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+
+# PYTHONPATH=. python api/service/bench_line_webhook.py
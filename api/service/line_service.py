@@ -1,33 +1,73 @@
 import asyncio
-import aiohttp
+import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
-from linebot import LineBotApi, WebhookHandler
-from linebot.models import MessageEvent, TextMessage, TextSendMessage
+import aiohttp
+from typing import List, Optional, Set, Tuple
+from linebot import WebhookParser
+from linebot.exceptions import InvalidSignatureError
+from linebot.models import MessageEvent, TextMessage
 
 from configs import settings
 from custom_logger import get_logger
+from common.concurrency import upstream_limiter
+from common.http_client import get_http_session, get_http_timeout
+from common.metrics import LatencyStats
+from common.work_queue import KeyedWorkQueue
+from common.debounce import KeyedDebouncer
+from api.service.webhook_dedupe import WebhookEventDeduper
 from mongo_db.connection import get_mongo_client
+from mongo_db.schema import User
 from mongo_db.service import get_user, create_or_update_user
 from agent_service.head.head_agent_service import chat_with_head_agent
 from agent_service.head.prompts import get_bot_guide
 
 logger = get_logger(__name__)
 
-line_bot_api = LineBotApi(settings.line_channel_access_token)
-line_handler = WebhookHandler(settings.line_channel_secret)
-executor = ThreadPoolExecutor()
+# 서명 검증과 이벤트 파싱만 수행 (네트워크 호출 없음)
+line_parser = WebhookParser(settings.line_channel_secret)
+
+LINE_PUSH_PATH = "/v2/bot/message/push"
+LINE_MULTICAST_PATH = "/v2/bot/message/multicast"
+LINE_REPLY_PATH = "/v2/bot/message/reply"
+LINE_MULTICAST_MAX_RECIPIENTS = 500
+
+# 웹훅 수신부터 응답(ack)까지, 메시지 수신부터 reply 완료까지
+webhook_ack_latency = LatencyStats("line_webhook_ack")
+reply_latency = LatencyStats("line_reply")
+# 대기 작업이 많아 처리하지 못한 메시지에 보내는 응답
+LINE_BUSY_MESSAGE = "지금 요청이 많아 답변이 어려워요. 잠시 후 다시 말씀해 주세요."
+# 전송 중인 부하 차단 응답 task (GC 로 취소되지 않도록 참조 유지)
+busy_reply_task_set: Set[asyncio.Task] = set()
+
+
+def is_reply_token_valid(event: MessageEvent) -> bool:
+    """이벤트 발생 후 line_reply_token_ttl_seconds 가 지나지 않았으면 True"""
+    return time.time() - event.timestamp / 1000 < settings.line_reply_token_ttl_seconds
+
+
+async def send_message(event: MessageEvent, messages: list) -> bool:
+    """
+    reply token 으로 응답하고, 만료되었거나 응답에 실패하면 push 로 보냅니다.
+    """
+    if is_reply_token_valid(event) and await reply_message_with_aiohttp(event.reply_token, messages):
+        return True
+    logger.warning(f"reply 불가, push 로 전송합니다: {event.source.user_id}")
+    return await push_message_with_aiohttp(event.source.user_id, messages)
 
 
-async def process_message(event: MessageEvent):
-    
-    user_message = event.message.text
+async def process_message(event_list: List[MessageEvent]):
+    """
+    같은 사용자가 연달아 보낸 메시지를 합쳐 한 번만 에이전트를 실행하고,
+    마지막 메시지의 reply token 으로 응답합니다. (reply 가 불가능하면 push)
+    """
+    event = event_list[-1]
+    user_message = "\n".join(item.message.text for item in event_list)
     user_platform_id = event.source.user_id
     mongo_client = get_mongo_client()
     user = await get_user(mongo_client, user_platform_id)
     if not user:
-        await create_or_update_user(mongo_client, user_platform_id, "line")
-        user = await get_user(mongo_client, user_platform_id)
+        user = User(platform_id=user_platform_id, platform_type="line")
+        await create_or_update_user(mongo_client, user)
         first_message = f"""
         안녕하세요. 첫 사용자 시군요? 
         {get_bot_guide()}
@@ -37,43 +77,199 @@ async def process_message(event: MessageEvent):
         )
         logger.info("신규 사용자 등록, 가이드 메시지 전송")
 
-    result = await chat_with_head_agent(user, user_message)
-    line_bot_api.reply_message(
-        event.reply_token, TextSendMessage(text=result)
+    with reply_latency.measure():
+        result = await chat_with_head_agent(user, user_message)
+        await send_message(event, [{"type": "text", "text": result}])
+
+
+async def process_expired_message(event_list: List[MessageEvent]):
+    """큐에서 너무 오래 기다린 메시지는 에이전트를 실행하지 않고 LINE_BUSY_MESSAGE 로 응답합니다."""
+    logger.warning(f"메시지 대기 시간 초과로 처리하지 않습니다: {event_list[-1].source.user_id}")
+    await send_message(event_list[-1], [{"type": "text", "text": LINE_BUSY_MESSAGE}])
+
+
+# 사용자별로 순서대로 처리 (같은 대화에 대한 동시 실행 방지), 전체 동시 처리 수 제한
+# 예상 대기 시간이 line_queue_max_wait_seconds 이상이면 받지 않음 (reply token 만료 전 응답)
+line_message_queue = KeyedWorkQueue(
+    "line_message_queue",
+    process_message,
+    worker_count=settings.line_worker_count,
+    max_depth=settings.line_queue_max_depth,
+    max_wait_seconds=settings.line_queue_max_wait_seconds,
+    expired_handler=process_expired_message,
+)
+
+
+def reply_busy_message(event: MessageEvent) -> None:
+    task = asyncio.create_task(
+        send_message(event, [{"type": "text", "text": LINE_BUSY_MESSAGE}])
     )
+    busy_reply_task_set.add(task)
+    task.add_done_callback(busy_reply_task_set.discard)
 
 
-@line_handler.add(MessageEvent, message=TextMessage)
-def handle_message(event):
-    loop = asyncio.get_event_loop()
-    asyncio.create_task(process_message(event))
+def submit_message_list(user_platform_id: str, event_list: List[MessageEvent]) -> None:
+    if not line_message_queue.submit(user_platform_id, event_list):
+        logger.warning(f"메시지 큐 대기가 길어 처리하지 않습니다: {user_platform_id}")
+        reply_busy_message(event_list[-1])
 
 
-async def push_message_with_aiohttp(user_id: str, messages: list):
+# 짧은 간격으로 연달아 온 메시지를 모아 큐에 넣음
+line_message_debouncer = KeyedDebouncer(
+    "line_message_debounce",
+    submit_message_list,
+    window_seconds=settings.line_debounce_seconds,
+    max_wait_seconds=settings.line_debounce_max_seconds,
+)
+
+
+# LINE 재전송 등으로 같은 이벤트가 다시 오면 에이전트를 다시 실행하지 않음
+webhook_event_deduper = WebhookEventDeduper(
+    "line_webhook_dedupe",
+    ttl_seconds=settings.line_webhook_dedupe_ttl_seconds,
+    memory_ttl_seconds=settings.line_webhook_dedupe_memory_ttl_seconds,
+    timeout_seconds=settings.line_webhook_dedupe_timeout_seconds,
+)
+
+
+async def handle_line_webhook(body: str, signature: str) -> int:
     """
-    aiohttp를 사용하여 LINE 메시지 API를 통해 사용자에게 메시지를 푸시합니다.
+    웹훅 서명을 검증하고 이벤트를 파싱한 뒤, 메시지는 line_message_debouncer 에 넣고 바로 반환합니다.
+    이미 받은 webhookEventId 의 이벤트(재전송/중복)는 처리하지 않습니다.
+    이벤트 루프를 막는 동기 네트워크 호출이 없으므로 LINE 에 즉시 응답할 수 있습니다.
+    사용자별로 모인 메시지는 line_message_queue 에서 처리하며,
+    큐가 가득 차거나 예상 대기 시간이 길면 처리하지 않고 LINE_BUSY_MESSAGE 로 응답합니다.
+    서명이 올바르지 않으면 InvalidSignatureError 가 발생합니다.
+
+    Returns:
+        처리할 메시지 이벤트 수 (중복 제외)
+    """
+    if not signature:
+        raise InvalidSignatureError("X-Line-Signature 헤더가 없습니다.")
+    with webhook_ack_latency.measure():
+        event_list = [
+            event
+            for event in line_parser.parse(body, signature)
+            if isinstance(event, MessageEvent) and isinstance(event.message, TextMessage)
+        ]
+        duplicate_list = await asyncio.gather(
+            *[
+                webhook_event_deduper.is_duplicate(
+                    event.webhook_event_id,
+                    event.source.user_id,
+                    bool(event.delivery_context and event.delivery_context.is_redelivery),
+                )
+                for event in event_list
+            ]
+        )
+        message_count = 0
+        # 같은 웹훅 안의 이벤트 순서대로 넣어 사용자별 메시지 순서 유지
+        for event, is_duplicate in zip(event_list, duplicate_list):
+            if is_duplicate:
+                continue
+            line_message_debouncer.add(event.source.user_id, event)
+            message_count += 1
+    return message_count
+
+
+async def post_line_message(
+    path: str, payload: dict, retry_key: Optional[str] = None, upstream: str = "line_push"
+) -> Tuple[int, Optional[float]]:
+    """
+    LINE 메시지 API 에 요청을 보냅니다. 재시도 시 같은 retry_key 를 사용해야 중복 발송되지 않습니다.
 
     Args:
-        user_id: 수신자의 LINE 사용자 ID
-        messages: 보낼 메시지 목록 (dict 형식)
+        path: API 경로 (LINE_PUSH_PATH, LINE_MULTICAST_PATH, LINE_REPLY_PATH)
+        payload: 요청 본문
+        retry_key: X-Line-Retry-Key (UUID), reply 는 retry key 를 지원하지 않으므로 None
+        upstream: 동시 요청 수 제한에 사용할 upstream 이름
 
     Returns:
-        API 호출 결과
+        (HTTP 상태 코드, Retry-After 초), 네트워크 오류이면 상태 코드 0
     """
-    url = "https://api.line.me/v2/bot/message/push"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {settings.line_channel_access_token}",
-        "X-Line-Retry-Key": str(uuid.uuid4()),
     }
-
-    payload = {"to": user_id, "messages": messages}
-
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload, headers=headers) as response:
+    if retry_key is not None:
+        headers["X-Line-Retry-Key"] = retry_key
+    session = get_http_session()
+    try:
+        async with upstream_limiter.limit(upstream), session.post(
+            f"{settings.line_api_base_url}{path}",
+            json=payload,
+            headers=headers,
+            timeout=get_http_timeout("line"),
+        ) as response:
             if response.status != 200:
                 error_content = await response.text()
                 logger.error(f"LINE API 오류: {response.status} - {error_content}")
-                return False
+            retry_after = response.headers.get("Retry-After")
+            return response.status, float(retry_after) if retry_after else None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"LINE API 요청 실패: {path} {e!r}")
+        return 0, None
 
-            return True
+
+async def push_message_with_aiohttp(
+    user_id: str, messages: list, retry_key: Optional[str] = None
+) -> bool:
+    """
+    aiohttp를 사용하여 LINE 메시지 API를 통해 사용자에게 메시지를 푸시합니다.
+
+    Args:
+        user_id: 수신자의 LINE 사용자 ID
+        messages: 보낼 메시지 목록 (dict 형식)
+        retry_key: X-Line-Retry-Key, 없으면 새로 생성
+
+    Returns:
+        API 호출 결과
+    """
+    status, _ = await post_line_message(
+        LINE_PUSH_PATH,
+        {"to": user_id, "messages": messages},
+        retry_key or str(uuid.uuid4()),
+    )
+    return status == 200
+
+
+async def multicast_message_with_aiohttp(
+    user_id_list: List[str], messages: list, retry_key: Optional[str] = None
+) -> bool:
+    """
+    같은 메시지를 여러 사용자에게 한 번의 요청으로 보냅니다. (최대 LINE_MULTICAST_MAX_RECIPIENTS 명)
+
+    Args:
+        user_id_list: 수신자 LINE 사용자 ID 목록
+        messages: 보낼 메시지 목록 (dict 형식)
+        retry_key: X-Line-Retry-Key, 없으면 새로 생성
+
+    Returns:
+        API 호출 결과
+    """
+    status, _ = await post_line_message(
+        LINE_MULTICAST_PATH,
+        {"to": user_id_list, "messages": messages},
+        retry_key or str(uuid.uuid4()),
+    )
+    return status == 200
+
+
+async def reply_message_with_aiohttp(reply_token: str, messages: list) -> bool:
+    """
+    공유 HTTP 세션으로 웹훅 이벤트에 응답 메시지를 보냅니다.
+    스케줄 발송(line_push)과 별도로 동시 요청 수를 제한하여 대량 발송 중에도 응답이 밀리지 않습니다.
+
+    Args:
+        reply_token: 웹훅 이벤트의 reply token
+        messages: 보낼 메시지 목록 (dict 형식)
+
+    Returns:
+        API 호출 결과
+    """
+    status, _ = await post_line_message(
+        LINE_REPLY_PATH,
+        {"replyToken": reply_token, "messages": messages},
+        upstream="line_reply",
+    )
+    return status == 200
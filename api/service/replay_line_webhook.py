@@ -0,0 +1,104 @@
+import asyncio
+import base64
+import copy
+import hashlib
+import hmac
+import json
+
+from configs import settings
+from mongo_db.connection import get_mongo_client
+from mongo_db.indexes import create_indexes
+from api.service.line_service import (
+    handle_line_webhook,
+    line_message_debouncer,
+    webhook_event_deduper,
+)
+
+# 기록된 웹훅(재전송/중복 포함)을 다시 넣어 같은 이벤트가 한 번만 처리되는지 확인 (로컬 mongod 필요)
+# 1. 원본 + 같은 요청 안 중복 + LINE 재전송 -> 고유 이벤트만 처리 (메모리에서 걸러짐)
+# 2. 메모리 초기화(재시작/다른 API 인스턴스 가정) 후 전부 재전송 -> 모두 Mongo 에서 걸러짐
+
+
+def get_message_event(webhook_event_id: str, user_id: str, text: str, is_redelivery: bool = False) -> dict:
+    return {
+        "type": "message",
+        "mode": "active",
+        "timestamp": 1760000000000,
+        "source": {"type": "user", "userId": user_id},
+        "webhookEventId": webhook_event_id,
+        "deliveryContext": {"isRedelivery": is_redelivery},
+        "replyToken": f"reply-{webhook_event_id}",
+        "message": {"type": "text", "id": webhook_event_id, "quoteToken": "q", "text": text},
+    }
+
+
+# 기록된 웹훅 요청 (사용자 ID/토큰은 익명화)
+RECORDED_WEBHOOK_LIST = [
+    [get_message_event("replay-01", "U-replay-a", "강남역")],
+    [
+        get_message_event("replay-02", "U-replay-a", "2호선 언제 와?"),
+        get_message_event("replay-03", "U-replay-b", "내일 서울 날씨"),
+    ],
+    # 처리가 느려 타임아웃 -> LINE 재전송
+    [get_message_event("replay-01", "U-replay-a", "강남역", is_redelivery=True)],
+    [
+        get_message_event("replay-02", "U-replay-a", "2호선 언제 와?", is_redelivery=True),
+        get_message_event("replay-03", "U-replay-b", "내일 서울 날씨", is_redelivery=True),
+    ],
+    # 같은 요청 안에 중복된 이벤트
+    [
+        get_message_event("replay-04", "U-replay-b", "경제 뉴스"),
+        get_message_event("replay-04", "U-replay-b", "경제 뉴스"),
+    ],
+]
+UNIQUE_EVENT_COUNT = 4
+
+
+def get_signed_body(event_list: list) -> tuple:
+    body = json.dumps({"destination": "replay", "events": event_list})
+    signature = base64.b64encode(
+        hmac.new(settings.line_channel_secret.encode(), body.encode(), hashlib.sha256).digest()
+    ).decode()
+    return body, signature
+
+
+async def replay(webhook_list: list) -> list:
+    processed_list = []
+    # 에이전트를 실행하지 않고 처리 대상이 된 이벤트만 기록
+    line_message_debouncer.window_seconds = 0
+    line_message_debouncer.on_flush = lambda user_id, event_list: processed_list.extend(
+        event.webhook_event_id for event in event_list
+    )
+    for event_list in webhook_list:
+        body, signature = get_signed_body(event_list)
+        await handle_line_webhook(body, signature)
+    return processed_list
+
+
+async def main():
+    mongo_client = get_mongo_client()
+    await create_indexes(mongo_client)
+    await mongo_client["database"]["webhook_events"].delete_many(
+        {"webhook_event_id": {"$regex": "^replay-"}}
+    )
+    event_count = sum(len(event_list) for event_list in RECORDED_WEBHOOK_LIST)
+
+    processed_list = await replay(RECORDED_WEBHOOK_LIST)
+    assert sorted(processed_list) == sorted(set(processed_list)), processed_list
+    assert len(processed_list) == UNIQUE_EVENT_COUNT, processed_list
+    print(f"1. 이벤트 {event_count}개 중 {len(processed_list)}개 처리: {webhook_event_deduper.get_stats()}")
+
+    webhook_event_deduper.clear_memory()
+    processed_list = await replay(copy.deepcopy(RECORDED_WEBHOOK_LIST))
+    assert processed_list == [], processed_list
+    print(f"2. 메모리 초기화 후 재전송 모두 차단: {webhook_event_deduper.get_stats()}")
+
+    await mongo_client["database"]["webhook_events"].delete_many(
+        {"webhook_event_id": {"$regex": "^replay-"}}
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# PYTHONPATH=. python api/service/replay_line_webhook.py
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+
+from custom_logger import get_logger
+from common.cache import AsyncTTLCache
+from common.metrics import register_metrics
+from common.utils import get_now_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import WebhookEvent
+from mongo_db.service import claim_webhook_event
+
+logger = get_logger(__name__)
+
+
+class WebhookEventDeduper:
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: int,
+        memory_ttl_seconds: int,
+        timeout_seconds: float = 0.5,
+        max_size: int = 10000,
+    ):
+        """
+        LINE 웹훅 이벤트를 webhookEventId 로 중복 제거합니다.
+        같은 프로세스의 중복은 메모리(최근 memory_ttl_seconds)에서 먼저 걸러내고,
+        재시작/다른 API 인스턴스로 재전송된 이벤트는 webhook_events 컬렉션(ttl_seconds 보관)으로 걸러냅니다.
+        Mongo 기록이 timeout_seconds 안에 끝나지 않으면 웹훅 응답이 늦어지지 않도록 중복이 아닌 것으로 처리합니다.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self.seen_cache = AsyncTTLCache(f"{name}_seen", memory_ttl_seconds, max_size)
+        self.stats = {
+            "event": 0,
+            "no_event_id": 0,
+            "redelivery": 0,
+            "duplicate_memory": 0,
+            "duplicate_mongo": 0,
+            "error": 0,
+            "timeout": 0,
+        }
+        register_metrics(name, self.get_stats)
+
+    async def is_duplicate(
+        self, webhook_event_id: Optional[str], platform_id: Optional[str], is_redelivery: bool = False
+    ) -> bool:
+        self.stats["event"] += 1
+        if is_redelivery:
+            self.stats["redelivery"] += 1
+        if not webhook_event_id:
+            self.stats["no_event_id"] += 1
+            return False
+        if self.seen_cache.get(webhook_event_id):
+            self.stats["duplicate_memory"] += 1
+            return True
+        # Mongo 조회 중 같은 이벤트가 또 들어와도 걸러지도록 먼저 기록
+        self.seen_cache.set(webhook_event_id, True)
+
+        now = get_now_kst()
+        webhook_event = WebhookEvent(
+            webhook_event_id=webhook_event_id,
+            platform_id=platform_id,
+            is_redelivery=is_redelivery,
+            created=now,
+            expire_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        try:
+            is_claimed = await asyncio.wait_for(
+                claim_webhook_event(get_mongo_client(), webhook_event), timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.stats["error"] += 1
+            self.stats["timeout"] += 1
+            logger.error(f"웹훅 이벤트 중복 확인 시간 초과: {webhook_event_id}")
+            return False
+        except Exception as e:
+            # DB 장애 시에는 메시지를 잃지 않도록 처리 (메모리 중복 제거만 적용)
+            self.stats["error"] += 1
+            logger.error(f"웹훅 이벤트 중복 확인 실패: {webhook_event_id} {e}")
+            return False
+        if not is_claimed:
+            self.stats["duplicate_mongo"] += 1
+            return True
+        return False
+
+    def clear_memory(self) -> None:
+        """메모리 기록을 비웁니다. (재시작/다른 인스턴스 상황 재현용)"""
+        self.seen_cache.store.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "duplicate": self.stats["duplicate_memory"] + self.stats["duplicate_mongo"],
+        }
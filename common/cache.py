@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from common.metrics import register_metrics
+
+
+class AsyncTTLCache:
+    def __init__(self, name: str, ttl_seconds: float, max_size: int = 1024):
+        """
+        name: 지표에 노출될 캐시 이름
+        ttl_seconds: 기본 캐시 유지 시간(초)
+        max_size: 최대 저장 개수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+
+        같은 키로 동시에 들어온 요청은 하나의 fetcher 호출을 공유합니다 (single-flight).
+        fetcher 결과가 None 이거나 예외가 발생하면 캐시하지 않습니다.
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.store: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.inflight_dict: Dict[Hashable, asyncio.Future] = {}
+        self.hit_count = 0
+        self.miss_count = 0
+        self.coalesced_count = 0
+        register_metrics(f"cache.{name}", self.get_stats)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self.store.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self.store[key]
+            return None
+        self.store.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        self.store[key] = (time.monotonic() + ttl_seconds, value)
+        self.store.move_to_end(key)
+        while len(self.store) > self.max_size:
+            self.store.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """
+        캐시된 값을 반환하고, 없으면 fetcher를 호출하여 결과를 저장합니다.
+        같은 키의 fetcher 를 실행하던 요청이 취소되면, 기다리던 요청은 취소되지 않고 다시 조회합니다.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hit_count += 1
+                return value
+
+            inflight = self.inflight_dict.get(key)
+            if inflight is None:
+                break
+            self.coalesced_count += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 이 요청이 아니라 fetcher 를 실행하던 요청이 취소된 경우에만 다시 조회
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        self.miss_count += 1
+        inflight = asyncio.get_running_loop().create_future()
+        self.inflight_dict[key] = inflight
+        try:
+            value = await fetcher()
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except Exception as e:
+            inflight.set_exception(e)
+            # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            inflight.exception()
+            raise
+        else:
+            if value is not None:
+                self.set(key, value, ttl_seconds)
+            inflight.set_result(value)
+            return value
+        finally:
+            del self.inflight_dict[key]
+
+    def get_stats(self) -> dict:
+        request_count = self.hit_count + self.miss_count + self.coalesced_count
+        return {
+            "size": len(self.store),
+            "inflight": len(self.inflight_dict),
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+            "coalesced": self.coalesced_count,
+            "hit_ratio": round(
+                (self.hit_count + self.coalesced_count) / request_count, 4
+            )
+            if request_count
+            else 0.0,
+        }
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from configs import settings
+from common.metrics import register_metrics
+
+
+class UpstreamLimiter:
+    def __init__(self, name: str, limit_dict: Dict[str, int]):
+        """
+        외부 연동(upstream)별 동시 요청 수를 제한합니다.
+        limit_dict: upstream 이름 -> 최대 동시 요청 수
+        """
+        self.name = name
+        self.limit_dict = limit_dict
+        self.semaphore_dict = {
+            upstream: asyncio.Semaphore(limit) for upstream, limit in limit_dict.items()
+        }
+        self.stats_dict = {
+            upstream: {"in_use": 0, "waiting": 0, "acquired": 0, "max_wait_ms": 0.0}
+            for upstream in limit_dict
+        }
+        register_metrics(name, self.get_stats)
+
+    @asynccontextmanager
+    async def limit(self, upstream: str):
+        semaphore = self.semaphore_dict[upstream]
+        stats = self.stats_dict[upstream]
+        start_time = time.perf_counter()
+        stats["waiting"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["waiting"] -= 1
+        wait_ms = (time.perf_counter() - start_time) * 1000
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], round(wait_ms, 2))
+        stats["acquired"] += 1
+        stats["in_use"] += 1
+        try:
+            yield
+        finally:
+            stats["in_use"] -= 1
+            semaphore.release()
+
+    def get_stats(self) -> dict:
+        return {
+            upstream: {**stats, "limit": self.limit_dict[upstream]}
+            for upstream, stats in self.stats_dict.items()
+        }
+
+
+upstream_limiter = UpstreamLimiter(
+    "upstream_limiter",
+    {
+        "llm": settings.upstream_limit_llm,
+        "seoul_api": settings.upstream_limit_seoul_api,
+        "openweather": settings.upstream_limit_openweather,
+        "line_push": settings.upstream_limit_line_push,
+        "line_reply": settings.upstream_limit_line_reply,
+    },
+)
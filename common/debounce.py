@@ -0,0 +1,79 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, List
+
+from common.metrics import register_metrics
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class KeyedDebouncer:
+    def __init__(
+        self,
+        name: str,
+        on_flush: Callable[[Hashable, List[Any]], None],
+        window_seconds: float = 1.5,
+        max_wait_seconds: float = 5.0,
+    ):
+        """
+        같은 키(예: 사용자 ID)로 짧은 간격 안에 연달아 들어온 항목을 모아 한 번에 넘깁니다.
+        마지막 항목 이후 window_seconds 동안 새 항목이 없으면 on_flush(key, item_list) 를 호출합니다.
+        첫 항목 이후 max_wait_seconds 가 지나면 계속 들어오더라도 바로 넘깁니다.
+        window_seconds 가 0 이하이면 모으지 않고 바로 넘깁니다.
+        """
+        self.name = name
+        self.on_flush = on_flush
+        self.window_seconds = window_seconds
+        self.max_wait_seconds = max_wait_seconds
+        # 키별 (첫 항목 시각, 항목 목록, 예약된 flush)
+        self.pending_dict: Dict[Hashable, tuple] = {}
+        self.stats = {"item": 0, "flush": 0, "merged": 0}
+        register_metrics(name, self.get_stats)
+
+    def add(self, key: Hashable, item: Any) -> None:
+        self.stats["item"] += 1
+        if self.window_seconds <= 0:
+            self.run_flush(key, [item])
+            return
+
+        now = time.monotonic()
+        first_at, item_list, timer = self.pending_dict.get(key, (now, [], None))
+        if timer is not None:
+            timer.cancel()
+        item_list.append(item)
+        delay = min(self.window_seconds, first_at + self.max_wait_seconds - now)
+        if delay <= 0:
+            self.pending_dict.pop(key, None)
+            self.run_flush(key, item_list)
+            return
+        timer = asyncio.get_running_loop().call_later(delay, self.flush, key)
+        self.pending_dict[key] = (first_at, item_list, timer)
+
+    def flush(self, key: Hashable) -> None:
+        pending = self.pending_dict.pop(key, None)
+        if pending is None:
+            return
+        _, item_list, timer = pending
+        timer.cancel()
+        self.run_flush(key, item_list)
+
+    def flush_all(self) -> None:
+        """대기 중인 항목을 모두 바로 넘깁니다. (종료 시 사용)"""
+        for key in list(self.pending_dict):
+            self.flush(key)
+
+    def run_flush(self, key: Hashable, item_list: List[Any]) -> None:
+        self.stats["flush"] += 1
+        self.stats["merged"] += len(item_list) - 1
+        try:
+            self.on_flush(key, item_list)
+        except Exception as e:
+            logger.error(f"{self.name} flush 실패: {key} {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "window_seconds": self.window_seconds,
+            "pending_key": len(self.pending_dict),
+        }
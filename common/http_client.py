@@ -0,0 +1,98 @@
+import aiohttp
+
+from configs import settings
+from custom_logger import get_logger
+from common.metrics import register_metrics
+
+logger = get_logger(__name__)
+
+# 외부 연동별 요청 타임아웃(초)
+http_timeout_dict = {
+    "line": aiohttp.ClientTimeout(total=10, connect=3),
+    "weather": aiohttp.ClientTimeout(total=10, connect=3),
+    "geocode": aiohttp.ClientTimeout(total=5, connect=3),
+    "subway": aiohttp.ClientTimeout(total=5, connect=3),
+    "news": aiohttp.ClientTimeout(total=15, connect=5),
+}
+
+http_session: aiohttp.ClientSession | None = None
+http_stats = {
+    "request": 0,
+    "connection_created": 0,
+    "connection_reused": 0,
+}
+
+
+async def on_request_start(session, trace_config_ctx, params):
+    http_stats["request"] += 1
+
+
+async def on_connection_create_end(session, trace_config_ctx, params):
+    http_stats["connection_created"] += 1
+
+
+async def on_connection_reuseconn(session, trace_config_ctx, params):
+    http_stats["connection_reused"] += 1
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    connector = aiohttp.TCPConnector(
+        limit=settings.http_pool_limit,
+        limit_per_host=settings.http_pool_limit_per_host,
+        ttl_dns_cache=settings.http_dns_cache_ttl_seconds,
+        keepalive_timeout=settings.http_keepalive_timeout_seconds,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        trace_configs=[trace_config],
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
+
+async def open_http_client() -> None:
+    """앱 시작 시 공유 HTTP 세션을 생성합니다."""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = create_http_session()
+        logger.info("HTTP client opened")
+
+
+async def close_http_client() -> None:
+    """앱 종료 시 공유 HTTP 세션을 닫습니다."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+        logger.info("HTTP client closed")
+    http_session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    공유 HTTP 세션을 반환합니다.
+    lifespan 밖(스크립트 실행 등)에서 호출되면 세션을 새로 생성합니다.
+    """
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = create_http_session()
+    return http_session
+
+
+def get_http_timeout(integration: str) -> aiohttp.ClientTimeout:
+    return http_timeout_dict[integration]
+
+
+def get_http_stats() -> dict:
+    connection_count = http_stats["connection_created"] + http_stats["connection_reused"]
+    return {
+        **http_stats,
+        "reuse_ratio": round(http_stats["connection_reused"] / connection_count, 4)
+        if connection_count
+        else 0.0,
+    }
+
+
+register_metrics("http_client", get_http_stats)
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+metrics_registry: Dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, getter: Callable[[], dict]) -> None:
+    """
+    /metrics 에 노출할 지표 조회 함수를 등록합니다.
+    """
+    metrics_registry[name] = getter
+
+
+def get_metrics() -> Dict[str, dict]:
+    """
+    등록된 모든 지표를 조회합니다.
+    """
+    return {name: getter() for name, getter in metrics_registry.items()}
+
+
+class LatencyStats:
+    def __init__(self, name: str, window_size: int = 1000):
+        """
+        name: 지표에 노출될 이름
+        window_size: 백분위 계산에 사용할 최근 측정값 개수
+        """
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent_ms = deque(maxlen=window_size)
+        register_metrics(f"latency.{name}", self.get_stats)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.recent_ms.append(elapsed_ms)
+
+    @contextmanager
+    def measure(self):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record((time.perf_counter() - start_time) * 1000)
+
+    def get_percentile(self, percentile: float) -> float:
+        if not self.recent_ms:
+            return 0.0
+        sorted_ms = sorted(self.recent_ms)
+        index = min(len(sorted_ms) - 1, int(len(sorted_ms) * percentile))
+        return round(sorted_ms[index], 2)
+
+    def get_stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.get_percentile(0.5),
+            "p95_ms": self.get_percentile(0.95),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class EventLoopLagMonitor:
+    def __init__(self, name: str, interval_seconds: float = 0.5):
+        """
+        일정 주기로 sleep 하여 예정보다 늦게 깨어난 시간(이벤트 루프 지연)을 측정합니다.
+        name: 지표에 노출될 이름 (latency.<name>)
+        """
+        self.interval_seconds = interval_seconds
+        self.lag_stats = LatencyStats(name)
+        self.task = None
+
+    async def run(self) -> None:
+        while True:
+            start_time = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            lag_seconds = time.perf_counter() - start_time - self.interval_seconds
+            self.lag_stats.record(max(lag_seconds, 0.0) * 1000)
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
@@ -82,4 +82,54 @@ def get_now_kst() -> datetime:
     return datetime.now(timezone(timedelta(hours=9)))
 
 def get_now_timestamp() -> int:
-    return int(datetime.now(timezone(timedelta(hours=9))).timestamp())
\ No newline at end of file
+    return int(datetime.now(timezone(timedelta(hours=9))).timestamp())
+
+KST = timezone(timedelta(hours=9))
+DAY_NAME_LIST = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def to_kst(dt: datetime) -> datetime:
+    """
+    KST 시각으로 변환합니다. tzinfo 가 없는 값(MongoDB 조회 결과)은 UTC 로 간주합니다.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(KST)
+
+
+def get_weekday_set(day_of_week: list[str] | None) -> set[int]:
+    """
+    요일 이름 리스트를 weekday 번호(월=0) 집합으로 변환합니다. 비어 있으면 매일로 간주합니다.
+    "monday", "Mon", "mon" 형태를 모두 허용합니다.
+    """
+    weekday_set = set()
+    for day_name in day_of_week or []:
+        prefix = day_name.strip().lower()[:3]
+        for weekday, name in enumerate(DAY_NAME_LIST):
+            if prefix and name.startswith(prefix):
+                weekday_set.add(weekday)
+    return weekday_set or set(range(7))
+
+
+def get_next_run_at(
+    time_hour: int | None,
+    time_minute: int | None,
+    day_of_week: list[str] | None,
+    after: datetime | None = None,
+) -> datetime | None:
+    """
+    after 이후(after 는 제외) 처음 실행될 KST 시각을 계산합니다.
+    날짜를 더해 가며 계산하므로 월/연도 경계에서도 올바르게 동작합니다.
+    """
+    if time_hour is None or time_minute is None:
+        return None
+    after = to_kst(after) if after is not None else get_now_kst()
+    weekday_set = get_weekday_set(day_of_week)
+    for day_offset in range(8):
+        day = after.date() + timedelta(days=day_offset)
+        run_at = datetime(
+            day.year, day.month, day.day, time_hour, time_minute, tzinfo=KST
+        )
+        if run_at > after and run_at.weekday() in weekday_set:
+            return run_at
+    return None
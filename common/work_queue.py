@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from common.metrics import LatencyStats, register_metrics
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class KeyedWorkQueue:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        worker_count: int = 8,
+        max_depth: int = 200,
+        max_wait_seconds: Optional[float] = None,
+        expired_handler: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        """
+        작업을 정해진 개수의 worker 로 처리하는 큐입니다.
+        같은 키(예: 사용자 ID)의 작업은 들어온 순서대로 한 번에 하나씩 처리하고,
+        다른 키의 작업은 동시에 처리합니다.
+        name: 지표에 노출될 이름 (<name>, latency.<name>_wait)
+        handler: handler(item) 형태의 작업 처리 함수
+        max_depth: 대기 중인 작업의 최대 개수 (초과 시 submit 이 False 반환)
+        max_wait_seconds: 작업의 최대 대기 시간, 예상 대기 시간이 이를 넘으면 submit 이 False 반환
+        expired_handler: 실제 대기 시간이 max_wait_seconds 를 넘은 작업은 handler 대신 expired_handler(item) 로 처리
+        """
+        self.name = name
+        self.handler = handler
+        self.worker_count = worker_count
+        self.max_depth = max_depth
+        self.max_wait_seconds = max_wait_seconds
+        self.expired_handler = expired_handler
+        # 작업 한 건의 평균 처리 시간 (지수 이동 평균), 예상 대기 시간 계산용
+        self.service_seconds: Optional[float] = None
+        # 키별 대기 작업 (추가 시각, 작업)
+        self.pending_dict: Dict[Hashable, Deque[Tuple[float, Any]]] = {}
+        # 처리할 차례가 된 키 (처리 중인 키는 들어가지 않음)
+        self.ready_queue: asyncio.Queue = asyncio.Queue()
+        self.active_key_set: Set[Hashable] = set()
+        self.depth = 0
+        self.worker_task_list: List[asyncio.Task] = []
+        self.wait_latency = LatencyStats(f"{name}_wait")
+        self.stats = {"submitted": 0, "done": 0, "error": 0, "shed": 0, "expired": 0, "max_depth_seen": 0}
+        register_metrics(name, self.get_stats)
+
+    def get_expected_wait_seconds(self) -> Optional[float]:
+        """지금 추가한 작업이 처리되기까지 예상 대기 시간 (처리 기록이 없으면 None)"""
+        if self.service_seconds is None:
+            return None
+        busy_count = self.depth + len(self.active_key_set)
+        return round(busy_count // self.worker_count * self.service_seconds, 3)
+
+    def submit(self, key: Hashable, item: Any) -> bool:
+        """
+        작업을 추가합니다.
+        대기 작업이 max_depth 이상이거나 예상 대기 시간이 max_wait_seconds 이상이면 추가하지 않고 False 반환
+        """
+        expected_wait_seconds = self.get_expected_wait_seconds()
+        if self.depth >= self.max_depth or (
+            self.max_wait_seconds is not None
+            and expected_wait_seconds is not None
+            and expected_wait_seconds >= self.max_wait_seconds
+        ):
+            self.stats["shed"] += 1
+            return False
+        pending = self.pending_dict.setdefault(key, deque())
+        pending.append((time.perf_counter(), item))
+        self.depth += 1
+        self.stats["submitted"] += 1
+        self.stats["max_depth_seen"] = max(self.stats["max_depth_seen"], self.depth)
+        # 처리 중이거나 이미 차례를 기다리는 키는 다시 넣지 않음
+        if len(pending) == 1 and key not in self.active_key_set:
+            self.ready_queue.put_nowait(key)
+        return True
+
+    async def worker(self) -> None:
+        while True:
+            key = await self.ready_queue.get()
+            pending = self.pending_dict[key]
+            submitted_at, item = pending.popleft()
+            self.depth -= 1
+            self.active_key_set.add(key)
+            started_at = time.perf_counter()
+            wait_seconds = started_at - submitted_at
+            self.wait_latency.record(wait_seconds * 1000)
+            try:
+                if (
+                    self.max_wait_seconds is not None
+                    and self.expired_handler is not None
+                    and wait_seconds > self.max_wait_seconds
+                ):
+                    self.stats["expired"] += 1
+                    await self.expired_handler(item)
+                else:
+                    await self.handler(item)
+                    self.record_service_time(time.perf_counter() - started_at)
+                self.stats["done"] += 1
+            except Exception as e:
+                self.stats["error"] += 1
+                logger.error(f"{self.name} 작업 처리 실패: {key} {e}")
+            finally:
+                self.active_key_set.discard(key)
+                if pending:
+                    # 같은 키의 다음 작업은 다른 키 뒤에서 차례를 기다림
+                    self.ready_queue.put_nowait(key)
+                else:
+                    del self.pending_dict[key]
+                self.ready_queue.task_done()
+
+    def record_service_time(self, seconds: float) -> None:
+        if self.service_seconds is None:
+            self.service_seconds = seconds
+        else:
+            self.service_seconds = 0.8 * self.service_seconds + 0.2 * seconds
+
+    def start(self) -> None:
+        if self.worker_task_list:
+            return
+        self.worker_task_list = [
+            asyncio.create_task(self.worker()) for _ in range(self.worker_count)
+        ]
+
+    async def join(self) -> None:
+        """대기 중인 작업이 모두 처리될 때까지 기다립니다."""
+        await self.ready_queue.join()
+
+    async def stop(self, drain_timeout_seconds: float = 30) -> None:
+        """대기 중인 작업을 drain_timeout_seconds 동안 처리한 뒤 worker 를 종료합니다."""
+        try:
+            await asyncio.wait_for(self.join(), timeout=drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} 작업 {self.depth}건을 처리하지 못하고 종료합니다.")
+        for task in self.worker_task_list:
+            task.cancel()
+        await asyncio.gather(*self.worker_task_list, return_exceptions=True)
+        self.worker_task_list = []
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "worker_count": self.worker_count,
+            "max_depth": self.max_depth,
+            "max_wait_seconds": self.max_wait_seconds,
+            "service_seconds": round(self.service_seconds, 3) if self.service_seconds is not None else None,
+            "expected_wait_seconds": self.get_expected_wait_seconds(),
+            "depth": self.depth,
+            "active": len(self.active_key_set),
+            "waiting_key": self.ready_queue.qsize(),
+        }
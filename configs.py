@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     open_weather_api_key: str = dot_env["OPEN_WEATHER_API_KEY"]
     line_channel_access_token: str = dot_env["LINE_CHANNEL_ACCESS_TOKEN"]
     line_channel_secret: str = dot_env["LINE_CHANNEL_SECRET"]
+    line_api_base_url: str = "https://api.line.me"
     wandb.login(key=dot_env["WANDB_API_KEY"])
     naver_map_client_id: str = dot_env["NAVER_MAP_CLIENT_ID"]
     naver_map_client_secret: str = dot_env["NAVER_MAP_CLIENT_SECRET"]
@@ -27,6 +28,55 @@ class Settings(BaseSettings):
     db_host: str = "db"
     db_name: str = dot_env["DB_NAME"]
     seoul_openapi_key: str = dot_env["SEOUL_OPENAPI_KEY"]
+    subway_arrival_cache_ttl_seconds: int = 15
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 20
+    http_dns_cache_ttl_seconds: int = 300
+    http_keepalive_timeout_seconds: int = 30
+    news_refresh_interval_seconds: int = 600
+    geocode_cache_ttl_seconds: int = 30 * 24 * 3600
+    geocode_negative_cache_ttl_seconds: int = 24 * 3600
+    weather_cache_grid_degree: float = 0.05
+    weather_cache_past_ttl_seconds: int = 24 * 3600
+    weather_cache_present_ttl_seconds: int = 600
+    weather_cache_forecast_ttl_seconds: int = 1800
+    schedule_agent_timeout_seconds: float = 20.0
+    schedule_compose_model: str = "openai/gpt-4.1-nano"
+    schedule_shared_result_ttl_seconds: int = 60
+    schedule_warmup_lead_seconds: int = 120
+    schedule_warmup_scan_interval_seconds: int = 15
+    schedule_resync_interval_seconds: int = 60
+    schedule_change_poll_interval_seconds: float = 2.0
+    schedule_change_poll_lookback_seconds: float = 5.0
+    schedule_load_horizon_seconds: int = 3600
+    schedule_misfire_grace_seconds: int = 300
+    schedule_dispatch_concurrency: int = 32
+    schedule_lease_seconds: int = 120
+    scheduler_in_api_enabled: bool = True
+    worker_heartbeat_interval_seconds: int = 10
+    push_outbox_batch_size: int = 2000
+    push_outbox_poll_interval_seconds: float = 1.0
+    push_outbox_lease_seconds: int = 60
+    push_outbox_retention_seconds: int = 7 * 24 * 3600
+    push_retry_base_seconds: float = 1.0
+    push_retry_max_seconds: float = 60.0
+    push_max_attempts: int = 5
+    upstream_limit_llm: int = 16
+    upstream_limit_seoul_api: int = 8
+    upstream_limit_openweather: int = 8
+    upstream_limit_line_push: int = 16
+    upstream_limit_line_reply: int = 16
+    intent_router_enabled: bool = True
+    line_worker_count: int = 8
+    line_queue_max_depth: int = 200
+    # reply token 은 웹훅 수신 후 약 1분간 유효, 큐 대기 + 에이전트 실행이 그 안에 끝나도록 대기 시간 제한
+    line_reply_token_ttl_seconds: float = 60.0
+    line_queue_max_wait_seconds: float = 30.0
+    line_debounce_seconds: float = 1.5
+    line_debounce_max_seconds: float = 5.0
+    line_webhook_dedupe_ttl_seconds: int = 24 * 3600
+    line_webhook_dedupe_memory_ttl_seconds: int = 600
+    line_webhook_dedupe_timeout_seconds: float = 0.5
 
 
 class DevSettings(Settings):
@@ -1,9 +1,19 @@
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from configs import settings
-from schedule_service.service import scheduler, job_runner
+from schedule_service.service import create_scheduler
+from schedule_service.heartbeat import get_worker_health
+from agent_service.subway.subway_agent import get_station_index
+from agent_service.news.news_agent import ynx_rss
+from common.metrics import get_metrics
+from common.http_client import open_http_client, close_http_client
+from mongo_db.connection import get_mongo_client
+from mongo_db.indexes import bootstrap_indexes
+from mongo_db.service import migrate_active_conversation, migrate_embedded_message_list
+from api.service.line_service import line_message_debouncer, line_message_queue
 from custom_logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,14 +21,30 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # start up contexts
-    scheduler.add_job(job_runner, "interval", seconds=25)
-    scheduler.start()
-    logger.info("Scheduler started")
+    await open_http_client()
+    await bootstrap_indexes(get_mongo_client())
+    await migrate_embedded_message_list(get_mongo_client())
+    await migrate_active_conversation(get_mongo_client())
+    get_station_index()
+    ynx_rss.start_background_refresh(settings.news_refresh_interval_seconds)
+    line_message_queue.start()
+    # 별도 worker(python -m schedule_service.worker) 사용 시 scheduler_in_api_enabled=False
+    # 이때는 엔진을 만들지 않고, API 의 스케줄 변경은 worker 가 updated 조회로 반영
+    scheduler = create_scheduler() if settings.scheduler_in_api_enabled else None
+    if scheduler is not None:
+        scheduler.start()
+        logger.info("Scheduler started")
 
     yield
     # Clean up contexts
-    scheduler.shutdown()
-    logger.info("Scheduler shutdown")
+    if scheduler is not None:
+        await scheduler.stop()
+        logger.info("Scheduler shutdown")
+    # 모으는 중인 메시지도 처리 후 종료
+    line_message_debouncer.flush_all()
+    await line_message_queue.stop()
+    await ynx_rss.stop_background_refresh()
+    await close_http_client()
     
 def create_app(env: str = "dev", lifespan: asynccontextmanager = None):
     app = FastAPI(
@@ -56,5 +82,15 @@ add_routes(app)
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/health-check/scheduler")
+async def scheduler_health_check():
+    worker_health = await get_worker_health(settings.worker_heartbeat_interval_seconds)
+    status_code = 200 if worker_health["status"] == "ok" else 503
+    return JSONResponse(worker_health, status_code=status_code)
+
+@app.get("/metrics")
+async def metrics():
+    return get_metrics()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=9199)
@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from mongo_db.connection import get_mongo_client
+from mongo_db.service import get_claimable_push_outbox_query
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueryPlanError(Exception):
+    """핫 쿼리가 인덱스를 사용하지 않을 때 발생하는 예외"""
+
+
+# 컬렉션별 인덱스 정의
+index_model_dict = {
+    "users": [
+        IndexModel([("platform_id", ASCENDING)], unique=True, name="platform_id_unique"),
+    ],
+    "conversations": [
+        IndexModel(
+            [("conversation_id", ASCENDING)], unique=True, name="conversation_id_unique"
+        ),
+        IndexModel([("platform_id", ASCENDING)], name="platform_id"),
+        # 유저당 사용 중인 대화는 하나 (동시에 온 첫 메시지가 대화를 두 개 만들지 않도록)
+        IndexModel(
+            [("platform_id", ASCENDING), ("is_active", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"is_active": True},
+            name="platform_id_active_unique",
+        ),
+    ],
+    "schedule_jobs": [
+        IndexModel([("schedule_id", ASCENDING)], unique=True, name="schedule_id_unique"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("next_run_at", ASCENDING)], name="next_run_at"),
+        IndexModel([("updated", ASCENDING)], name="updated"),
+    ],
+    "messages": [
+        # created 가 같은 메시지도 순서가 정해지도록 _id 포함 (페이지 cursor)
+        IndexModel(
+            [("conversation_id", ASCENDING), ("created", ASCENDING), ("_id", ASCENDING)],
+            name="conversation_id_created_id",
+        ),
+    ],
+    "geocode_cache": [
+        IndexModel([("address_key", ASCENDING)], unique=True, name="address_key_unique"),
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0, name="expire_at_ttl"),
+    ],
+    "worker_heartbeats": [
+        IndexModel([("worker_id", ASCENDING)], unique=True, name="worker_id_unique"),
+        # 종료된 worker 의 기록은 1시간 후 삭제
+        IndexModel([("updated", ASCENDING)], expireAfterSeconds=3600, name="updated_ttl"),
+    ],
+    "prepared_payloads": [
+        IndexModel(
+            [("content_key", ASCENDING), ("run_at", ASCENDING)],
+            unique=True,
+            name="content_key_run_at_unique",
+        ),
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0, name="expire_at_ttl"),
+    ],
+    "push_outbox": [
+        IndexModel([("outbox_id", ASCENDING)], unique=True, name="outbox_id_unique"),
+        # claim 의 $or 두 조건 모두 next_attempt_at 순서로 읽어 정렬 없이 합침 (SORT_MERGE)
+        # (pending: status + next_attempt_at, sending: status + next_attempt_at 순서로 lease_expire_at 확인)
+        IndexModel(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING), ("lease_expire_at", ASCENDING)],
+            name="status_next_attempt_at_lease_expire_at",
+        ),
+        # 재시도하는 multicast 묶음의 나머지 메시지 claim
+        IndexModel([("multicast_retry_key", ASCENDING)], name="multicast_retry_key"),
+        # 발송 완료/실패 후 expire_at 이 지나면 삭제 (pending/sending 은 expire_at 이 없음)
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0, name="expire_at_ttl"),
+    ],
+    "webhook_events": [
+        IndexModel(
+            [("webhook_event_id", ASCENDING)], unique=True, name="webhook_event_id_unique"
+        ),
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0, name="expire_at_ttl"),
+    ],
+}
+
+# mongo_db/service.py 의 핫 쿼리 형태 (컬렉션, 필터, 정렬)
+hot_query_list = [
+    ("users", {"platform_id": "index-check"}, None),
+    ("conversations", {"conversation_id": "index-check"}, None),
+    ("conversations", {"platform_id": "index-check"}, None),
+    ("conversations", {"platform_id": "index-check", "is_active": True}, None),
+    ("messages", {"conversation_id": "index-check"}, [("created", -1), ("_id", -1)]),
+    (
+        "messages",
+        {
+            "conversation_id": "index-check",
+            "$or": [
+                {"created": {"$lt": datetime(2000, 1, 1)}},
+                {"created": datetime(2000, 1, 1), "_id": {"$lt": ObjectId("0" * 24)}},
+            ],
+        },
+        [("created", -1), ("_id", -1)],
+    ),
+    ("schedule_jobs", {"schedule_id": "index-check"}, None),
+    ("schedule_jobs", {"user_id": "index-check"}, None),
+    ("schedule_jobs", {"updated": {"$gt": datetime(2000, 1, 1)}}, [("updated", 1)]),
+    (
+        "schedule_jobs",
+        {
+            "next_run_at": {"$lte": datetime(2000, 1, 1)},
+            "$or": [{"lease_expire_at": None}, {"lease_expire_at": {"$lte": datetime(2000, 1, 1)}}],
+        },
+        [("next_run_at", 1)],
+    ),
+    ("geocode_cache", {"address_key": "index-check"}, None),
+    (
+        "prepared_payloads",
+        {"content_key": "index-check", "run_at": datetime(2000, 1, 1), "status": "ready"},
+        None,
+    ),
+    ("push_outbox", {"outbox_id": {"$in": ["index-check"]}}, None),
+    # claim_push_outbox_list 와 같은 조회/정렬
+    ("push_outbox", get_claimable_push_outbox_query(datetime(2000, 1, 1)), [("next_attempt_at", 1)]),
+    (
+        "push_outbox",
+        {
+            "multicast_retry_key": {"$in": ["index-check"]},
+            **get_claimable_push_outbox_query(datetime(2000, 1, 1)),
+        },
+        None,
+    ),
+]
+
+
+async def create_indexes(mongo_client: AsyncIOMotorClient) -> None:
+    """
+    필요한 인덱스를 생성합니다. 이미 존재하는 인덱스는 그대로 둡니다.
+    """
+    database = mongo_client["database"]
+    for collection_name, index_model_list in index_model_dict.items():
+        try:
+            await database[collection_name].create_indexes(index_model_list)
+        except OperationFailure as e:
+            logger.error(f"인덱스 생성 실패: {collection_name} {e}")
+            raise
+    logger.info(f"인덱스 생성 완료: {list(index_model_dict.keys())}")
+
+
+def get_plan_stage_list(plan: dict) -> List[str]:
+    """explain 결과의 실행 계획에서 stage 이름을 모두 반환합니다."""
+    stage_list = []
+    if "stage" in plan:
+        stage_list.append(plan["stage"])
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stage_list += get_plan_stage_list(plan[key])
+    for child_plan in plan.get("inputStages", []):
+        stage_list += get_plan_stage_list(child_plan)
+    return stage_list
+
+
+async def verify_query_plans(
+    mongo_client: AsyncIOMotorClient, raise_on_collscan: bool = True
+) -> List[str]:
+    """
+    핫 쿼리마다 explain을 실행하여 COLLSCAN 으로 실행되는 쿼리를 찾습니다.
+    raise_on_collscan=True 이면 QueryPlanError를 발생시킵니다.
+    """
+    database = mongo_client["database"]
+    collscan_list = []
+    for collection_name, query, sort in hot_query_list:
+        cursor = database[collection_name].find(query)
+        if sort is not None:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stage_list = get_plan_stage_list(explain["queryPlanner"]["winningPlan"])
+        # 정렬까지 인덱스로 처리되지 않으면 메모리 정렬(SORT) 단계가 생김
+        if "COLLSCAN" in stage_list or (sort is not None and "SORT" in stage_list):
+            collscan_list.append(f"{collection_name} {query}")
+            logger.error(f"COLLSCAN 쿼리 발견: {collection_name} {query} {stage_list}")
+
+    if collscan_list and raise_on_collscan:
+        raise QueryPlanError(f"COLLSCAN 쿼리: {collscan_list}")
+    return collscan_list
+
+
+async def bootstrap_indexes(mongo_client: AsyncIOMotorClient) -> None:
+    """
+    앱 시작 시 인덱스를 생성하고 핫 쿼리의 실행 계획을 검증합니다.
+    """
+    await create_indexes(mongo_client)
+    await verify_query_plans(mongo_client, raise_on_collscan=False)
+
+
+async def main():
+    mongo_client = get_mongo_client()
+    await create_indexes(mongo_client)
+    await verify_query_plans(mongo_client)
+    print("모든 핫 쿼리가 인덱스를 사용합니다.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# PYTHONPATH=. python mongo_db/indexes.py
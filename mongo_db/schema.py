@@ -13,7 +13,8 @@ class User(BaseModel):
 
 
 class Message(BaseModel):
-    role: str = Field(description="보낸 사람 (user 또는 bot)")
+    conversation_id: Optional[str] = Field(default=None, description="연결된 대화 ID")
+    role: str = Field(description="보낸 사람 (user 또는 assistant)")
     content: str = Field(description="메시지 내용")
     message_type: Optional[str] = Field(
         default="text", description="메시지 유형 (예: text, image 등)"
@@ -21,12 +22,24 @@ class Message(BaseModel):
     created: Optional[datetime] = Field(default=None, description="생성 시각")
     updated: Optional[datetime] = Field(default=None, description="업데이트 시각")
 
+class MessagePage(BaseModel):
+    messages: List[Message] = Field(default_factory=list, description="메시지 목록 (시간순)")
+    next_cursor: Optional[str] = Field(
+        default=None, description="이전 페이지 조회용 cursor (더 이전 메시지가 없으면 None)"
+    )
+
 class Conversation(BaseModel):
     conversation_id: str = Field(description="대화 ID")
     platform_id: str = Field(description="연결된 유저의 ID")
+    is_active: bool = Field(default=True, description="사용 중인 대화 여부 (유저당 하나)")
     created: Optional[datetime] = Field(default=None, description="생성 시각")
     updated: Optional[datetime] = Field(default=None, description="업데이트 시각")
-    messages: Optional[List[Message]] = Field(default_factory=list, description="메시지 목록")
+    messages: Optional[List[Message]] = Field(
+        default_factory=list, description="메시지 목록 (messages 컬렉션에서 조회)"
+    )
+    recent_messages: Optional[List[Message]] = Field(
+        default_factory=list, description="최근 메시지 목록 (최대 RECENT_MESSAGE_SIZE 개)"
+    )
 
 
 class ScheduleJob(BaseModel):
@@ -48,3 +61,68 @@ class ScheduleJob(BaseModel):
     created: Optional[datetime] = Field(default=None, description="생성 시각")
     updated: Optional[datetime] = Field(default=None, description="업데이트 시각")
     sended_at: Optional[datetime] = Field(default=None, description="송신 시각")
+    next_run_at: Optional[datetime] = Field(default=None, description="다음 실행 시각 (KST)")
+    lease_owner: Optional[str] = Field(default=None, description="실행 중인 worker ID")
+    lease_expire_at: Optional[datetime] = Field(default=None, description="실행 lease 만료 시각")
+
+
+class GeocodeCache(BaseModel):
+    address_key: str = Field(description="정규화된 주소 (캐시 키)")
+    is_found: bool = Field(description="주소 검색 성공 여부")
+    lon: Optional[float] = Field(default=None, description="경도")
+    lat: Optional[float] = Field(default=None, description="위도")
+    created: Optional[datetime] = Field(default=None, description="생성 시각")
+    expire_at: Optional[datetime] = Field(default=None, description="만료 시각 (TTL 인덱스)")
+
+
+class WorkerHeartbeat(BaseModel):
+    worker_id: str = Field(description="스케줄 worker ID (ScheduleEngine.owner)")
+    updated: datetime = Field(description="마지막 보고 시각")
+    queue_depth: int = Field(default=0, description="dispatch 대기 작업 수")
+    running: int = Field(default=0, description="실행 중인 작업 수")
+    next_run_in_seconds: Optional[float] = Field(default=None, description="다음 실행까지 남은 시간(초)")
+    lateness_p95_ms: float = Field(default=0.0, description="최근 실행 지연 p95(ms)")
+    loop_lag_p95_ms: float = Field(default=0.0, description="최근 이벤트 루프 지연 p95(ms)")
+
+
+class PreparedPayload(BaseModel):
+    content_key: str = Field(description="내용 키 (섹션 키 또는 digest:<섹션 키 목록>)")
+    run_at: datetime = Field(description="사용될 스케줄 실행 시각")
+    status: str = Field(default="pending", description="준비 상태 (pending, ready)")
+    owner: Optional[str] = Field(default=None, description="준비 중인 worker ID")
+    agent_name: Optional[str] = Field(default=None, description="에이전트 이름 (섹션인 경우)")
+    answer: Optional[str] = Field(default=None, description="준비된 답변/메시지")
+    created: Optional[datetime] = Field(default=None, description="생성 시각")
+    expire_at: Optional[datetime] = Field(default=None, description="만료 시각 (TTL 인덱스)")
+
+
+class PushOutbox(BaseModel):
+    outbox_id: str = Field(description="발송 ID (스케줄 회차별로 고유, 중복 적재 방지)")
+    platform_id: str = Field(description="수신자 LINE 사용자 ID")
+    messages: List[dict] = Field(description="보낼 메시지 목록 (LINE 메시지 형식)")
+    payload_key: str = Field(description="메시지 내용 해시 (같은 내용끼리 multicast 로 묶음)")
+    retry_key: str = Field(description="단건 push 의 X-Line-Retry-Key (재시도 시 재사용)")
+    multicast_retry_key: Optional[str] = Field(
+        default=None, description="multicast 묶음의 X-Line-Retry-Key (재시도 시 재사용)"
+    )
+    multicast_size: Optional[int] = Field(
+        default=None, description="multicast 묶음의 수신자 수 (재시도 시 묶음 전체를 가져왔는지 확인)"
+    )
+    status: str = Field(default="pending", description="발송 상태 (pending, sending, sent, failed)")
+    attempt: int = Field(default=0, description="발송 시도 횟수")
+    next_attempt_at: datetime = Field(description="다음 발송 시도 시각")
+    owner: Optional[str] = Field(default=None, description="발송 중인 worker ID")
+    lease_expire_at: Optional[datetime] = Field(default=None, description="발송 lease 만료 시각")
+    run_at: Optional[datetime] = Field(default=None, description="스케줄 실행 예정 시각")
+    created: Optional[datetime] = Field(default=None, description="생성 시각")
+    sent_at: Optional[datetime] = Field(default=None, description="발송 완료 시각")
+    error: Optional[str] = Field(default=None, description="마지막 발송 오류")
+    expire_at: Optional[datetime] = Field(default=None, description="만료 시각 (TTL 인덱스, 발송 완료/실패 후)")
+
+
+class WebhookEvent(BaseModel):
+    webhook_event_id: str = Field(description="LINE 웹훅 이벤트 ID (webhookEventId)")
+    platform_id: Optional[str] = Field(default=None, description="보낸 사용자 ID")
+    is_redelivery: bool = Field(default=False, description="LINE 재전송 여부")
+    created: Optional[datetime] = Field(default=None, description="처음 받은 시각")
+    expire_at: Optional[datetime] = Field(default=None, description="만료 시각 (TTL 인덱스)")
@@ -1,16 +1,54 @@
 import asyncio
-from typing import List
-from datetime import datetime
+import base64
+import json
+from typing import Callable, List, Optional
+from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from bson.errors import InvalidId
 from mongo_db.connection import get_mongo_client
-from mongo_db.schema import User, Conversation, Message, ScheduleJob
-
-from common.utils import get_now_kst
+from mongo_db.schema import (
+    User,
+    Conversation,
+    Message,
+    MessagePage,
+    ScheduleJob,
+    GeocodeCache,
+    WorkerHeartbeat,
+    PreparedPayload,
+    PushOutbox,
+    WebhookEvent,
+)
+
+from common.utils import get_now_kst, get_next_run_at
 from custom_logger import get_logger
 from uuid import uuid4
 
 logger = get_logger(__name__)
 
+# conversations.recent_messages 에 유지하는 최근 메시지 개수
+RECENT_MESSAGE_SIZE = 20
+
+# 스케줄 작업 변경 알림 함수 (schedule_id, 변경된 작업 또는 삭제 시 None)
+schedule_change_listener_list: List[Callable[[str, Optional[ScheduleJob]], None]] = []
+
+
+def add_schedule_change_listener(
+    listener: Callable[[str, Optional[ScheduleJob]], None]
+) -> None:
+    """스케줄 작업이 생성/수정/삭제될 때 호출할 함수를 등록합니다."""
+    schedule_change_listener_list.append(listener)
+
+
+def notify_schedule_change(schedule_id: str, schedule_job: Optional[ScheduleJob]) -> None:
+    for listener in schedule_change_listener_list:
+        try:
+            listener(schedule_id, schedule_job)
+        except Exception as e:
+            logger.error(f"스케줄 변경 알림 실패: {schedule_id} {e}")
+
 
 async def create_or_update_user(mongo_client: AsyncIOMotorClient, user: User) -> None:
     """유저 정보 생성 또는 업데이트"""
@@ -37,12 +75,12 @@ async def create_or_update_user(mongo_client: AsyncIOMotorClient, user: User) ->
         )
 
 
-async def get_user(mongo_client: AsyncIOMotorClient, platform_id: str) -> User:
+async def get_user(mongo_client: AsyncIOMotorClient, platform_id: str) -> User | None:
     collection = mongo_client["database"]["users"]
     user = await collection.find_one({"platform_id": platform_id})
     if user is None:
         logger.info(f"유저 정보가 없습니다. platform_id: {platform_id}")
-        raise
+        return None
     return User(**user)
 
 
@@ -57,24 +95,47 @@ async def update_user_memory(
 
 async def create_conversation(
     mongo_client: AsyncIOMotorClient, platform_id: str
-) -> None:
-    conversation = Conversation(
-        conversation_id=str(uuid4()),
-        platform_id=platform_id,
-    )
-    collection = mongo_client["database"]["conversations"]
+) -> Conversation:
+    """
+    유저의 사용 중인 대화를 만듭니다. (대화 초기화 시 기존 대화 삭제 후 호출)
+    동시에 다른 요청이 먼저 만들었으면 그 대화를 반환합니다.
+    """
     user_info = await get_user(mongo_client, platform_id)
     if user_info is None:
-        logger.info(f"유저 정보가 없습니다. platform_id: {platform_id}")
-        raise
-    conversation.created = get_now_kst()
-    conversation.updated = get_now_kst()
-    conversation.messages = []
-    await collection.update_one(
-        {"conversation_id": conversation.conversation_id},
-        {"$set": conversation.model_dump()},
-        upsert=True,
-    )
+        raise ValueError(f"유저 정보가 없습니다. platform_id: {platform_id}")
+    return await get_or_create_active_conversation(mongo_client, platform_id, 0)
+
+async def get_or_create_active_conversation(
+    mongo_client: AsyncIOMotorClient, platform_id: str, recent_size: int
+) -> Conversation:
+    """
+    유저의 사용 중인(is_active) 대화를 조회하고, 없으면 생성합니다.
+    최근 recent_size 개의 메시지만 함께 조회하여 한 번의 왕복으로 처리합니다.
+    같은 유저의 첫 메시지가 동시에 들어오면 먼저 생성된 대화를 사용합니다. (platform_id_active_unique 인덱스)
+    """
+    collection = mongo_client["database"]["conversations"]
+    now = get_now_kst()
+    query = {"platform_id": platform_id, "is_active": True}
+    projection = {"messages": 0, "recent_messages": {"$slice": -recent_size}}
+    try:
+        conversation = await collection.find_one_and_update(
+            query,
+            {
+                "$setOnInsert": {
+                    "conversation_id": str(uuid4()),
+                    "created": now,
+                    "updated": now,
+                    "recent_messages": [],
+                }
+            },
+            projection=projection,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        conversation = await collection.find_one(query, projection)
+    return Conversation(**conversation)
+
 
 async def get_user_list(
     mongo_client: AsyncIOMotorClient,
@@ -90,7 +151,9 @@ async def get_conversation(
     mongo_client: AsyncIOMotorClient, conversation_id: str
 ) -> Conversation:
     collection = mongo_client["database"]["conversations"]
-    conversation = await collection.find_one({"conversation_id": conversation_id})
+    conversation = await collection.find_one(
+        {"conversation_id": conversation_id}, {"messages": 0}
+    )
     if conversation is None:
         return None
     return Conversation(**conversation)
@@ -100,7 +163,7 @@ async def get_conversation_list(
     mongo_client: AsyncIOMotorClient, platform_id: str
 ) -> List[Conversation]:
     collection = mongo_client["database"]["conversations"]
-    cursor = collection.find({"platform_id": platform_id})
+    cursor = collection.find({"platform_id": platform_id}, {"messages": 0})
     output_list = []
     async for conversation in cursor:
         output_list.append(Conversation(**conversation))
@@ -109,22 +172,157 @@ async def get_conversation_list(
 async def append_message(
     mongo_client: AsyncIOMotorClient, conversation_id: str, message: Message
 ) -> None:
-    collection = mongo_client["database"]["conversations"]
-    conversation = await get_conversation(mongo_client, conversation_id)
-    if conversation is None:
-        logger.info(f"대화 정보가 없습니다. conversation_id: {conversation_id}")
-        raise
+    await append_message_list(mongo_client, conversation_id, [message])
 
-    message.created = get_now_kst()
-    message.updated = get_now_kst()
 
-    await collection.update_one(
+async def append_message_list(
+    mongo_client: AsyncIOMotorClient, conversation_id: str, message_list: List[Message]
+) -> None:
+    """messages 컬렉션에 메시지를 추가하고 대화의 updated 를 갱신합니다."""
+    now = get_now_kst()
+    for message in message_list:
+        message.conversation_id = conversation_id
+        if message.created is None:
+            message.created = now
+        message.updated = now
+    message_dump_list = [message.model_dump() for message in message_list]
+
+    result = await mongo_client["database"]["conversations"].update_one(
         {"conversation_id": conversation_id},
         {
-            "$push": {"messages": message.model_dump()},
-            "$set": {"updated": message.updated},
+            "$set": {"updated": now},
+            "$push": {
+                "recent_messages": {
+                    "$each": message_dump_list,
+                    "$slice": -RECENT_MESSAGE_SIZE,
+                }
+            },
         },
     )
+    if result.matched_count == 0:
+        logger.info(f"대화 정보가 없습니다. conversation_id: {conversation_id}")
+        raise ValueError(f"대화 정보가 없습니다. conversation_id: {conversation_id}")
+
+    await mongo_client["database"]["messages"].insert_many(message_dump_list)
+
+
+async def get_recent_message_list(
+    mongo_client: AsyncIOMotorClient, conversation_id: str, limit: int
+) -> List[Message]:
+    """최근 limit 개의 메시지를 시간순으로 반환합니다."""
+    collection = mongo_client["database"]["messages"]
+    cursor = (
+        collection.find({"conversation_id": conversation_id}, {"_id": 0})
+        .sort([("created", -1), ("_id", -1)])
+        .limit(limit)
+    )
+    output_list = [Message(**message) async for message in cursor]
+    output_list.reverse()
+    return output_list
+
+
+def encode_message_cursor(created: datetime, message_id: ObjectId) -> str:
+    payload = json.dumps({"created": created.isoformat(), "id": str(message_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_message_cursor(cursor: str) -> tuple:
+    """cursor 를 (created, _id) 로 변환합니다. 올바르지 않으면 ValueError"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["created"]), ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"올바르지 않은 cursor 입니다: {cursor}") from e
+
+
+async def get_message_page(
+    mongo_client: AsyncIOMotorClient,
+    conversation_id: str,
+    limit: int = 50,
+    before: Optional[str] = None,
+) -> MessagePage:
+    """
+    before cursor 이전의 메시지를 최신순으로 최대 limit 개 조회하여 시간순으로 반환합니다.
+    created 가 같은 메시지(이관된 대화 등)도 빠지거나 겹치지 않도록 (created, _id) 순서로 나눕니다.
+    이전 페이지는 반환된 next_cursor 를 before 로 전달합니다.
+    """
+    query = {"conversation_id": conversation_id}
+    if before is not None:
+        created, message_id = decode_message_cursor(before)
+        query["$or"] = [
+            {"created": {"$lt": created}},
+            {"created": created, "_id": {"$lt": message_id}},
+        ]
+    collection = mongo_client["database"]["messages"]
+    cursor = collection.find(query).sort([("created", -1), ("_id", -1)]).limit(limit + 1)
+    document_list = [message async for message in cursor]
+    next_cursor = None
+    if len(document_list) > limit:
+        document_list = document_list[:limit]
+        next_cursor = encode_message_cursor(document_list[-1]["created"], document_list[-1]["_id"])
+    document_list.reverse()
+    return MessagePage(
+        messages=[Message(**message) for message in document_list], next_cursor=next_cursor
+    )
+
+
+async def migrate_embedded_message_list(mongo_client: AsyncIOMotorClient) -> int:
+    """conversations.messages 배열에 남아있는 메시지를 messages 컬렉션으로 옮깁니다."""
+    collection = mongo_client["database"]["conversations"]
+    cursor = collection.find(
+        {"messages.0": {"$exists": True}}, {"conversation_id": 1, "messages": 1}
+    )
+    migrated_count = 0
+    async for conversation in cursor:
+        message_list = []
+        for message in conversation["messages"]:
+            message = Message(**message)
+            message.conversation_id = conversation["conversation_id"]
+            message_list.append(message.model_dump())
+        await mongo_client["database"]["messages"].insert_many(message_list)
+        await collection.update_one(
+            {"_id": conversation["_id"]},
+            {
+                "$unset": {"messages": ""},
+                "$set": {"recent_messages": message_list[-RECENT_MESSAGE_SIZE:]},
+            },
+        )
+        migrated_count += len(message_list)
+    if migrated_count > 0:
+        logger.info(f"대화 메시지 이관 완료: {migrated_count}개")
+    return migrated_count
+
+
+async def migrate_active_conversation(mongo_client: AsyncIOMotorClient) -> int:
+    """
+    is_active 가 없는 기존 대화 중 유저별로 가장 최근 대화를 사용 중인 대화로 표시하고,
+    나머지(동시 요청으로 중복 생성된 대화)는 사용하지 않는 대화로 표시합니다.
+    """
+    collection = mongo_client["database"]["conversations"]
+    cursor = collection.find(
+        {"is_active": {"$exists": False}}, {"platform_id": 1}
+    ).sort("updated", -1)
+    platform_id_set = set()
+    migrated_count = 0
+    async for conversation in cursor:
+        is_active = conversation["platform_id"] not in platform_id_set
+        platform_id_set.add(conversation["platform_id"])
+        if is_active:
+            try:
+                await collection.update_one(
+                    {"_id": conversation["_id"]}, {"$set": {"is_active": True}}
+                )
+            except DuplicateKeyError:
+                # 이미 새로 만든 사용 중인 대화가 있음
+                is_active = False
+        if not is_active:
+            await collection.update_one(
+                {"_id": conversation["_id"]}, {"$set": {"is_active": False}}
+            )
+        migrated_count += 1
+    if migrated_count > 0:
+        logger.info(f"대화 is_active 이관 완료: {migrated_count}개")
+    return migrated_count
 
 
 async def delete_conversation(
@@ -132,6 +330,9 @@ async def delete_conversation(
 ) -> None:
     collection = mongo_client["database"]["conversations"]
     await collection.delete_one({"conversation_id": conversation_id})
+    await mongo_client["database"]["messages"].delete_many(
+        {"conversation_id": conversation_id}
+    )
 
 async def create_schedule_job(
     mongo_client: AsyncIOMotorClient, schedule_job: ScheduleJob
@@ -139,17 +340,23 @@ async def create_schedule_job(
     collection = mongo_client["database"]["schedule_jobs"]
     schedule_job.created = get_now_kst()
     schedule_job.updated = get_now_kst()
+    schedule_job.next_run_at = get_next_run_at(
+        schedule_job.time_hour, schedule_job.time_minute, schedule_job.day_of_week
+    )
     await collection.update_one(
         {"schedule_id": schedule_job.schedule_id},
         {"$set": schedule_job.model_dump()},
         upsert=True,
     )
+    notify_schedule_change(schedule_job.schedule_id, schedule_job)
 
 async def get_schedule_job(
     mongo_client: AsyncIOMotorClient, schedule_id: str
-) -> ScheduleJob:
+) -> ScheduleJob | None:
     collection = mongo_client["database"]["schedule_jobs"]
     schedule_job = await collection.find_one({"schedule_id": schedule_id})
+    if schedule_job is None:
+        return None
     return ScheduleJob(**schedule_job)
 
 async def get_schedule_job_list(
@@ -162,11 +369,32 @@ async def get_schedule_job_list(
         output_list.append(ScheduleJob(**schedule_job))
     return output_list
 
-async def get_schedule_job_list_by_time(
-    mongo_client: AsyncIOMotorClient, time_hour: int, time_minute: int
+async def get_schedule_job_list_by_next_run(
+    mongo_client: AsyncIOMotorClient, until: datetime
+) -> List[ScheduleJob]:
+    """next_run_at 이 until 이전이고 실행 중(lease 유효)이 아닌 스케줄 작업을 실행 시각 순으로 조회"""
+    collection = mongo_client["database"]["schedule_jobs"]
+    cursor = collection.find(
+        {
+            "next_run_at": {"$lte": until},
+            "$or": [
+                {"lease_expire_at": None},
+                {"lease_expire_at": {"$lte": get_now_kst()}},
+            ],
+        }
+    ).sort("next_run_at", 1)
+    output_list = []
+    async for schedule_job in cursor:
+        output_list.append(ScheduleJob(**schedule_job))
+    return output_list
+
+
+async def get_schedule_job_list_updated_after(
+    mongo_client: AsyncIOMotorClient, updated_after: datetime
 ) -> List[ScheduleJob]:
+    """updated 가 updated_after 이후인(다른 프로세스에서 생성/수정된) 스케줄 작업을 수정 순으로 조회"""
     collection = mongo_client["database"]["schedule_jobs"]
-    cursor = collection.find({"time_hour": time_hour, "time_minute": time_minute})
+    cursor = collection.find({"updated": {"$gt": updated_after}}).sort("updated", 1)
     output_list = []
     async for schedule_job in cursor:
         output_list.append(ScheduleJob(**schedule_job))
@@ -180,28 +408,439 @@ async def update_schedule_job(
     schedule = await get_schedule_job(mongo_client, schedule_id)
     if schedule is None:
         logger.info(f"스케줄 작업 정보가 없습니다. schedule_id: {schedule_id}")
-        raise
+        raise ValueError(f"스케줄 작업 정보가 없습니다. schedule_id: {schedule_id}")
     schedule_job.updated = get_now_kst()
-    print(schedule_job.model_dump(exclude_none=True))
+    # 시간/요일이 바뀌었을 수 있으므로 다음 실행 시각을 다시 계산
+    merged_job = schedule.model_copy(update=schedule_job.model_dump(exclude_none=True))
+    schedule_job.next_run_at = get_next_run_at(
+        merged_job.time_hour, merged_job.time_minute, merged_job.day_of_week
+    )
+    merged_job.next_run_at = schedule_job.next_run_at
     await collection.update_one(
         {"schedule_id": schedule_id},
         {"$set": schedule_job.model_dump(exclude_none=True)},
     )
+    notify_schedule_change(schedule_id, merged_job)
 
-async def update_schedule_job_sended_at(
-    mongo_client: AsyncIOMotorClient, schedule_id: str, sended_at: datetime
-) -> None:
+async def claim_schedule_job(
+    mongo_client: AsyncIOMotorClient,
+    schedule_id: str,
+    next_run_at: datetime,
+    owner: str,
+    lease_seconds: int,
+) -> ScheduleJob | None:
+    """
+    next_run_at 회차의 실행 권한(lease)을 원자적으로 획득합니다.
+    다른 worker 가 유효한 lease 를 가지고 있거나 회차가 바뀌었으면 None 반환
+    """
     collection = mongo_client["database"]["schedule_jobs"]
-    await collection.update_one(
-        {"schedule_id": schedule_id},
-        {"$set": {"sended_at": sended_at}},
+    now = get_now_kst()
+    schedule_job = await collection.find_one_and_update(
+        {
+            "schedule_id": schedule_id,
+            "next_run_at": next_run_at,
+            "$or": [
+                {"lease_expire_at": None},
+                {"lease_expire_at": {"$lte": now}},
+            ],
+        },
+        {
+            "$set": {
+                "lease_owner": owner,
+                "lease_expire_at": now + timedelta(seconds=lease_seconds),
+            }
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if schedule_job is None:
+        return None
+    return ScheduleJob(**schedule_job)
+
+async def renew_schedule_job_lease(
+    mongo_client: AsyncIOMotorClient, schedule_id: str, owner: str, lease_seconds: int
+) -> bool:
+    """lease 를 연장합니다. 이미 다른 worker 에게 넘어갔으면 False 반환"""
+    collection = mongo_client["database"]["schedule_jobs"]
+    result = await collection.update_one(
+        {"schedule_id": schedule_id, "lease_owner": owner},
+        {"$set": {"lease_expire_at": get_now_kst() + timedelta(seconds=lease_seconds)}},
+    )
+    return result.matched_count == 1
+
+async def complete_schedule_job_run(
+    mongo_client: AsyncIOMotorClient,
+    schedule_id: str,
+    owner: str,
+    sended_at: datetime,
+    next_run_at: datetime | None,
+    updated: datetime | None,
+) -> ScheduleJob | None:
+    """
+    실행 완료 후 송신 시각과 다음 실행 시각을 기록하고 lease 를 해제합니다.
+    claim 이후 작업이 수정되었으면(updated 가 다름) 수정 때 계산된 next_run_at 을 유지합니다.
+    완료 기록 후의 작업을 반환하고, lease 를 잃었으면 기록하지 않고 None 반환
+    """
+    collection = mongo_client["database"]["schedule_jobs"]
+    schedule_job = await collection.find_one_and_update(
+        {"schedule_id": schedule_id, "lease_owner": owner, "updated": updated},
+        {
+            "$set": {
+                "sended_at": sended_at,
+                "next_run_at": next_run_at,
+                "lease_owner": None,
+                "lease_expire_at": None,
+            }
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if schedule_job is None:
+        return await release_schedule_job_lease(mongo_client, schedule_id, owner, sended_at)
+    return ScheduleJob(**schedule_job)
+
+async def release_schedule_job_lease(
+    mongo_client: AsyncIOMotorClient, schedule_id: str, owner: str, sended_at: datetime
+) -> ScheduleJob | None:
+    """
+    송신 시각만 기록하고 lease 를 해제합니다. (실행 중 수정된 작업은 수정된 내용을 유지)
+    해제 후의 작업을 반환하고, lease 를 잃었으면 None 반환
+    """
+    collection = mongo_client["database"]["schedule_jobs"]
+    schedule_job = await collection.find_one_and_update(
+        {"schedule_id": schedule_id, "lease_owner": owner},
+        {"$set": {"sended_at": sended_at, "lease_owner": None, "lease_expire_at": None}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if schedule_job is None:
+        return None
+    return ScheduleJob(**schedule_job)
+
+async def delete_claimed_schedule_job(
+    mongo_client: AsyncIOMotorClient, schedule_id: str, owner: str, updated: datetime | None
+) -> bool:
+    """
+    lease 를 가진 worker 만 일회성 작업을 삭제합니다.
+    claim 이후 수정된 작업(updated 가 다름)은 삭제하지 않고 False 반환
+    """
+    collection = mongo_client["database"]["schedule_jobs"]
+    result = await collection.delete_one(
+        {"schedule_id": schedule_id, "lease_owner": owner, "updated": updated}
     )
+    if result.deleted_count == 0:
+        return False
+    notify_schedule_change(schedule_id, None)
+    return True
+
+async def backfill_schedule_next_run_at(mongo_client: AsyncIOMotorClient) -> int:
+    """next_run_at 이 없는 기존 스케줄 작업에 다음 실행 시각을 채웁니다."""
+    collection = mongo_client["database"]["schedule_jobs"]
+    count = 0
+    async for schedule_job in collection.find({"next_run_at": None}):
+        schedule_job = ScheduleJob(**schedule_job)
+        next_run_at = get_next_run_at(
+            schedule_job.time_hour, schedule_job.time_minute, schedule_job.day_of_week
+        )
+        if next_run_at is None:
+            continue
+        await collection.update_one(
+            {"schedule_id": schedule_job.schedule_id},
+            {"$set": {"next_run_at": next_run_at}},
+        )
+        count += 1
+    if count:
+        logger.info(f"스케줄 next_run_at 채움: {count}건")
+    return count
 
 async def delete_schedule_job(
     mongo_client: AsyncIOMotorClient, schedule_id: str
 ) -> None:
     collection = mongo_client["database"]["schedule_jobs"]
     await collection.delete_one({"schedule_id": schedule_id})
+    notify_schedule_change(schedule_id, None)
+
+async def get_geocode_cache(
+    mongo_client: AsyncIOMotorClient, address_key: str
+) -> GeocodeCache | None:
+    collection = mongo_client["database"]["geocode_cache"]
+    geocode_cache = await collection.find_one({"address_key": address_key})
+    if geocode_cache is None:
+        return None
+    return GeocodeCache(**geocode_cache)
+
+
+async def upsert_geocode_cache(
+    mongo_client: AsyncIOMotorClient, geocode_cache: GeocodeCache
+) -> None:
+    collection = mongo_client["database"]["geocode_cache"]
+    await collection.update_one(
+        {"address_key": geocode_cache.address_key},
+        {"$set": geocode_cache.model_dump()},
+        upsert=True,
+    )
+
+
+async def upsert_worker_heartbeat(
+    mongo_client: AsyncIOMotorClient, heartbeat: WorkerHeartbeat
+) -> None:
+    collection = mongo_client["database"]["worker_heartbeats"]
+    await collection.update_one(
+        {"worker_id": heartbeat.worker_id},
+        {"$set": heartbeat.model_dump()},
+        upsert=True,
+    )
+
+
+async def get_worker_heartbeat_list(
+    mongo_client: AsyncIOMotorClient,
+) -> List[WorkerHeartbeat]:
+    collection = mongo_client["database"]["worker_heartbeats"]
+    output_list = []
+    async for heartbeat in collection.find({}, {"_id": 0}):
+        output_list.append(WorkerHeartbeat(**heartbeat))
+    return output_list
+
+
+async def claim_prepared_payload(
+    mongo_client: AsyncIOMotorClient,
+    content_key: str,
+    run_at: datetime,
+    owner: str,
+    expire_at: datetime,
+) -> bool:
+    """
+    (content_key, run_at) 결과를 미리 준비할 권한을 획득합니다.
+    다른 worker 가 이미 준비 중이거나 준비를 마쳤으면 False 반환
+    """
+    collection = mongo_client["database"]["prepared_payloads"]
+    payload = PreparedPayload(
+        content_key=content_key,
+        run_at=run_at,
+        owner=owner,
+        created=get_now_kst(),
+        expire_at=expire_at,
+    )
+    try:
+        await collection.insert_one(payload.model_dump())
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def save_prepared_payload(
+    mongo_client: AsyncIOMotorClient,
+    content_key: str,
+    run_at: datetime,
+    answer: str,
+    agent_name: str | None = None,
+) -> None:
+    collection = mongo_client["database"]["prepared_payloads"]
+    await collection.update_one(
+        {"content_key": content_key, "run_at": run_at},
+        {"$set": {"status": "ready", "answer": answer, "agent_name": agent_name}},
+    )
+
+
+async def release_prepared_payload(
+    mongo_client: AsyncIOMotorClient, content_key: str, run_at: datetime
+) -> None:
+    """준비에 실패한 pending 항목을 삭제하여 실행 시각에 새로 생성하도록 합니다."""
+    collection = mongo_client["database"]["prepared_payloads"]
+    await collection.delete_one(
+        {"content_key": content_key, "run_at": run_at, "status": "pending"}
+    )
+
+
+async def get_prepared_payload(
+    mongo_client: AsyncIOMotorClient, content_key: str, run_at: datetime
+) -> PreparedPayload | None:
+    """준비가 끝난(ready) 결과만 반환합니다."""
+    collection = mongo_client["database"]["prepared_payloads"]
+    payload = await collection.find_one(
+        {"content_key": content_key, "run_at": run_at, "status": "ready"}
+    )
+    if payload is None:
+        return None
+    return PreparedPayload(**payload)
+
+
+
+async def enqueue_push_outbox(mongo_client: AsyncIOMotorClient, outbox: PushOutbox) -> bool:
+    """
+    발송할 메시지를 outbox 에 적재합니다.
+    같은 outbox_id(스케줄 회차)가 이미 적재되어 있으면 False 반환
+    """
+    collection = mongo_client["database"]["push_outbox"]
+    try:
+        await collection.insert_one(outbox.model_dump())
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+def get_claimable_push_outbox_query(now: datetime) -> dict:
+    """발송할 수 있는 메시지: 발송 시각이 된 pending, lease 가 만료된 sending (next_attempt_at 순으로 조회)"""
+    return {
+        "$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "lease_expire_at": {"$lte": now}},
+        ]
+    }
+
+
+async def claim_push_outbox_list(
+    mongo_client: AsyncIOMotorClient, owner: str, limit: int, lease_seconds: int
+) -> List[PushOutbox]:
+    """
+    발송 시각이 된 pending 메시지와 lease 가 만료된 sending 메시지를 최대 limit 개 가져와
+    발송 권한(lease)을 획득합니다. 다른 worker 가 먼저 가져간 메시지는 제외됩니다.
+    재시도하는 multicast 묶음은 limit 과 관계없이 같은 묶음의 나머지 메시지도 함께 가져옵니다.
+    (다른 worker 가 일부를 가져갔으면 묶음이 나뉠 수 있으므로 multicast_size 로 확인 필요)
+    """
+    collection = mongo_client["database"]["push_outbox"]
+    now = get_now_kst()
+    lease_expire_at = now + timedelta(seconds=lease_seconds)
+    claimable_query = get_claimable_push_outbox_query(now)
+    claim_update = {
+        "$set": {"status": "sending", "owner": owner, "lease_expire_at": lease_expire_at},
+        "$inc": {"attempt": 1},
+    }
+    outbox_id_list, multicast_retry_key_set = [], set()
+    async for outbox in (
+        collection.find(claimable_query, {"outbox_id": 1, "multicast_retry_key": 1})
+        .sort("next_attempt_at", ASCENDING)
+        .limit(limit)
+    ):
+        outbox_id_list.append(outbox["outbox_id"])
+        if outbox.get("multicast_retry_key") is not None:
+            multicast_retry_key_set.add(outbox["multicast_retry_key"])
+    if not outbox_id_list:
+        return []
+    await collection.update_many({"outbox_id": {"$in": outbox_id_list}, **claimable_query}, claim_update)
+
+    claimed_query = {"outbox_id": {"$in": outbox_id_list}}
+    if multicast_retry_key_set:
+        multicast_query = {"multicast_retry_key": {"$in": list(multicast_retry_key_set)}}
+        await collection.update_many({**multicast_query, **claimable_query}, claim_update)
+        claimed_query = {"$or": [claimed_query, multicast_query]}
+    output_list = []
+    async for outbox in collection.find(
+        {**claimed_query, "owner": owner, "status": "sending", "lease_expire_at": lease_expire_at}
+    ):
+        output_list.append(PushOutbox(**outbox))
+    return output_list
+
+
+async def renew_push_outbox_lease(
+    mongo_client: AsyncIOMotorClient, outbox_id_list: List[str], owner: str, lease_seconds: int
+) -> int:
+    """발송 중인 메시지의 lease 를 연장하고, 연장한 개수를 반환합니다."""
+    collection = mongo_client["database"]["push_outbox"]
+    result = await collection.update_many(
+        {"outbox_id": {"$in": outbox_id_list}, "owner": owner, "status": "sending"},
+        {"$set": {"lease_expire_at": get_now_kst() + timedelta(seconds=lease_seconds)}},
+    )
+    return result.matched_count
+
+
+async def release_push_outbox(
+    mongo_client: AsyncIOMotorClient,
+    outbox_id_list: List[str],
+    owner: str,
+    next_attempt_at: datetime,
+) -> None:
+    """발송하지 않은 메시지의 lease 를 해제합니다. (발송 시도 횟수에 포함하지 않음)"""
+    collection = mongo_client["database"]["push_outbox"]
+    await collection.update_many(
+        {"outbox_id": {"$in": outbox_id_list}, "owner": owner},
+        {
+            "$set": {
+                "status": "pending",
+                "next_attempt_at": next_attempt_at,
+                "owner": None,
+                "lease_expire_at": None,
+            },
+            "$inc": {"attempt": -1},
+        },
+    )
+
+
+async def set_push_outbox_multicast_retry_key(
+    mongo_client: AsyncIOMotorClient, outbox_id_list: List[str], multicast_retry_key: str
+) -> None:
+    """multicast 묶음의 retry key 와 수신자 수를 발송 전에 기록하여 재시도 시 같은 묶음/키로 다시 보냅니다."""
+    collection = mongo_client["database"]["push_outbox"]
+    await collection.update_many(
+        {"outbox_id": {"$in": outbox_id_list}},
+        {
+            "$set": {
+                "multicast_retry_key": multicast_retry_key,
+                "multicast_size": len(outbox_id_list),
+            }
+        },
+    )
+
+
+async def complete_push_outbox(
+    mongo_client: AsyncIOMotorClient,
+    outbox_id_list: List[str],
+    owner: str,
+    status: str,
+    expire_at: datetime,
+    error: str | None = None,
+) -> None:
+    """발송 완료(sent) 또는 실패(failed)를 기록하고 lease 를 해제합니다."""
+    collection = mongo_client["database"]["push_outbox"]
+    await collection.update_many(
+        {"outbox_id": {"$in": outbox_id_list}, "owner": owner},
+        {
+            "$set": {
+                "status": status,
+                "sent_at": get_now_kst() if status == "sent" else None,
+                "error": error,
+                "owner": None,
+                "lease_expire_at": None,
+                "expire_at": expire_at,
+            }
+        },
+    )
+
+
+async def retry_push_outbox(
+    mongo_client: AsyncIOMotorClient,
+    outbox_id_list: List[str],
+    owner: str,
+    next_attempt_at: datetime,
+    error: str,
+) -> None:
+    """발송을 next_attempt_at 이후로 미룹니다. retry key 는 그대로 유지합니다."""
+    collection = mongo_client["database"]["push_outbox"]
+    await collection.update_many(
+        {"outbox_id": {"$in": outbox_id_list}, "owner": owner},
+        {
+            "$set": {
+                "status": "pending",
+                "next_attempt_at": next_attempt_at,
+                "error": error,
+                "owner": None,
+                "lease_expire_at": None,
+            }
+        },
+    )
+
+
+async def claim_webhook_event(
+    mongo_client: AsyncIOMotorClient, webhook_event: WebhookEvent
+) -> bool:
+    """
+    웹훅 이벤트를 처리 대상으로 기록합니다.
+    같은 webhook_event_id 가 이미 기록되어 있으면 (재전송/중복) False 반환
+    """
+    collection = mongo_client["database"]["webhook_events"]
+    try:
+        await collection.insert_one(webhook_event.model_dump())
+    except DuplicateKeyError:
+        return False
+    return True
+
 
 async def main():
     now = get_now_kst()
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from schedule_service.dispatch import DispatchPool
+
+# 같은 시각에 실행될 작업 N개의 처리 시간 비교 (작업당 외부 호출 지연을 sleep 으로 가정)
+# before: job_runner 처럼 순차 처리
+# after: DispatchPool (concurrency 개 동시 처리)
+
+
+async def fake_job(schedule_id: str, run_ts: float, job_seconds: float = 0.05) -> None:
+    await asyncio.sleep(job_seconds)
+
+
+async def run_benchmark(job_count: int = 500, concurrency: int = 32) -> dict:
+    run_ts = time.time()
+
+    start_time = time.perf_counter()
+    for i in range(job_count):
+        await fake_job(f"job-{i}", run_ts)
+    before_seconds = time.perf_counter() - start_time
+
+    pool = DispatchPool(fake_job, concurrency)
+    pool.start()
+    start_time = time.perf_counter()
+    for i in range(job_count):
+        pool.submit(f"job-{i}", run_ts)
+    await pool.queue.join()
+    after_seconds = time.perf_counter() - start_time
+    await pool.stop()
+
+    return {
+        "before_seconds": round(before_seconds, 2),
+        "after_seconds": round(after_seconds, 2),
+        "last_tick": pool.last_tick,
+    }
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+
+# PYTHONPATH=. python schedule_service/bench_dispatch.py
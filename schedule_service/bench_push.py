@@ -0,0 +1,155 @@
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+from aiohttp import web
+
+from configs import settings
+from common.http_client import open_http_client, close_http_client
+from api.service.line_service import push_message_with_aiohttp
+from schedule_service.outbox import (
+    PushOutboxWorker,
+    create_push_outbox,
+    group_outbox_list,
+)
+
+# LINE 메시지 API 를 대신하는 로컬 HTTP 서버로 발송 방식 비교
+# before: 사용자마다 push 요청 (재시도 없음)
+# after: PushOutboxWorker 의 묶음 발송 (같은 메시지는 multicast, 실패 시 같은 retry key 로 재시도)
+# 실패 주입: retry key 의 첫 요청 중 일부는 처리 전 500, 일부는 처리 후 응답만 500
+
+
+class LineStandIn:
+    def __init__(self, latency_seconds: float = 0.03, fail_rate: int = 5):
+        self.latency_seconds = latency_seconds
+        self.fail_rate = fail_rate
+        self.accepted_key_set = set()
+        self.seen_key_counter = Counter()
+        self.delivered_counter = Counter()
+        self.request_count = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.request_count += 1
+        await asyncio.sleep(self.latency_seconds)
+        retry_key = request.headers["X-Line-Retry-Key"]
+        self.seen_key_counter[retry_key] += 1
+        if retry_key in self.accepted_key_set:
+            return web.json_response({"message": "The retry key is already accepted"}, status=409)
+
+        is_first = self.seen_key_counter[retry_key] == 1
+        key_hash = uuid.UUID(retry_key).int
+        # 처리 전 실패
+        if is_first and key_hash % self.fail_rate == 0:
+            return web.json_response({"message": "Internal error"}, status=500)
+
+        body = await request.json()
+        to_list = body["to"] if isinstance(body["to"], list) else [body["to"]]
+        self.accepted_key_set.add(retry_key)
+        self.delivered_counter.update(to_list)
+        # 처리 후 응답 유실
+        if is_first and key_hash % self.fail_rate == 1:
+            return web.json_response({"message": "Internal error"}, status=500)
+        return web.json_response({})
+
+    async def start(self, port: int) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_post("/v2/bot/message/push", self.handle)
+        app.router.add_post("/v2/bot/message/multicast", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        return runner
+
+
+def create_outbox_list(shared_user_count: int, unique_user_count: int) -> list:
+    outbox_list = []
+    for i in range(shared_user_count):
+        # 같은 digest 를 받는 사용자 (내용 3종류)
+        messages = [{"type": "text", "text": f"오늘의 뉴스 요약 {i % 3}"}]
+        outbox_list.append(create_push_outbox(f"U-shared-{i}", messages, f"shared-{i}"))
+    for i in range(unique_user_count):
+        messages = [{"type": "text", "text": f"개인 알림 {i}"}]
+        outbox_list.append(create_push_outbox(f"U-unique-{i}", messages, f"unique-{i}"))
+    return outbox_list
+
+
+def create_late_outbox_list(retry_outbox_list: list) -> list:
+    """단건 push 로 보냈다가 재시도할 메시지마다 같은 내용의 새 메시지를 만듭니다."""
+    return [
+        create_push_outbox(f"U-late-{i}", outbox.messages, f"late-{i}")
+        for i, outbox in enumerate(retry_outbox_list)
+        if outbox.multicast_retry_key is None
+    ]
+
+
+async def run_benchmark(
+    shared_user_count: int = 1500, unique_user_count: int = 100, port: int = 18080
+) -> dict:
+    settings.line_api_base_url = f"http://127.0.0.1:{port}"
+    await open_http_client()
+
+    stand_in = LineStandIn()
+    runner = await stand_in.start(port)
+    outbox_list = create_outbox_list(shared_user_count, unique_user_count)
+    start_time = time.perf_counter()
+    result_list = await asyncio.gather(
+        *[
+            push_message_with_aiohttp(outbox.platform_id, outbox.messages)
+            for outbox in outbox_list
+        ]
+    )
+    before = {
+        "seconds": round(time.perf_counter() - start_time, 2),
+        "request": stand_in.request_count,
+        "failed_request": result_list.count(False),
+        "undelivered_user": len(outbox_list) - len(stand_in.delivered_counter),
+    }
+    await runner.cleanup()
+
+    stand_in = LineStandIn()
+    runner = await stand_in.start(port)
+    worker = PushOutboxWorker("bench")
+    pending_list = create_outbox_list(shared_user_count, unique_user_count)
+    late_outbox_list = []
+    round_count = 0
+    start_time = time.perf_counter()
+    # PushOutboxWorker.run/process_batch 의 claim(attempt 증가)/발송/재시도 흐름 (Mongo 기록 제외)
+    while pending_list:
+        round_count += 1
+        for outbox in pending_list:
+            outbox.attempt += 1
+        group_list = group_outbox_list(pending_list)
+        result_list = await asyncio.gather(*[worker.send_group(group) for group in group_list])
+        pending_list = []
+        for (_, group, _), (result, _) in zip(group_list, result_list):
+            if result == "retry":
+                pending_list += group
+            elif result == "sent":
+                worker.record_sent(group)
+        if round_count == 1:
+            # 단건 push 재시도와 같은 내용의 새 메시지가 함께 claim 되는 경우
+            # (재시도 단건은 새 multicast 에 묶이지 않고 기존 retry key 로 다시 보내야 함)
+            late_outbox_list = create_late_outbox_list(pending_list)
+            pending_list += late_outbox_list
+    total_user_count = shared_user_count + unique_user_count + len(late_outbox_list)
+    after = {
+        "seconds": round(time.perf_counter() - start_time, 2),
+        "request": stand_in.request_count,
+        "round": round_count,
+        "mixed_retry_user": len(late_outbox_list),
+        "undelivered_user": total_user_count - len(stand_in.delivered_counter),
+        "duplicate_user": sum(1 for count in stand_in.delivered_counter.values() if count > 1),
+        "reused_retry_key": sum(1 for count in stand_in.seen_key_counter.values() if count > 1),
+        "worker": worker.get_stats(),
+        "request_latency": worker.request_latency.get_stats(),
+    }
+    await runner.cleanup()
+    await close_http_client()
+    return {"user": total_user_count, "before": before, "after": after}
+
+
+if __name__ == "__main__":
+    print(asyncio.run(run_benchmark()))
+
+# PYTHONPATH=. python schedule_service/bench_push.py
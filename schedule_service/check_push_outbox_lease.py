@@ -0,0 +1,110 @@
+import asyncio
+from datetime import timedelta
+
+from common.utils import get_now_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import PushOutbox
+from mongo_db.service import (
+    claim_push_outbox_list,
+    enqueue_push_outbox,
+    get_claimable_push_outbox_query,
+    release_push_outbox,
+    renew_push_outbox_lease,
+    set_push_outbox_multicast_retry_key,
+)
+
+# 여러 worker 가 push outbox 를 동시에 claim 해도 메시지마다 하나만 발송 권한을 얻는지 확인
+# (로컬 mongod 필요, docker compose up -d mongodb / 다른 발송 대기 메시지가 없는 DB 에서 실행)
+# 1. worker N개가 동시에 claim -> 겹치지 않고 전체를 나눠 가짐
+# 2. lease 연장 -> owner 만 성공
+# 3. lease 만료 후(발송 중 종료 가정) 다른 worker claim -> 성공, 기존 worker 연장 -> 실패
+# 4. release -> pending 으로 돌아가고 발송 시도 횟수 유지
+# 5. 재시도 multicast 묶음 -> limit 과 관계없이 묶음 전체를 함께 claim
+
+OUTBOX_PREFIX = "check-push-outbox-lease:"
+
+
+def get_check_outbox(index: int) -> PushOutbox:
+    now = get_now_kst()
+    return PushOutbox(
+        outbox_id=f"{OUTBOX_PREFIX}{index}",
+        platform_id=f"check-user-{index}",
+        messages=[{"type": "text", "text": "check"}],
+        payload_key="check-payload",
+        retry_key=f"check-retry-{index}",
+        next_attempt_at=now,
+        created=now,
+    )
+
+
+async def main(outbox_count: int = 100, worker_count: int = 5):
+    mongo_client = get_mongo_client()
+    collection = mongo_client["database"]["push_outbox"]
+    build_info = await mongo_client.admin.command("buildInfo")
+    print(f"mongod {build_info['version']}")
+    await collection.delete_many({"outbox_id": {"$regex": f"^{OUTBOX_PREFIX}"}})
+    # 실제 발송 대기 메시지를 가져가지 않도록 빈 DB 에서만 실행
+    other_count = await collection.count_documents(get_claimable_push_outbox_query(get_now_kst()))
+    assert other_count == 0, f"발송 대기 메시지가 있는 DB 입니다: {other_count}건"
+
+    for index in range(outbox_count):
+        await enqueue_push_outbox(mongo_client, get_check_outbox(index))
+
+    claimed_dict = {}
+    while True:
+        claim_list = await asyncio.gather(
+            *[
+                claim_push_outbox_list(mongo_client, f"worker-{i}", outbox_count // 3, 60)
+                for i in range(worker_count)
+            ]
+        )
+        if not any(claim_list):
+            break
+        for outbox_list in claim_list:
+            for outbox in outbox_list:
+                assert outbox.outbox_id not in claimed_dict, outbox.outbox_id
+                claimed_dict[outbox.outbox_id] = outbox.owner
+    assert len(claimed_dict) == outbox_count, len(claimed_dict)
+    print(f"1. 동시 claim {worker_count}개가 {outbox_count}건을 겹치지 않게 나눠 가짐")
+
+    owner = claimed_dict[f"{OUTBOX_PREFIX}0"]
+    owned_id_list = [outbox_id for outbox_id, value in claimed_dict.items() if value == owner]
+    assert await renew_push_outbox_lease(mongo_client, owned_id_list, owner, 60) == len(owned_id_list)
+    assert await renew_push_outbox_lease(mongo_client, owned_id_list, "worker-other", 60) == 0
+    print("2. lease 연장은 owner 만 성공")
+
+    # lease 만료 (worker 종료 가정)
+    await collection.update_many(
+        {"outbox_id": {"$in": owned_id_list}},
+        {"$set": {"lease_expire_at": get_now_kst() - timedelta(seconds=1)}},
+    )
+    recovered_list = await claim_push_outbox_list(mongo_client, "worker-recover", outbox_count, 60)
+    assert sorted(outbox.outbox_id for outbox in recovered_list) == sorted(owned_id_list)
+    assert all(outbox.attempt == 2 for outbox in recovered_list)
+    assert await renew_push_outbox_lease(mongo_client, owned_id_list, owner, 60) == 0
+    print("3. lease 만료 후 다른 worker 가 이어서 발송, 기존 worker lease 연장 거부")
+
+    await release_push_outbox(mongo_client, owned_id_list, "worker-recover", get_now_kst())
+    released_list = await claim_push_outbox_list(mongo_client, "worker-release", outbox_count, 60)
+    assert sorted(outbox.outbox_id for outbox in released_list) == sorted(owned_id_list)
+    assert all(outbox.attempt == 2 for outbox in released_list)
+    print("4. release 한 메시지는 발송 시도 횟수를 유지한 채 다시 claim 됨")
+
+    group_id_list = [f"{OUTBOX_PREFIX}{index}" for index in range(outbox_count - 3, outbox_count)]
+    await set_push_outbox_multicast_retry_key(mongo_client, group_id_list, "check-multicast")
+    await collection.update_many(
+        {"outbox_id": {"$in": group_id_list}},
+        {"$set": {"status": "pending", "next_attempt_at": get_now_kst(), "owner": None}},
+    )
+    group_list = await claim_push_outbox_list(mongo_client, "worker-group", 1, 60)
+    assert sorted(outbox.outbox_id for outbox in group_list) == sorted(group_id_list), group_list
+    assert all(outbox.multicast_size == len(group_id_list) for outbox in group_list)
+    print("5. 재시도 multicast 묶음은 limit=1 이어도 묶음 전체를 claim")
+
+    await collection.delete_many({"outbox_id": {"$regex": f"^{OUTBOX_PREFIX}"}})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# PYTHONPATH=. python schedule_service/check_push_outbox_lease.py
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import timedelta
+
+from common.utils import get_now_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import ScheduleJob
+from mongo_db.service import (
+    claim_schedule_job,
+    complete_schedule_job_run,
+    create_schedule_job,
+    delete_schedule_job,
+    get_schedule_job,
+    update_schedule_job,
+)
+
+# 여러 worker 가 같은 회차를 동시에 claim 해도 하나만 실행되는지 확인
+# (로컬 mongod 필요, docker compose up -d mongodb)
+# 1. worker N개가 동시에 claim -> 1개만 성공
+# 2. lease 만료 전 다른 worker claim -> 실패
+# 3. lease 만료 후(실행 중 종료 가정) 다른 worker claim -> 성공, 기존 worker 완료 기록 -> 실패
+# 4. 완료 후 같은 회차 claim -> 실패 (다음 회차로 이동)
+# 5. 실행 중 작업 수정 -> 완료 기록이 수정된 next_run_at 을 덮어쓰지 않음
+
+
+async def main(worker_count: int = 20):
+    mongo_client = get_mongo_client()
+    build_info = await mongo_client.admin.command("buildInfo")
+    print(f"mongod {build_info['version']}")
+    schedule_id = "check-schedule-lease"
+    await create_schedule_job(
+        mongo_client,
+        ScheduleJob(
+            schedule_id=schedule_id,
+            user_id="test",
+            time_hour=9,
+            time_minute=0,
+            day_of_week=[],
+            is_once=False,
+        ),
+    )
+    schedule = await get_schedule_job(mongo_client, schedule_id)
+    run_at = schedule.next_run_at
+
+    claim_list = await asyncio.gather(
+        *[
+            claim_schedule_job(mongo_client, schedule_id, run_at, f"worker-{i}", 60)
+            for i in range(worker_count)
+        ]
+    )
+    winner_list = [claim.lease_owner for claim in claim_list if claim is not None]
+    assert len(winner_list) == 1, winner_list
+    print(f"1. 동시 claim {worker_count}개 중 성공: {winner_list}")
+
+    other = await claim_schedule_job(mongo_client, schedule_id, run_at, "worker-other", 60)
+    assert other is None
+    print("2. lease 유효 중 다른 worker claim 실패")
+
+    # lease 만료 (worker 종료 가정)
+    await mongo_client["database"]["schedule_jobs"].update_one(
+        {"schedule_id": schedule_id},
+        {"$set": {"lease_expire_at": get_now_kst() - timedelta(seconds=1)}},
+    )
+    recovered = await claim_schedule_job(
+        mongo_client, schedule_id, run_at, "worker-recover", 60
+    )
+    assert recovered is not None and recovered.lease_owner == "worker-recover"
+    assert not await complete_schedule_job_run(
+        mongo_client,
+        schedule_id,
+        winner_list[0],
+        get_now_kst(),
+        run_at + timedelta(days=1),
+        schedule.updated,
+    )
+    print("3. lease 만료 후 다른 worker 가 이어서 실행, 기존 worker 완료 기록 거부")
+
+    completed = await complete_schedule_job_run(
+        mongo_client,
+        schedule_id,
+        "worker-recover",
+        get_now_kst(),
+        run_at + timedelta(days=1),
+        schedule.updated,
+    )
+    assert completed is not None and completed.next_run_at == run_at + timedelta(days=1)
+    again = await claim_schedule_job(mongo_client, schedule_id, run_at, "worker-late", 60)
+    assert again is None
+    print("4. 완료된 회차는 다시 claim 되지 않음")
+
+    running = await claim_schedule_job(
+        mongo_client, schedule_id, completed.next_run_at, "worker-edit", 60
+    )
+    assert running is not None
+    await update_schedule_job(
+        mongo_client,
+        schedule_id,
+        ScheduleJob(schedule_id=schedule_id, user_id="test", time_hour=10, time_minute=30),
+    )
+    edited = await get_schedule_job(mongo_client, schedule_id)
+    completed = await complete_schedule_job_run(
+        mongo_client,
+        schedule_id,
+        "worker-edit",
+        get_now_kst(),
+        completed.next_run_at + timedelta(days=1),
+        running.updated,
+    )
+    assert completed is not None and completed.lease_owner is None
+    assert completed.next_run_at == edited.next_run_at, (completed.next_run_at, edited.next_run_at)
+    print("5. 실행 중 수정된 작업은 수정된 next_run_at 유지")
+
+    await delete_schedule_job(mongo_client, schedule_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# PYTHONPATH=. python schedule_service/check_schedule_lease.py
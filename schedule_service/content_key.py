@@ -0,0 +1,165 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from agent_service.head.intent_router import (
+    FILLER_WORD_SET,
+    LINE_PATTERN,
+    NEWS_KEYWORD_SET,
+    REGION_GAZETTEER_SET,
+    REGION_SUFFIX_PATTERN,
+    SCHEDULE_KEYWORD_LIST,
+    SUBWAY_KEYWORD_SET,
+    WEATHER_KEYWORD_SET,
+    is_region,
+    tokenize,
+)
+from agent_service.news.news_agent import ynx_rss
+from agent_service.subway.subway_agent import get_station_index
+from agent_service.schedule.schemas import SharedSectionRequest
+
+# 내용에 영향을 주지 않는 시간/연결 표현 (스케줄 시각은 ScheduleJob 필드로 관리)
+TIME_TOKEN_PATTERN = re.compile(
+    r"^(\d{1,2}시(\d{1,2}분)?|\d{1,2}분|\d{1,2}:\d{2}|오전|오후|아침|점심|저녁|밤|새벽|출근길|퇴근길)$"
+)
+CONNECTOR_WORD_SET = {"그리고", "및", "또", "같이", "함께", "랑", "하고", "이랑"}
+PARTICLE_PATTERN = re.compile(r"(마다|이랑|랑|하고|와|과|이나|에서|에|은|는|이|가|을|를|도|의)$")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s:]")
+WEATHER_DAY_LIST = ["오늘", "내일", "모레"]
+
+
+def normalize_query(query: str) -> str:
+    query = PUNCTUATION_PATTERN.sub(" ", (query or "").lower())
+    return " ".join(query.split())
+
+
+def is_ignored_token(token: str) -> bool:
+    return (
+        token in FILLER_WORD_SET
+        or token in SUBWAY_KEYWORD_SET
+        or token in WEATHER_KEYWORD_SET
+        or token in NEWS_KEYWORD_SET
+        or token in CONNECTOR_WORD_SET
+        or token in SCHEDULE_KEYWORD_LIST
+        or bool(TIME_TOKEN_PATTERN.match(token))
+        or bool(LINE_PATTERN.match(token))
+    )
+
+
+def get_region_key(token: str) -> str:
+    region = REGION_SUFFIX_PATTERN.sub("", token)
+    return region if region in REGION_GAZETTEER_SET else token
+
+
+@lru_cache(maxsize=4096)
+def parse_schedule_query(query: str) -> Optional[Dict]:
+    """
+    스케줄 쿼리에서 뉴스 섹션/지역/역 이름을 추출합니다.
+    지역은 앞에 나온 날짜 표현(오늘/내일/모레)과 함께 (날짜, 지역) 으로 기록합니다.
+    알 수 없는 단어(개인화된 요청)가 있거나 지역별 날짜가 모호하면 None 을 반환합니다.
+    """
+    section_set = set(ynx_rss.rss_url_dict.keys())
+    station_index = get_station_index()
+    parsed = {"news": {}, "weather": {}, "subway": {}}
+    current_day = None
+    day_set = set()
+    for token in tokenize(normalize_query(query)):
+        if token in WEATHER_DAY_LIST:
+            current_day = token
+            day_set.add(token)
+            continue
+        if is_ignored_token(token):
+            continue
+        token = PARTICLE_PATTERN.sub("", token) or token
+        if is_ignored_token(token):
+            continue
+
+        if token.endswith("뉴스") and token[: -len("뉴스")] in section_set:
+            token = token[: -len("뉴스")]
+        if token in section_set:
+            parsed["news"][token] = token
+            continue
+
+        if token.endswith("날씨") and is_region(token[: -len("날씨")]):
+            token = token[: -len("날씨")]
+        if is_region(token) and not token.endswith("역"):
+            parsed["weather"].setdefault(get_region_key(token), (current_day, token))
+            continue
+
+        if token.endswith("역"):
+            result = station_index.search(token, top_k=1)
+            if result and result[0].confidence >= 1.0:
+                station_name = result[0].station_name
+                parsed["subway"][station_name] = station_name
+                continue
+        return None
+
+    # 날짜 표현이 모든 지역 뒤에만 있으면 (예: "서울 내일 날씨") 모든 지역에 적용
+    region_day_list = [day for day, _ in parsed["weather"].values()]
+    if all(day is None for day in region_day_list):
+        if len(day_set) > 1:
+            return None
+        default_day = next(iter(day_set), "오늘")
+        parsed["weather"] = {
+            region_key: (default_day, token)
+            for region_key, (_, token) in parsed["weather"].items()
+        }
+    elif None in region_day_list:
+        # 일부 지역만 날짜가 정해진 경우 (예: "서울 날씨 그리고 내일 부산 날씨")
+        return None
+    return parsed
+
+
+def get_section_request(agent_name: str, query: str) -> SharedSectionRequest:
+    """
+    하위 에이전트 결과를 공유할 수 있는 내용 키와 정규화된 요청을 만듭니다.
+    같은 섹션/지역/역을 요청하면 문장이 달라도 같은 키가 되고,
+    개인화된 요청은 정규화된 쿼리 전체를 키로 사용하여 같은 쿼리끼리만 공유합니다.
+    """
+    parsed = parse_schedule_query(query)
+    if parsed is not None:
+        if agent_name == "news":
+            section_list = sorted(parsed["news"])
+            return SharedSectionRequest(
+                agent_name=agent_name,
+                content_key=f"news:{','.join(section_list) or '최신기사'}",
+                query=f"{' '.join(section_list) or '최신'} 뉴스 알려줘",
+            )
+        if agent_name == "weather" and parsed["weather"]:
+            # 날짜별 지역 목록 (날짜/지역 순서 고정)
+            day_region_dict: Dict[str, List[str]] = {}
+            for region_key in sorted(parsed["weather"]):
+                day, _ = parsed["weather"][region_key]
+                day_region_dict.setdefault(day, []).append(region_key)
+            day_list = sorted(day_region_dict, key=WEATHER_DAY_LIST.index)
+            return SharedSectionRequest(
+                agent_name=agent_name,
+                content_key="weather:"
+                + ";".join(f"{day}:{','.join(day_region_dict[day])}" for day in day_list),
+                query=" 그리고 ".join(
+                    f"{day} {' '.join(parsed['weather'][key][1] for key in day_region_dict[day])} 날씨"
+                    for day in day_list
+                )
+                + " 알려줘",
+            )
+        if agent_name == "subway" and parsed["subway"]:
+            station_list = sorted(parsed["subway"])
+            return SharedSectionRequest(
+                agent_name=agent_name,
+                content_key=f"subway:{','.join(station_list)}",
+                query=f"{' '.join(station + '역' for station in station_list)} 도착 정보 알려줘",
+            )
+    return SharedSectionRequest(
+        agent_name=agent_name,
+        content_key=f"{agent_name}:query:{normalize_query(query)}",
+        query=query,
+    )
+
+
+def get_section_request_list(agent_list: List[str], query: str) -> List[SharedSectionRequest]:
+    # 중복 제거 (순서 유지)
+    return [get_section_request(name, query) for name in dict.fromkeys(agent_list)]
+
+
+def get_digest_key(request_list: List[SharedSectionRequest]) -> str:
+    return "|".join(sorted(request.content_key for request in request_list))
@@ -0,0 +1,262 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+from litellm import acompletion
+
+from configs import settings
+from custom_logger import get_logger
+from common.cache import AsyncTTLCache
+from common.concurrency import upstream_limiter
+from common.metrics import LatencyStats, register_metrics
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import ScheduleJob
+from mongo_db.service import get_prepared_payload
+from agent_service.head.head_agent import request_google_search
+from agent_service.news.news_agent import news_agent_runner
+from agent_service.subway.subway_agent import subway_agent_runner
+from agent_service.weather.weather_agent import weather_agent_runner
+from agent_service.schedule.prompts import get_digest_compose_prompt
+from agent_service.schedule.schemas import DigestSection, SharedSectionRequest
+from schedule_service.content_key import get_digest_key, get_section_request_list
+
+logger = get_logger(__name__)
+
+digest_latency = LatencyStats("schedule_digest")
+compose_latency = LatencyStats("schedule_digest_compose")
+section_status_stats: Dict[str, int] = {}
+register_metrics("schedule_digest_section", lambda: dict(section_status_stats))
+
+# 같은 회차(run_at)에 같은 내용을 요청한 작업끼리 결과를 공유 (키: (내용 키, run_at))
+# 지하철 도착 정보처럼 시간에 민감한 결과가 다음 회차에 재사용되지 않도록 run_at 을 키에 포함
+shared_section_cache = AsyncTTLCache(
+    "schedule_shared_section", ttl_seconds=settings.schedule_shared_result_ttl_seconds
+)
+shared_digest_cache = AsyncTTLCache(
+    "schedule_shared_digest", ttl_seconds=settings.schedule_shared_result_ttl_seconds
+)
+
+# 실행 시각 전에 미리 준비된 결과(warm-up) 사용 현황
+prepared_stats = {"section_hit": 0, "section_miss": 0, "digest_hit": 0, "digest_miss": 0}
+register_metrics("schedule_prepared", lambda: dict(prepared_stats))
+
+
+# ScheduleJob.agent_list 의 이름 -> 하위 에이전트 실행 함수 (입력: schedule.query)
+digest_runner_dict: Dict[str, Callable[[str], Awaitable]] = {
+    "news": news_agent_runner,
+    "subway": subway_agent_runner,
+    "weather": weather_agent_runner,
+    "web_search": request_google_search,
+}
+
+
+async def run_digest_section(
+    agent_name: str, query: str, timeout_seconds: float
+) -> DigestSection:
+    """
+    하위 에이전트 하나를 타임아웃과 함께 실행합니다. 실패해도 예외를 던지지 않습니다.
+    """
+    runner = digest_runner_dict.get(agent_name)
+    if runner is None:
+        return DigestSection(agent_name=agent_name, status="unknown_agent")
+
+    start_time = time.perf_counter()
+    try:
+        async with upstream_limiter.limit("llm"):
+            output = await asyncio.wait_for(runner(query), timeout=timeout_seconds)
+        if isinstance(output, str):
+            answer, status = output, "success"
+        else:
+            answer = output.answer
+            status = getattr(output.status, "value", output.status)
+    except asyncio.TimeoutError:
+        answer, status = None, "timeout"
+        logger.warning(f"스케줄 에이전트 타임아웃: {agent_name} ({timeout_seconds}s)")
+    except Exception as e:
+        answer, status = None, "error"
+        logger.error(f"스케줄 에이전트 실행 실패: {agent_name} {e}")
+
+    return DigestSection(
+        agent_name=agent_name,
+        answer=answer,
+        status=status,
+        elapsed_ms=round((time.perf_counter() - start_time) * 1000, 1),
+    )
+
+
+def get_digest_payload_key(digest_key: str) -> str:
+    return f"digest:{digest_key}"
+
+
+async def get_prepared_answer(content_key: str, run_at: datetime | None) -> str | None:
+    if run_at is None:
+        return None
+    try:
+        payload = await get_prepared_payload(get_mongo_client(), content_key, run_at)
+    except Exception as e:
+        logger.error(f"준비된 결과 조회 실패: {content_key} {e}")
+        return None
+    return payload.answer if payload is not None else None
+
+
+async def run_shared_digest_section(
+    request: SharedSectionRequest, timeout_seconds: float, run_at: datetime | None = None
+) -> DigestSection:
+    """
+    같은 회차의 같은 content_key 결과가 있거나 실행 중이면 공유하고, 없으면 실행합니다.
+    run_at 회차의 결과가 미리 준비되어 있으면 그대로 사용합니다.
+    실패한 결과는 공유하지 않습니다.
+    """
+    fetched_dict = {}
+
+    async def fetch_section() -> DigestSection | None:
+        prepared_answer = await get_prepared_answer(request.content_key, run_at)
+        if prepared_answer is not None:
+            prepared_stats["section_hit"] += 1
+            return DigestSection(
+                agent_name=request.agent_name, answer=prepared_answer, status="prepared"
+            )
+        if run_at is not None:
+            prepared_stats["section_miss"] += 1
+        section = await run_digest_section(
+            request.agent_name, request.query, timeout_seconds
+        )
+        fetched_dict["section"] = section
+        return section if section.answer else None
+
+    section = await shared_section_cache.get_or_fetch(
+        (request.content_key, run_at), fetch_section
+    )
+    if section is None:
+        section = fetched_dict.get("section") or DigestSection(
+            agent_name=request.agent_name, status="shared_failed"
+        )
+    return section
+
+
+async def run_digest_section_list(
+    request_list: List[SharedSectionRequest],
+    timeout_seconds: float | None = None,
+    run_at: datetime | None = None,
+) -> List[DigestSection]:
+    """
+    하위 에이전트를 동시에 실행합니다.
+    """
+    timeout_seconds = timeout_seconds or settings.schedule_agent_timeout_seconds
+    section_list = await asyncio.gather(
+        *[
+            run_shared_digest_section(request, timeout_seconds, run_at)
+            for request in request_list
+        ]
+    )
+    for section in section_list:
+        section_status_stats[section.status] = (
+            section_status_stats.get(section.status, 0) + 1
+        )
+    return list(section_list)
+
+
+def format_digest_section_list(section_list: List[DigestSection]) -> str:
+    """
+    에이전트 결과를 그대로 이어 붙인 메시지 (합성 실패 시 사용)
+    """
+    text_list = []
+    for section in section_list:
+        answer = section.answer if section.answer else "정보를 가져오지 못했습니다."
+        text_list.append(f"[{section.agent_name}]\n{answer}")
+    return "\n\n".join(text_list)
+
+
+async def compose_digest(query: str, section_list: List[DigestSection]) -> str:
+    """
+    에이전트 결과를 한 번의 LLM 호출로 하나의 알림 메시지로 합성합니다.
+    """
+    success_list = [section for section in section_list if section.answer]
+    if not success_list:
+        return format_digest_section_list(section_list)
+    # 결과가 하나면 합성 없이 그대로 사용
+    if len(section_list) == 1:
+        return section_list[0].answer
+
+    section_text = format_digest_section_list(section_list)
+    try:
+        async with upstream_limiter.limit("llm"):
+            with compose_latency.measure():
+                response = await acompletion(
+                    model=settings.schedule_compose_model,
+                    messages=[
+                        {"role": "system", "content": get_digest_compose_prompt()},
+                        {
+                            "role": "user",
+                            "content": f"query: {query}\n\n에이전트 결과:\n{section_text}",
+                        },
+                    ],
+                    api_key=settings.openai_api_key,
+                )
+        return response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"스케줄 알림 메시지 합성 실패: {e}")
+        return section_text
+
+
+async def run_scheduled_digest(schedule: ScheduleJob) -> str:
+    """
+    스케줄 작업의 agent_list 를 동시에 실행하고 하나의 푸시 메시지로 합성합니다.
+    같은 회차의 같은 내용 키 작업은 한 번만 실행하고 결과를 공유합니다.
+    """
+    query = schedule.query or schedule.job_name or ""
+    request_list = get_section_request_list(schedule.agent_list, query)
+    digest_key = get_digest_key(request_list)
+    run_at = schedule.next_run_at
+    fetched_dict = {}
+
+    async def build_digest() -> str | None:
+        prepared_message = await get_prepared_answer(
+            get_digest_payload_key(digest_key), run_at
+        )
+        if prepared_message is not None:
+            prepared_stats["digest_hit"] += 1
+            return prepared_message
+        if run_at is not None:
+            prepared_stats["digest_miss"] += 1
+        section_list = await run_digest_section_list(request_list, run_at=run_at)
+        message = await compose_digest(query, section_list)
+        fetched_dict["message"] = message
+        logger.info(
+            f"스케줄 알림 생성: {schedule.schedule_id} "
+            f"{[(s.agent_name, s.status, s.elapsed_ms) for s in section_list]}"
+        )
+        # 모든 에이전트가 실패한 메시지는 공유하지 않음
+        return message if any(section.answer for section in section_list) else None
+
+    with digest_latency.measure():
+        message = await shared_digest_cache.get_or_fetch((digest_key, run_at), build_digest)
+    if message is None:
+        # 직접 실행한 작업은 실패 메시지를, 공유 대기한 작업은 기본 메시지를 사용
+        message = fetched_dict.get("message") or format_digest_section_list(
+            [
+                DigestSection(agent_name=request.agent_name, status="shared_failed")
+                for request in request_list
+            ]
+        )
+    return message
+
+
+async def main():
+    schedule = ScheduleJob(
+        schedule_id="digest-test",
+        user_id="test",
+        agent_list=["news", "subway", "weather"],
+        query="오늘 경제 뉴스, 강남역 도착 정보, 서울 날씨 알려줘",
+    )
+    start_time = time.perf_counter()
+    message = await run_scheduled_digest(schedule)
+    print(message)
+    print(f"elapsed: {(time.perf_counter() - start_time) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# PYTHONPATH=. python schedule_service/digest.py
@@ -0,0 +1,106 @@
+import asyncio
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from common.metrics import register_metrics
+from custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DispatchPool:
+    def __init__(
+        self,
+        handler: Callable[[str, float], Awaitable[None]],
+        concurrency: int = 32,
+    ):
+        """
+        실행 시각이 된 스케줄 작업을 정해진 개수의 worker 로 동시에 처리합니다.
+        실행 시각이 이른 작업부터 처리합니다.
+        handler: handler(schedule_id, run_ts) 형태의 작업 처리 함수
+        concurrency: 동시에 처리할 최대 작업 수
+        """
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.sequence = itertools.count()
+        self.worker_task_list: List[asyncio.Task] = []
+        self.busy_count = 0
+        self.done_count = 0
+
+        # 실행 시각(tick)별 처리 현황, 완료되면 last_tick 으로 요약
+        self.tick_dict: Dict[float, dict] = {}
+        self.last_tick: dict = {}
+        register_metrics("schedule_dispatch", self.get_stats)
+
+    def submit(self, schedule_id: str, run_ts: float) -> None:
+        self.queue.put_nowait((run_ts, next(self.sequence), schedule_id))
+        tick = self.tick_dict.setdefault(
+            run_ts,
+            {"total": 0, "done": 0, "max_queue_depth": 0, "start": None, "end": None},
+        )
+        tick["total"] += 1
+        tick["max_queue_depth"] = max(tick["max_queue_depth"], self.queue.qsize())
+
+    async def worker(self) -> None:
+        while True:
+            run_ts, _, schedule_id = await self.queue.get()
+            tick = self.tick_dict.get(run_ts)
+            if tick is not None and tick["start"] is None:
+                tick["start"] = time.monotonic()
+            self.busy_count += 1
+            try:
+                await self.handler(schedule_id, run_ts)
+            except Exception as e:
+                logger.error(f"스케줄 작업 처리 실패: {schedule_id} {e}")
+            finally:
+                self.busy_count -= 1
+                self.done_count += 1
+                self.queue.task_done()
+                if tick is not None:
+                    self.finish_tick(run_ts, tick)
+
+    def finish_tick(self, run_ts: float, tick: dict) -> None:
+        tick["done"] += 1
+        if tick["done"] < tick["total"]:
+            return
+        duration = time.monotonic() - tick["start"]
+        self.last_tick = {
+            "run_at": run_ts,
+            "jobs": tick["total"],
+            "duration_seconds": round(duration, 3),
+            "throughput_per_second": round(tick["total"] / duration, 2)
+            if duration > 0
+            else None,
+            "max_queue_depth": tick["max_queue_depth"],
+        }
+        del self.tick_dict[run_ts]
+        logger.info(f"스케줄 tick 처리 완료: {self.last_tick}")
+
+    def start(self) -> None:
+        if self.worker_task_list:
+            return
+        self.worker_task_list = [
+            asyncio.create_task(self.worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self, drain_timeout_seconds: float = 30) -> None:
+        """대기 중인 작업을 drain_timeout_seconds 동안 처리한 뒤 worker 를 종료합니다."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"스케줄 작업 {self.queue.qsize()}건을 처리하지 못하고 종료합니다.")
+        for task in self.worker_task_list:
+            task.cancel()
+        await asyncio.gather(*self.worker_task_list, return_exceptions=True)
+        self.worker_task_list = []
+
+    def get_stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue.qsize(),
+            "busy": self.busy_count,
+            "done": self.done_count,
+            "last_tick": self.last_tick,
+        }
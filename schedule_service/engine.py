@@ -0,0 +1,317 @@
+import asyncio
+import heapq
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from configs import settings
+from custom_logger import get_logger
+from common.metrics import LatencyStats, register_metrics
+from common.utils import KST, get_now_kst, get_next_run_at, to_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import ScheduleJob
+from mongo_db.service import (
+    add_schedule_change_listener,
+    backfill_schedule_next_run_at,
+    claim_schedule_job,
+    complete_schedule_job_run,
+    delete_claimed_schedule_job,
+    get_schedule_job_list_by_next_run,
+    get_schedule_job_list_updated_after,
+    release_schedule_job_lease,
+    renew_schedule_job_lease,
+)
+from schedule_service.dispatch import DispatchPool
+
+logger = get_logger(__name__)
+
+
+class ScheduleEngine:
+    def __init__(
+        self,
+        job_handler: Callable[[ScheduleJob], Awaitable[None]],
+        resync_interval_seconds: int = 60,
+        load_horizon_seconds: int = 3600,
+        misfire_grace_seconds: int = 300,
+        dispatch_concurrency: int = 32,
+        lease_seconds: int = 120,
+        change_poll_interval_seconds: float = 2.0,
+        change_poll_lookback_seconds: float = 5.0,
+    ):
+        """
+        next_run_at 기준 min-heap 으로 다음 실행 작업을 관리하고 실행 시각에 정확히 깨어납니다.
+        job_handler: 실행 시각이 된 스케줄 작업을 처리하는 함수
+        resync_interval_seconds: DB 에서 가까운 작업을 다시 읽어오는 주기(초)
+        load_horizon_seconds: heap 에 올려둘 작업의 범위(초), resync 주기보다 커야 함
+        misfire_grace_seconds: 실행 시각을 이보다 많이 지난 작업은 보내지 않고 건너뜀
+        dispatch_concurrency: 동시에 처리할 최대 작업 수
+        lease_seconds: 작업 실행 lease 유효 시간(초), 실행 중에는 1/3 주기로 연장
+            여러 프로세스가 같은 작업을 heap 에 올려도 lease 를 획득한 하나만 실행하며,
+            실행 중 종료된 worker 의 작업은 lease 만료 후 다음 resync 에서 다른 worker 가 실행
+        change_poll_interval_seconds: 다른 프로세스(API)에서 생성/수정된 작업을 updated 로 조회하는 주기(초)
+            같은 프로세스의 변경은 listener 로 즉시 반영, 삭제된 작업은 실행 시 claim 에 실패하여 건너뜀
+        change_poll_lookback_seconds: 늦게 반영된 쓰기/프로세스 간 시계 차이를 고려해 다시 조회하는 범위(초)
+        """
+        self.job_handler = job_handler
+        self.resync_interval_seconds = resync_interval_seconds
+        self.load_horizon_seconds = load_horizon_seconds
+        self.misfire_grace_seconds = misfire_grace_seconds
+        self.lease_seconds = lease_seconds
+        self.change_poll_interval_seconds = change_poll_interval_seconds
+        self.change_poll_lookback_seconds = change_poll_lookback_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+        # (실행 timestamp, schedule_id), 변경/삭제된 항목은 next_run_dict 와 비교하여 버림
+        self.heap: List[Tuple[float, str]] = []
+        self.next_run_dict: Dict[str, float] = {}
+        self.running_id_set: Set[str] = set()
+        self.dispatch_pool = DispatchPool(self.run_job, dispatch_concurrency)
+        self.wakeup_event = asyncio.Event()
+        self.loop_task: Optional[asyncio.Task] = None
+        self.last_resync = 0.0
+        self.last_change_poll = 0.0
+        self.last_updated: Optional[datetime] = None
+
+        self.fire_count = 0
+        self.misfire_count = 0
+        self.claim_skip_count = 0
+        self.lease_lost_count = 0
+        self.error_count = 0
+        self.lateness_stats = LatencyStats("schedule_fire_lateness")
+        register_metrics("schedule_engine", self.get_stats)
+        add_schedule_change_listener(self.on_schedule_change)
+
+    def upsert(self, schedule: ScheduleJob) -> None:
+        schedule_id = schedule.schedule_id
+        # 실행 중인 작업은 완료 후 다음 실행 시각으로 다시 등록됨
+        if schedule_id in self.running_id_set:
+            return
+        if schedule.next_run_at is None:
+            self.remove(schedule_id)
+            return
+        run_ts = to_kst(schedule.next_run_at).timestamp()
+        if self.next_run_dict.get(schedule_id) == run_ts:
+            return
+        self.next_run_dict[schedule_id] = run_ts
+        heapq.heappush(self.heap, (run_ts, schedule_id))
+        self.wakeup_event.set()
+
+    def remove(self, schedule_id: str) -> None:
+        if self.next_run_dict.pop(schedule_id, None) is not None:
+            self.wakeup_event.set()
+
+    def on_schedule_change(
+        self, schedule_id: str, schedule_job: Optional[ScheduleJob]
+    ) -> None:
+        if schedule_job is None:
+            self.remove(schedule_id)
+        else:
+            self.upsert(schedule_job)
+
+    def peek(self) -> Optional[Tuple[float, str]]:
+        """유효한 가장 빠른 항목을 반환합니다. 오래된 항목은 여기서 버립니다."""
+        while self.heap:
+            run_ts, schedule_id = self.heap[0]
+            if self.next_run_dict.get(schedule_id) == run_ts:
+                return run_ts, schedule_id
+            heapq.heappop(self.heap)
+        return None
+
+    async def resync(self) -> None:
+        until = get_now_kst() + timedelta(seconds=self.load_horizon_seconds)
+        try:
+            schedule_list = await get_schedule_job_list_by_next_run(
+                get_mongo_client(), until
+            )
+            for schedule in schedule_list:
+                self.upsert(schedule)
+        except Exception as e:
+            logger.error(f"스케줄 다시 읽기 실패: {e}")
+        finally:
+            self.last_resync = time.monotonic()
+
+    async def poll_changes(self) -> None:
+        updated_after = self.last_updated - timedelta(
+            seconds=self.change_poll_lookback_seconds
+        )
+        try:
+            schedule_list = await get_schedule_job_list_updated_after(
+                get_mongo_client(), updated_after
+            )
+            # lookback 범위에서 다시 읽은 작업은 next_run_at 이 같으면 upsert 에서 무시됨
+            for schedule in schedule_list:
+                self.upsert(schedule)
+                self.last_updated = max(self.last_updated, to_kst(schedule.updated))
+        except Exception as e:
+            logger.error(f"스케줄 변경 조회 실패: {e}")
+        finally:
+            self.last_change_poll = time.monotonic()
+
+    async def run(self) -> None:
+        try:
+            await backfill_schedule_next_run_at(get_mongo_client())
+        except Exception as e:
+            # next_run_at 이 있는 작업은 그대로 실행 (채우지 못한 작업은 다음 시작 때 다시 시도)
+            logger.error(f"스케줄 next_run_at 채우기 실패: {e}")
+        # resync 이전 변경은 resync 에서 읽으므로 이후 변경만 조회
+        self.last_updated = get_now_kst()
+        await self.resync()
+        while True:
+            if time.monotonic() - self.last_resync >= self.resync_interval_seconds:
+                await self.resync()
+            if time.monotonic() - self.last_change_poll >= self.change_poll_interval_seconds:
+                await self.poll_changes()
+
+            entry = self.peek()
+            delay = min(
+                self.resync_interval_seconds - (time.monotonic() - self.last_resync),
+                self.change_poll_interval_seconds - (time.monotonic() - self.last_change_poll),
+            )
+            if entry is not None:
+                delay = min(delay, entry[0] - time.time())
+            if delay > 0:
+                # 실행 시각, resync/변경 조회 시각, 작업 변경 중 가장 먼저 오는 시점에 깨어남
+                self.wakeup_event.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if entry is None:
+                continue
+
+            run_ts, schedule_id = heapq.heappop(self.heap)
+            del self.next_run_dict[schedule_id]
+            self.fire(schedule_id, run_ts)
+
+    def fire(self, schedule_id: str, run_ts: float) -> None:
+        self.running_id_set.add(schedule_id)
+        self.dispatch_pool.submit(schedule_id, run_ts)
+
+    async def renew_lease(self, schedule_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await renew_schedule_job_lease(
+                get_mongo_client(), schedule_id, self.owner, self.lease_seconds
+            ):
+                logger.warning(f"스케줄 lease 연장 실패: {schedule_id}")
+                return
+
+    async def run_job(self, schedule_id: str, run_ts: float) -> None:
+        mongo_client = get_mongo_client()
+        schedule = None
+        renew_task = None
+        try:
+            # 이 회차의 실행 권한 획득, 다른 worker 가 실행 중이거나 회차가 바뀌었으면 건너뜀
+            schedule = await claim_schedule_job(
+                mongo_client,
+                schedule_id,
+                datetime.fromtimestamp(run_ts, KST),
+                self.owner,
+                self.lease_seconds,
+            )
+            if schedule is None:
+                self.claim_skip_count += 1
+                return
+            renew_task = asyncio.create_task(self.renew_lease(schedule_id))
+
+            # dispatch 대기 시간을 포함한 실제 지연
+            lateness_seconds = time.time() - run_ts
+            self.lateness_stats.record(lateness_seconds * 1000)
+            if lateness_seconds > self.misfire_grace_seconds:
+                self.misfire_count += 1
+                logger.warning(
+                    f"스케줄 실행 시각 초과로 건너뜀: {schedule_id} ({lateness_seconds:.0f}s)"
+                )
+            else:
+                try:
+                    await self.job_handler(schedule)
+                    self.fire_count += 1
+                except Exception as e:
+                    self.error_count += 1
+                    logger.error(f"스케줄 작업 실행 실패: {schedule_id} {e}")
+
+            # 실행 중 수정된 작업은 수정된 내용(next_run_at)을 유지하고 다시 등록
+            if schedule.is_once and await delete_claimed_schedule_job(
+                mongo_client, schedule_id, self.owner, schedule.updated
+            ):
+                schedule, is_done = None, True
+            else:
+                if schedule.is_once:
+                    schedule = await release_schedule_job_lease(
+                        mongo_client, schedule_id, self.owner, get_now_kst()
+                    )
+                else:
+                    next_run_at = get_next_run_at(
+                        schedule.time_hour, schedule.time_minute, schedule.day_of_week
+                    )
+                    schedule = await complete_schedule_job_run(
+                        mongo_client,
+                        schedule_id,
+                        self.owner,
+                        get_now_kst(),
+                        next_run_at,
+                        schedule.updated,
+                    )
+                is_done = schedule is not None
+            if not is_done:
+                self.lease_lost_count += 1
+                logger.warning(f"스케줄 lease 를 잃어 완료 기록 실패: {schedule_id}")
+        except Exception as e:
+            self.error_count += 1
+            logger.error(f"스케줄 작업 처리 실패: {schedule_id} {e}")
+        finally:
+            if renew_task is not None:
+                renew_task.cancel()
+            self.running_id_set.discard(schedule_id)
+            if schedule is not None:
+                self.upsert(schedule)
+
+    def start(self) -> None:
+        if self.loop_task is None or self.loop_task.done():
+            self.dispatch_pool.start()
+            self.loop_task = asyncio.create_task(self.run())
+            logger.info("스케줄 엔진 시작")
+
+    async def stop(self) -> None:
+        if self.loop_task is not None:
+            self.loop_task.cancel()
+            try:
+                await self.loop_task
+            except asyncio.CancelledError:
+                pass
+            self.loop_task = None
+        # 대기/실행 중인 작업은 가능한 끝까지 처리
+        await self.dispatch_pool.stop()
+        logger.info("스케줄 엔진 종료")
+
+    def get_stats(self) -> dict:
+        entry = self.peek()
+        return {
+            "queued": len(self.next_run_dict),
+            "running": len(self.running_id_set),
+            "next_run_in_seconds": round(entry[0] - time.time(), 1) if entry else None,
+            "fire": self.fire_count,
+            "misfire": self.misfire_count,
+            "claim_skip": self.claim_skip_count,
+            "lease_lost": self.lease_lost_count,
+            "error": self.error_count,
+        }
+
+
+def create_schedule_engine(
+    job_handler: Callable[[ScheduleJob], Awaitable[None]]
+) -> ScheduleEngine:
+    return ScheduleEngine(
+        job_handler,
+        resync_interval_seconds=settings.schedule_resync_interval_seconds,
+        load_horizon_seconds=settings.schedule_load_horizon_seconds,
+        misfire_grace_seconds=settings.schedule_misfire_grace_seconds,
+        dispatch_concurrency=settings.schedule_dispatch_concurrency,
+        lease_seconds=settings.schedule_lease_seconds,
+        change_poll_interval_seconds=settings.schedule_change_poll_interval_seconds,
+        change_poll_lookback_seconds=settings.schedule_change_poll_lookback_seconds,
+    )
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+
+from common.metrics import EventLoopLagMonitor
+from common.utils import get_now_kst, to_kst
+from custom_logger import get_logger
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import WorkerHeartbeat
+from mongo_db.service import get_worker_heartbeat_list, upsert_worker_heartbeat
+from schedule_service.engine import ScheduleEngine
+
+logger = get_logger(__name__)
+
+
+class HeartbeatReporter:
+    def __init__(self, engine: ScheduleEngine, interval_seconds: int = 10):
+        """
+        스케줄 worker 의 상태(대기 작업, 실행 지연, 이벤트 루프 지연)를 주기적으로 DB 에 기록합니다.
+        API 프로세스는 이 기록으로 worker 지연을 확인합니다.
+        """
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.loop_lag_monitor = EventLoopLagMonitor("schedule_worker_loop_lag")
+        self.task: Optional[asyncio.Task] = None
+
+    def get_heartbeat(self) -> WorkerHeartbeat:
+        engine_stats = self.engine.get_stats()
+        dispatch_stats = self.engine.dispatch_pool.get_stats()
+        return WorkerHeartbeat(
+            worker_id=self.engine.owner,
+            updated=get_now_kst(),
+            queue_depth=dispatch_stats["queue_depth"],
+            running=engine_stats["running"],
+            next_run_in_seconds=engine_stats["next_run_in_seconds"],
+            lateness_p95_ms=self.engine.lateness_stats.get_percentile(0.95),
+            loop_lag_p95_ms=self.loop_lag_monitor.lag_stats.get_percentile(0.95),
+        )
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await upsert_worker_heartbeat(get_mongo_client(), self.get_heartbeat())
+            except Exception as e:
+                logger.error(f"worker heartbeat 기록 실패: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        self.loop_lag_monitor.start()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.loop_lag_monitor.stop()
+
+
+async def get_worker_health(interval_seconds: int) -> dict:
+    """
+    worker heartbeat 를 조회하여 worker 별 지연과 전체 상태를 반환합니다.
+    heartbeat 가 interval_seconds * 3 이상 갱신되지 않은 worker 는 stale 로 판단합니다.
+    """
+    now = get_now_kst()
+    stale_after = timedelta(seconds=interval_seconds * 3)
+    worker_list = []
+    for heartbeat in await get_worker_heartbeat_list(get_mongo_client()):
+        heartbeat_age = now - to_kst(heartbeat.updated)
+        worker_list.append(
+            {
+                **heartbeat.model_dump(exclude={"updated"}),
+                "heartbeat_age_seconds": round(heartbeat_age.total_seconds(), 1),
+                "is_alive": heartbeat_age < stale_after,
+            }
+        )
+    alive_list = [worker for worker in worker_list if worker["is_alive"]]
+    return {
+        "status": "ok" if alive_list else "no_worker",
+        "alive_worker": len(alive_list),
+        "max_lateness_p95_ms": max(
+            (worker["lateness_p95_ms"] for worker in alive_list), default=0.0
+        ),
+        "max_queue_depth": max(
+            (worker["queue_depth"] for worker in alive_list), default=0
+        ),
+        "worker_list": worker_list,
+    }
@@ -0,0 +1,335 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from configs import settings
+from custom_logger import get_logger
+from common.metrics import LatencyStats, register_metrics
+from common.utils import get_now_kst, to_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import PushOutbox
+from mongo_db.service import (
+    claim_push_outbox_list,
+    complete_push_outbox,
+    release_push_outbox,
+    renew_push_outbox_lease,
+    retry_push_outbox,
+    set_push_outbox_multicast_retry_key,
+)
+from api.service.line_service import (
+    LINE_MULTICAST_MAX_RECIPIENTS,
+    LINE_MULTICAST_PATH,
+    LINE_PUSH_PATH,
+    post_line_message,
+)
+
+logger = get_logger(__name__)
+
+# 발송 묶음: (multicast retry key, outbox 목록, 새로 만든 묶음 여부), 단건 push 는 key 가 None
+PushGroup = Tuple[Optional[str], List[PushOutbox], bool]
+
+
+def get_payload_key(messages: List[dict]) -> str:
+    payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_outbox_id(schedule_id: str, run_at: datetime) -> str:
+    return f"{schedule_id}:{to_kst(run_at).isoformat()}"
+
+
+def create_push_outbox(
+    platform_id: str,
+    messages: List[dict],
+    outbox_id: str,
+    run_at: Optional[datetime] = None,
+) -> PushOutbox:
+    """
+    outbox 에 적재할 메시지를 만듭니다.
+    retry key 는 outbox_id 에서 만들어 같은 회차를 다시 적재/발송해도 LINE 에서 중복 처리됩니다.
+    """
+    now = get_now_kst()
+    return PushOutbox(
+        outbox_id=outbox_id,
+        platform_id=platform_id,
+        messages=messages,
+        payload_key=get_payload_key(messages),
+        retry_key=str(uuid.uuid5(uuid.NAMESPACE_URL, outbox_id)),
+        next_attempt_at=now,
+        run_at=run_at,
+        created=now,
+    )
+
+
+def group_outbox_list(outbox_list: List[PushOutbox]) -> List[PushGroup]:
+    """
+    같은 메시지끼리 최대 LINE_MULTICAST_MAX_RECIPIENTS 명씩 multicast 로 묶습니다.
+    이전에 묶였던 메시지(재시도)는 같은 묶음/retry key 를 유지하고, 내용이 유일한 메시지는 단건 push 로 보냅니다.
+    처음 시도가 아닌(attempt > 1) 단건 메시지는 이미 outbox.retry_key 로 보냈을 수 있으므로
+    새 multicast 에 묶지 않고 같은 retry key 의 단건 push 로 다시 보냅니다.
+    재시도 묶음은 get_incomplete_multicast_list 로 일부만 가져온 묶음을 먼저 걸러내야 합니다.
+    """
+    retry_group_dict: Dict[str, List[PushOutbox]] = {}
+    payload_group_dict: Dict[str, List[PushOutbox]] = {}
+    group_list: List[PushGroup] = []
+    for outbox in outbox_list:
+        if outbox.multicast_retry_key is not None:
+            retry_group_dict.setdefault(outbox.multicast_retry_key, []).append(outbox)
+        elif outbox.attempt > 1:
+            group_list.append((None, [outbox], False))
+        else:
+            payload_group_dict.setdefault(outbox.payload_key, []).append(outbox)
+
+    group_list += [
+        (multicast_retry_key, group, False)
+        for multicast_retry_key, group in retry_group_dict.items()
+    ]
+    for group in payload_group_dict.values():
+        if len(group) == 1:
+            group_list.append((None, group, False))
+            continue
+        for i in range(0, len(group), LINE_MULTICAST_MAX_RECIPIENTS):
+            chunk = group[i : i + LINE_MULTICAST_MAX_RECIPIENTS]
+            multicast_retry_key = str(uuid.uuid4())
+            for outbox in chunk:
+                outbox.multicast_retry_key = multicast_retry_key
+                outbox.multicast_size = len(chunk)
+            group_list.append((multicast_retry_key, chunk, True))
+    return group_list
+
+
+def get_incomplete_multicast_list(outbox_list: List[PushOutbox]) -> List[PushOutbox]:
+    """
+    가져온 메시지 중 multicast 묶음의 일부만 있는 메시지 목록을 반환합니다.
+    일부만 같은 retry key 로 보내면 LINE 이 409(이미 처리됨)로 응답해 나머지 수신자는 받지 못하므로,
+    묶음 전체를 가져올 때까지 보내지 않습니다.
+    """
+    multicast_dict: Dict[str, List[PushOutbox]] = {}
+    for outbox in outbox_list:
+        if outbox.multicast_retry_key is not None and outbox.multicast_size is not None:
+            multicast_dict.setdefault(outbox.multicast_retry_key, []).append(outbox)
+    return [
+        outbox
+        for group in multicast_dict.values()
+        if len(group) < group[0].multicast_size
+        for outbox in group
+    ]
+
+
+def get_delivery_result(status: int) -> str:
+    """LINE API 응답 상태 코드를 sent, retry, failed 로 분류합니다."""
+    # 409: 같은 retry key 의 요청이 이미 처리됨 (이전 시도가 성공)
+    if status in (200, 409):
+        return "sent"
+    if status == 0 or status == 429 or status >= 500:
+        return "retry"
+    return "failed"
+
+
+def get_retry_delay_seconds(attempt: int, retry_after: Optional[float] = None) -> float:
+    """지수 백오프 (jitter 포함), Retry-After 가 있으면 그 이상 대기"""
+    delay = min(settings.push_retry_max_seconds, settings.push_retry_base_seconds * 2 ** (attempt - 1))
+    delay += random.uniform(0, delay * 0.1)
+    return max(delay, retry_after or 0.0)
+
+
+class PushOutboxWorker:
+    def __init__(
+        self,
+        owner: str,
+        batch_size: int = 2000,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: int = 60,
+    ):
+        """
+        push_outbox 의 pending 메시지를 가져와 LINE 으로 발송합니다.
+        같은 메시지는 multicast 로 묶고, 묶음/단건 요청은 동시에 보냅니다.
+        실패하면 백오프 후 같은 retry key 로 다시 보냅니다.
+        """
+        self.owner = owner
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.wake_event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+        self.request_latency = LatencyStats("push_request")
+        # outbox 적재 후 발송 완료까지
+        self.delivery_latency = LatencyStats("push_delivery")
+        # 스케줄 실행 예정 시각부터 발송 완료까지
+        self.send_delay_latency = LatencyStats("schedule_send_delay")
+        self.stats = {
+            "claimed": 0,
+            "released_incomplete": 0,
+            "push_request": 0,
+            "multicast_request": 0,
+            "sent": 0,
+            "retry": 0,
+            "failed": 0,
+        }
+        # 최근 발송 완료 (시각, 메시지 수), 초당 처리량 계산용
+        self.sent_history: deque = deque(maxlen=1000)
+        register_metrics("push_outbox", self.get_stats)
+
+    def wake(self) -> None:
+        """새 메시지가 적재되면 다음 조회 주기를 기다리지 않고 바로 발송합니다."""
+        self.wake_event.set()
+
+    async def send_group(self, group: PushGroup) -> Tuple[str, Optional[float]]:
+        multicast_retry_key, outbox_list, _ = group
+        messages = outbox_list[0].messages
+        with self.request_latency.measure():
+            if multicast_retry_key is None:
+                self.stats["push_request"] += 1
+                status, retry_after = await post_line_message(
+                    LINE_PUSH_PATH,
+                    {"to": outbox_list[0].platform_id, "messages": messages},
+                    outbox_list[0].retry_key,
+                )
+            else:
+                self.stats["multicast_request"] += 1
+                status, retry_after = await post_line_message(
+                    LINE_MULTICAST_PATH,
+                    {"to": [outbox.platform_id for outbox in outbox_list], "messages": messages},
+                    multicast_retry_key,
+                )
+        return get_delivery_result(status), retry_after
+
+    def record_sent(self, outbox_list: List[PushOutbox]) -> None:
+        now = time.time()
+        for outbox in outbox_list:
+            if outbox.created is not None:
+                self.delivery_latency.record((now - to_kst(outbox.created).timestamp()) * 1000)
+            if outbox.run_at is not None:
+                self.send_delay_latency.record((now - to_kst(outbox.run_at).timestamp()) * 1000)
+        self.stats["sent"] += len(outbox_list)
+        self.sent_history.append((now, len(outbox_list)))
+
+    async def renew_lease(self, outbox_id_list: List[str]) -> None:
+        """발송이 길어져도 다른 worker 가 가져가지 않도록 lease 를 1/3 주기로 연장합니다."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await renew_push_outbox_lease(
+                    get_mongo_client(), outbox_id_list, self.owner, self.lease_seconds
+                )
+            except Exception as e:
+                logger.warning(f"push outbox lease 연장 실패: {e}")
+
+    async def process_batch(self, outbox_list: List[PushOutbox]) -> None:
+        renew_task = asyncio.create_task(
+            self.renew_lease([outbox.outbox_id for outbox in outbox_list])
+        )
+        try:
+            await self.send_batch(outbox_list)
+        finally:
+            renew_task.cancel()
+
+    async def send_batch(self, outbox_list: List[PushOutbox]) -> None:
+        mongo_client = get_mongo_client()
+        incomplete_list = get_incomplete_multicast_list(outbox_list)
+        if incomplete_list:
+            # 나머지를 가진 worker 가 놓으면 다음 조회에서 묶음 전체를 가져옴 (동시에 놓는 경우 대비 jitter)
+            self.stats["released_incomplete"] += len(incomplete_list)
+            await release_push_outbox(
+                mongo_client,
+                [outbox.outbox_id for outbox in incomplete_list],
+                self.owner,
+                get_now_kst() + timedelta(seconds=random.uniform(0, self.poll_interval_seconds)),
+            )
+            incomplete_id_set = {outbox.outbox_id for outbox in incomplete_list}
+            outbox_list = [outbox for outbox in outbox_list if outbox.outbox_id not in incomplete_id_set]
+        group_list = group_outbox_list(outbox_list)
+        # 새 multicast 묶음의 retry key 를 먼저 기록 (발송 후 중단되어도 같은 키로 재시도)
+        for multicast_retry_key, group, is_new in group_list:
+            if is_new:
+                await set_push_outbox_multicast_retry_key(
+                    mongo_client, [outbox.outbox_id for outbox in group], multicast_retry_key
+                )
+
+        result_list = await asyncio.gather(*[self.send_group(group) for group in group_list])
+
+        now = get_now_kst()
+        expire_at = now + timedelta(seconds=settings.push_outbox_retention_seconds)
+        sent_list, failed_list = [], []
+        for (_, group, _), (result, retry_after) in zip(group_list, result_list):
+            attempt = max(outbox.attempt for outbox in group)
+            if result == "retry" and attempt < settings.push_max_attempts:
+                self.stats["retry"] += len(group)
+                await retry_push_outbox(
+                    mongo_client,
+                    [outbox.outbox_id for outbox in group],
+                    self.owner,
+                    now + timedelta(seconds=get_retry_delay_seconds(attempt, retry_after)),
+                    f"{result} (attempt {attempt})",
+                )
+            elif result == "sent":
+                sent_list += group
+            else:
+                failed_list += group
+
+        if sent_list:
+            await complete_push_outbox(
+                mongo_client, [outbox.outbox_id for outbox in sent_list], self.owner, "sent", expire_at
+            )
+            self.record_sent(sent_list)
+        if failed_list:
+            await complete_push_outbox(
+                mongo_client,
+                [outbox.outbox_id for outbox in failed_list],
+                self.owner,
+                "failed",
+                expire_at,
+                error="발송 실패",
+            )
+            self.stats["failed"] += len(failed_list)
+            logger.error(f"LINE 메시지 발송 실패: {len(failed_list)}건")
+
+    async def run(self) -> None:
+        while True:
+            outbox_list = []
+            try:
+                outbox_list = await claim_push_outbox_list(
+                    get_mongo_client(), self.owner, self.batch_size, self.lease_seconds
+                )
+                if outbox_list:
+                    self.stats["claimed"] += len(outbox_list)
+                    await self.process_batch(outbox_list)
+            except Exception as e:
+                logger.error(f"push outbox 처리 실패: {e}")
+            # 가져온 개수가 batch_size 이면 남은 메시지가 있으므로 바로 다시 조회
+            if len(outbox_list) >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self.wake_event.wait(), self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.wake_event.clear()
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+            logger.info(f"push outbox worker 시작: {self.owner}")
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        recent_sent = sum(count for sent_ts, count in self.sent_history if now - sent_ts <= 60)
+        return {
+            **self.stats,
+            "sent_per_second_1m": round(recent_sent / 60, 2),
+        }
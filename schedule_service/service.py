@@ -1,80 +1,103 @@
 import asyncio
-from typing import List
-from datetime import datetime
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from mongo_db.connection import get_mongo_client
 from mongo_db.schema import ScheduleJob
-from mongo_db.service import (
-    get_user,
-    get_schedule_job_list_by_time,
-    update_schedule_job_sended_at,
-    delete_schedule_job,
-)
-from api.service.line_service import push_message_with_aiohttp
+from mongo_db.service import get_user, enqueue_push_outbox
 from agent_service.head.head_agent_service import chat_with_head_agent
+from schedule_service.digest import run_scheduled_digest
+from schedule_service.engine import create_schedule_engine
+from schedule_service.heartbeat import HeartbeatReporter
+from schedule_service.warmup import WarmupRunner
+from schedule_service.outbox import PushOutboxWorker, create_push_outbox, get_outbox_id
+from configs import settings
+from common.concurrency import upstream_limiter
 from custom_logger import get_logger
 
 logger = get_logger(__name__)
 
-scheduler = AsyncIOScheduler()
 
+async def run_schedule_job(schedule: ScheduleJob) -> bool:
+    """
+    실행 시각이 된 스케줄 작업의 알림 메시지를 생성하여 push outbox 에 적재합니다.
+    새로 적재되었으면 True 를 반환합니다.
+    다음 실행 시각 계산과 일회성 작업 삭제는 ScheduleEngine 에서,
+    발송과 재시도는 PushOutboxWorker 에서 처리합니다.
+    """
+    mongo_client = get_mongo_client()
+    user = await get_user(mongo_client, schedule.user_id)
+    if user is None:
+        logger.info(f"스케줄 작업의 유저 정보가 없습니다. schedule_id: {schedule.schedule_id}")
+        return False
 
-def get_now_time_hour_and_minute():
-    now = datetime.now()
-    return now.hour, now.minute
+    if schedule.agent_list:
+        # agent_list 의 하위 에이전트를 동시에 실행 후 한 번에 합성
+        result = await run_scheduled_digest(schedule)
+    else:
+        async with upstream_limiter.limit("llm"):
+            result = await chat_with_head_agent(user, schedule.query)
+    outbox = create_push_outbox(
+        user.platform_id,
+        [{"type": "text", "text": result}],
+        get_outbox_id(schedule.schedule_id, schedule.next_run_at),
+        run_at=schedule.next_run_at,
+    )
+    # 같은 회차가 이미 적재되어 있으면 (lease 만료 후 재실행) 다시 보내지 않음
+    return await enqueue_push_outbox(mongo_client, outbox)
 
 
-async def job_runner():
-    mongo_client = get_mongo_client()
+class Scheduler:
+    def __init__(self):
+        """
+        스케줄 엔진, warmup, push outbox 발송, heartbeat 를 묶어 함께 시작/종료합니다.
+        import 시점이 아니라 create_scheduler 호출 시 생성하므로
+        scheduler_in_api_enabled=False 인 API 프로세스에는 엔진/listener/metrics 가 등록되지 않습니다.
+        """
+        self.schedule_engine = create_schedule_engine(self.run_job)
+        self.heartbeat_reporter = HeartbeatReporter(
+            self.schedule_engine, settings.worker_heartbeat_interval_seconds
+        )
+        self.warmup_runner = WarmupRunner(
+            self.schedule_engine.owner,
+            lead_seconds=settings.schedule_warmup_lead_seconds,
+            scan_interval_seconds=settings.schedule_warmup_scan_interval_seconds,
+        )
+        self.push_outbox_worker = PushOutboxWorker(
+            self.schedule_engine.owner,
+            batch_size=settings.push_outbox_batch_size,
+            poll_interval_seconds=settings.push_outbox_poll_interval_seconds,
+            lease_seconds=settings.push_outbox_lease_seconds,
+        )
+
+    @property
+    def owner(self) -> str:
+        return self.schedule_engine.owner
+
+    async def run_job(self, schedule: ScheduleJob) -> None:
+        if await run_schedule_job(schedule):
+            self.push_outbox_worker.wake()
+
+    def start(self) -> None:
+        self.schedule_engine.start()
+        self.warmup_runner.start()
+        self.push_outbox_worker.start()
+        self.heartbeat_reporter.start()
+
+    async def stop(self) -> None:
+        await self.warmup_runner.stop()
+        await self.schedule_engine.stop()
+        # 발송하지 못한 메시지는 outbox 에 남아 다른 worker 또는 재시작 후 발송
+        await self.push_outbox_worker.stop()
+        await self.heartbeat_reporter.stop()
+
 
-    hh, mm = get_now_time_hour_and_minute()
-    now_time = datetime.now()
-    day_name = now_time.strftime("%A")
-    day_name = day_name.lower()
-    hh = 9
-    mm = 0
-    result = await get_schedule_job_list_by_time(mongo_client, hh, mm)
-    send_list: List[ScheduleJob] = []
-    for schedule in result:
-        if not schedule.is_once and day_name not in schedule.day_of_week:
-            continue
-        
-        if schedule.sended_at is None:
-            send_list.append(schedule)
-        elif schedule.sended_at.day < now_time.day:
-            send_list.append(schedule)
-
-    for schedule in send_list:
-        user = await get_user(mongo_client, schedule.user_id)
-        if user:
-            input_query = f"""
-            agent_list: {schedule.agent_list}
-            query: {schedule.query}
-            """
-            print(input_query)
-            result = await chat_with_head_agent(user, input_query)
-            # await push_message_with_aiohttp(
-            #     user.platform_id, [{"type": "text", "text": result}]
-            # )
-            if schedule.is_once:
-                await delete_schedule_job(mongo_client, schedule.schedule_id)
-            else:
-                await update_schedule_job_sended_at(
-                    mongo_client, schedule.schedule_id, datetime.now()
-                )
-            
+def create_scheduler() -> Scheduler:
+    return Scheduler()
 
 
 async def main():
-    scheduler.add_job(job_runner, "interval", seconds=2)
+    scheduler = create_scheduler()
     scheduler.start()
-    count = 0
-    while True:
-        await asyncio.sleep(1)
-        count += 1
-        if count > 60:
-            break
-    scheduler.shutdown()
+    await asyncio.sleep(60)
+    await scheduler.stop()
 
 
 if __name__ == "__main__":
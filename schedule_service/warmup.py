@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+
+from configs import settings
+from custom_logger import get_logger
+from common.metrics import register_metrics
+from common.utils import get_now_kst, to_kst
+from mongo_db.connection import get_mongo_client
+from mongo_db.schema import ScheduleJob
+from mongo_db.service import (
+    claim_prepared_payload,
+    get_prepared_payload,
+    get_schedule_job_list_by_next_run,
+    release_prepared_payload,
+    save_prepared_payload,
+)
+from agent_service.schedule.schemas import DigestSection, SharedSectionRequest
+from schedule_service.content_key import get_digest_key, get_section_request_list
+from schedule_service.digest import (
+    compose_digest,
+    get_digest_payload_key,
+    run_digest_section,
+)
+
+logger = get_logger(__name__)
+
+# 미리 만들어도 되는(느리게 바뀌는) 에이전트, 지하철 도착 정보 등은 실행 시각에 조회
+WARMUP_AGENT_SET = {"news", "weather"}
+
+
+class WarmupRunner:
+    def __init__(self, owner: str, lead_seconds: int = 120, scan_interval_seconds: int = 15):
+        """
+        next_run_at 보다 lead_seconds 먼저 느리게 바뀌는 섹션(뉴스, 날씨)을 생성하여
+        prepared_payloads 에 저장합니다. 실행 시각에는 저장된 결과를 사용합니다.
+        모든 섹션을 미리 만들 수 있는 작업은 합성 메시지까지 미리 준비합니다.
+        같은 (내용 키, 실행 시각)은 worker 전체에서 한 번만 준비합니다.
+        """
+        self.owner = owner
+        self.lead_seconds = lead_seconds
+        self.scan_interval_seconds = scan_interval_seconds
+        self.warmed_set: Set[Tuple[str, float]] = set()
+        self.task_set: Set[asyncio.Task] = set()
+        self.loop_task: Optional[asyncio.Task] = None
+        self.stats = {"schedule": 0, "section": 0, "digest": 0, "claimed_elsewhere": 0, "error": 0}
+        register_metrics("schedule_warmup", self.get_stats)
+
+    async def prepare_section(
+        self, request: SharedSectionRequest, run_at: datetime
+    ) -> Optional[DigestSection]:
+        mongo_client = get_mongo_client()
+        expire_at = run_at + timedelta(seconds=self.lead_seconds + 600)
+        if await claim_prepared_payload(
+            mongo_client, request.content_key, run_at, self.owner, expire_at
+        ):
+            section = await run_digest_section(
+                request.agent_name, request.query, settings.schedule_agent_timeout_seconds
+            )
+            if section.answer is None:
+                await release_prepared_payload(mongo_client, request.content_key, run_at)
+                return None
+            await save_prepared_payload(
+                mongo_client, request.content_key, run_at, section.answer, request.agent_name
+            )
+            self.stats["section"] += 1
+            return section
+
+        # 다른 작업/worker 가 준비 중이면 완료될 때까지 대기
+        self.stats["claimed_elsewhere"] += 1
+        deadline = time.monotonic() + settings.schedule_agent_timeout_seconds
+        while time.monotonic() < deadline:
+            payload = await get_prepared_payload(mongo_client, request.content_key, run_at)
+            if payload is not None:
+                return DigestSection(
+                    agent_name=request.agent_name, answer=payload.answer, status="prepared"
+                )
+            await asyncio.sleep(1)
+        return None
+
+    async def warm_up_schedule(self, schedule: ScheduleJob) -> None:
+        run_at = schedule.next_run_at
+        query = schedule.query or schedule.job_name or ""
+        request_list = get_section_request_list(schedule.agent_list, query)
+        warmup_request_list = [
+            request for request in request_list if request.agent_name in WARMUP_AGENT_SET
+        ]
+        if not warmup_request_list:
+            return
+        try:
+            section_list = await asyncio.gather(
+                *[self.prepare_section(request, run_at) for request in warmup_request_list]
+            )
+            # 휘발성 섹션이 없고 모든 섹션이 준비되면 합성 메시지까지 미리 생성
+            if len(warmup_request_list) < len(request_list) or None in section_list:
+                return
+            digest_payload_key = get_digest_payload_key(get_digest_key(request_list))
+            mongo_client = get_mongo_client()
+            expire_at = run_at + timedelta(seconds=self.lead_seconds + 600)
+            if not await claim_prepared_payload(
+                mongo_client, digest_payload_key, run_at, self.owner, expire_at
+            ):
+                return
+            message = await compose_digest(query, list(section_list))
+            await save_prepared_payload(mongo_client, digest_payload_key, run_at, message)
+            self.stats["digest"] += 1
+        except Exception as e:
+            self.stats["error"] += 1
+            logger.error(f"스케줄 warm-up 실패: {schedule.schedule_id} {e}")
+
+    async def scan(self) -> None:
+        now_ts = time.time()
+        until = get_now_kst() + timedelta(seconds=self.lead_seconds)
+        schedule_list = await get_schedule_job_list_by_next_run(get_mongo_client(), until)
+        for schedule in schedule_list:
+            if not schedule.agent_list or schedule.next_run_at is None:
+                continue
+            run_ts = to_kst(schedule.next_run_at).timestamp()
+            key = (schedule.schedule_id, run_ts)
+            if run_ts <= now_ts or key in self.warmed_set:
+                continue
+            self.warmed_set.add(key)
+            self.stats["schedule"] += 1
+            task = asyncio.create_task(self.warm_up_schedule(schedule))
+            self.task_set.add(task)
+            task.add_done_callback(self.task_set.discard)
+        # 지난 회차 정리
+        self.warmed_set = {key for key in self.warmed_set if key[1] > now_ts}
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.scan()
+            except Exception as e:
+                logger.error(f"스케줄 warm-up 조회 실패: {e}")
+            await asyncio.sleep(self.scan_interval_seconds)
+
+    def start(self) -> None:
+        if self.loop_task is None or self.loop_task.done():
+            self.loop_task = asyncio.create_task(self.run())
+            logger.info(f"스케줄 warm-up 시작: {self.lead_seconds}초 전")
+
+    async def stop(self) -> None:
+        if self.loop_task is not None:
+            self.loop_task.cancel()
+            try:
+                await self.loop_task
+            except asyncio.CancelledError:
+                pass
+            self.loop_task = None
+        for task in list(self.task_set):
+            task.cancel()
+        await asyncio.gather(*self.task_set, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "running": len(self.task_set)}
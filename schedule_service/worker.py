@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import multiprocessing
+import signal
+
+from configs import settings
+from custom_logger import get_logger
+from common.http_client import open_http_client, close_http_client
+from mongo_db.connection import get_mongo_client
+from mongo_db.indexes import bootstrap_indexes
+from agent_service.news.news_agent import ynx_rss
+from agent_service.subway.subway_agent import get_station_index
+from schedule_service.service import create_scheduler
+
+logger = get_logger(__name__)
+
+
+async def run_worker() -> None:
+    """
+    API 프로세스와 분리된 스케줄 worker 를 실행합니다. SIGINT/SIGTERM 을 받으면 종료합니다.
+    여러 프로세스/호스트에서 동시에 실행해도 lease 로 회차마다 한 번만 실행됩니다.
+    """
+    await open_http_client()
+    await bootstrap_indexes(get_mongo_client())
+    get_station_index()
+    ynx_rss.start_background_refresh(settings.news_refresh_interval_seconds)
+    # 프로세스마다 별도 엔진 (spawn 으로 시작한 부모 프로세스에는 만들지 않음)
+    scheduler = create_scheduler()
+    scheduler.start()
+    logger.info(f"스케줄 worker 시작: {scheduler.owner}")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    await stop_event.wait()
+
+    logger.info(f"스케줄 worker 종료 중: {scheduler.owner}")
+    await scheduler.stop()
+    await ynx_rss.stop_background_refresh()
+    await close_http_client()
+
+
+def run_worker_process() -> None:
+    asyncio.run(run_worker())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aline 스케줄 worker")
+    parser.add_argument(
+        "--processes", type=int, default=1, help="실행할 worker 프로세스 수"
+    )
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker_process()
+        return
+
+    # 프로세스마다 별도 이벤트 루프/엔진을 실행 (spawn 으로 상태 공유 없이 시작)
+    context = multiprocessing.get_context("spawn")
+    process_list = [
+        context.Process(target=run_worker_process, name=f"schedule-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in process_list:
+        process.start()
+    try:
+        for process in process_list:
+            process.join()
+    except KeyboardInterrupt:
+        # 자식 프로세스도 같은 프로세스 그룹으로 SIGINT 를 받아 스스로 종료
+        for process in process_list:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
+
+# PYTHONPATH=. python -m schedule_service.worker --processes 2